@@ -0,0 +1,179 @@
+# arvore_tonto.py
+# Nós da árvore sintática montada pelo parser (parser_tonto). Cada nó é uma
+# classe com __slots__ (sem __dict__ por instância) e guarda a sua extensão
+# no texto em um único inteiro (`span`: início << 32 | comprimento). Os nomes
+# vêm do lexer já internados (a tabela de grafias devolve sempre o mesmo
+# objeto str para a mesma grafia), então classes e estereótipos repetidos
+# compartilham a mesma string.
+#
+#   python arvore_tonto.py ARQUIVO.tonto
+import sys
+
+_SPAN_BITS = 32
+_SPAN_MASK = (1 << _SPAN_BITS) - 1
+
+
+class Node:
+    """Base dos nós: `kind` (da classe), `fields` (slots de dados) e span."""
+
+    __slots__ = ("span",)
+    kind = None
+    fields = ()
+    child_field = None   # slot com a lista de nós filhos, se houver
+
+    def __init__(self, start, end, *values):
+        self.span = (start << _SPAN_BITS) | (end - start)
+        for name, value in zip(self.fields, values):
+            setattr(self, name, value)
+
+    @property
+    def start(self):
+        return self.span >> _SPAN_BITS
+
+    @property
+    def end(self):
+        return (self.span >> _SPAN_BITS) + (self.span & _SPAN_MASK)
+
+    def __iter__(self):
+        """Filhos do nó (vazio para folhas)."""
+        return iter(getattr(self, self.child_field) if self.child_field else ())
+
+    def walk(self):
+        """O nó e todos os descendentes, em pré-ordem."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            if node.child_field:
+                stack.extend(reversed(getattr(node, node.child_field)))
+
+    def moved(self, delta):
+        """Cópia da subárvore com os spans deslocados de `delta`."""
+        copy = object.__new__(type(self))
+        copy.span = self.span + (delta << _SPAN_BITS)
+        for name in self.fields:
+            value = getattr(self, name)
+            if name == self.child_field:
+                value = [child.moved(delta) for child in value]
+            setattr(copy, name, value)
+        return copy
+
+    def __eq__(self, other):
+        return (type(self) is type(other) and self.span == other.span
+                and all(getattr(self, f) == getattr(other, f) for f in self.fields))
+
+    __hash__ = None
+
+    def __getstate__(self):
+        return (self.span,) + tuple(getattr(self, f) for f in self.fields)
+
+    def __setstate__(self, state):
+        self.span = state[0]
+        for name, value in zip(self.fields, state[1:]):
+            setattr(self, name, value)
+
+    def __repr__(self):
+        values = ", ".join(repr(getattr(self, f)) for f in self.fields if f != self.child_field)
+        return f"{type(self).__name__}({values}, {self.start}:{self.end})"
+
+
+class Package(Node):
+    __slots__ = ("name", "items")
+    kind = "package"
+    fields = ("name", "items")
+    child_field = "items"
+
+
+class Class(Node):
+    __slots__ = ("name", "stereotype", "elements")
+    kind = "class"
+    fields = ("name", "stereotype", "elements")
+    child_field = "elements"
+
+
+class Attribute(Node):
+    __slots__ = ("name", "type")
+    kind = "attribute"
+    fields = ("name", "type")
+
+
+class RelationInternal(Node):
+    """Relação declarada dentro de uma classe (a origem é a classe dona)."""
+    __slots__ = ("stereotype", "target")
+    kind = "relation_internal"
+    fields = ("stereotype", "target")
+
+
+class Datatype(Node):
+    __slots__ = ("name", "attributes")
+    kind = "datatype"
+    fields = ("name", "attributes")
+    child_field = "attributes"
+
+
+class Enum(Node):
+    __slots__ = ("name", "items")   # itens: nomes (str)
+    kind = "enum"
+    fields = ("name", "items")
+
+
+class Genset(Node):
+    __slots__ = ("general", "specific", "modifiers")
+    kind = "genset"
+    fields = ("general", "specific", "modifiers")
+
+
+class RelationExternal(Node):
+    __slots__ = ("stereotype", "name", "source", "target")
+    kind = "relation_external"
+    fields = ("stereotype", "name", "source", "target")
+
+
+class Import(Node):
+    __slots__ = ("name",)
+    kind = "import"
+    fields = ("name",)
+
+
+def deep_size(obj):
+    """Bytes ocupados por `obj` e tudo que ele alcança (cada objeto uma vez)."""
+    seen = set()
+    total = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        if isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        elif isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, Node):
+            stack.append(o.span)
+            stack.extend(getattr(o, f) for f in o.fields)
+    return total
+
+
+def main(argv=None):
+    import argparse
+    from parser_tonto import build_parser, package_trees
+    ap = argparse.ArgumentParser(description="Mostra a árvore sintática de um arquivo Tonto")
+    ap.add_argument("file", help="arquivo .tonto")
+    args = ap.parse_args(argv)
+
+    with open(args.file, encoding="utf-8") as f:
+        ontologia = build_parser().parse(f.read())
+    for package in package_trees(ontologia):
+        stack = [(package, 0)]
+        while stack:
+            node, depth = stack.pop()
+            line, col = ontologia.line_index.position(node.start)
+            print(f"{'  ' * depth}{node!r}  [{line}:{col}]")
+            stack.extend((child, depth + 1) for child in reversed(list(node)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+# bench_corpus.py
+# Harness de benchmark sobre um corpus sintético (corpus_tonto): mede
+# inicialização, tokens/s, parses/s e pico de RSS de analyze(), de
+# build_parser().parse() e da contagem de contagem_tonto, e salva o
+# resultado em JSON para comparar versões.
+#
+#   python bench_corpus.py --size 10MB --shape mixed --json atual.json
+#   python bench_corpus.py --size 10MB --shape mixed --compare base.json
+#
+# Cada medida roda em um processo novo (spawn), para que o tempo de
+# inicialização inclua os imports e o RSS não herde o de outra medida.
+# Este módulo não importa o lexer/parser (nem corpus_tonto, que importa o
+# lexer) no nível do módulo pelo mesmo motivo.
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+BENCH_FORMAT = 1
+
+
+def _read_all(paths):
+    texts = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            texts.append(f.read())
+    return texts
+
+
+def _peak_rss_kb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss  # macOS informa bytes
+
+
+def measure_analyze(paths, repeat):
+    """Executado no processo filho: startup + analyze() em todos os arquivos."""
+    texts = _read_all(paths)
+    t0 = time.perf_counter()
+    from lexer_tonto import analyze, prebuild_lexer
+    prebuild_lexer()
+    startup = time.perf_counter() - t0
+
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        tokens = 0
+        for text in texts:
+            toks, _ = analyze(text)
+            tokens += len(toks)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    size = sum(len(t) for t in texts)
+    return {
+        "startup_s": startup,
+        "elapsed_s": best,
+        "tokens": tokens,
+        "tokens_per_s": tokens / best,
+        "bytes_per_s": size / best,
+        "peak_rss_kb": _peak_rss_kb(),
+    }
+
+
+def measure_parse(paths, repeat):
+    """Executado no processo filho: startup + build_parser().parse() por arquivo."""
+    texts = _read_all(paths)
+    t0 = time.perf_counter()
+    from parser_tonto import build_parser
+    parser = build_parser()
+    startup = time.perf_counter() - t0
+
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        classes = 0
+        for text in texts:
+            classes += len(parser.parse(text)["classes"])
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    size = sum(len(t) for t in texts)
+    return {
+        "startup_s": startup,
+        "elapsed_s": best,
+        "parses": len(texts),
+        "parses_per_s": len(texts) / best,
+        "bytes_per_s": size / best,
+        "classes": classes,
+        "peak_rss_kb": _peak_rss_kb(),
+    }
+
+
+def measure_scan(paths, repeat):
+    """Executado no processo filho: síntese só-contagem (contagem_tonto) por arquivo.
+
+    Mesma síntese de measure_analyze, sem tokens nem colunas; compare
+    bytes_per_s entre as duas medidas.
+    """
+    texts = _read_all(paths)
+    t0 = time.perf_counter()
+    from contagem_tonto import scan_text
+    startup = time.perf_counter() - t0
+
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        classes = 0
+        for text in texts:
+            classes += scan_text(text)["classes"]
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    size = sum(len(t) for t in texts)
+    return {
+        "startup_s": startup,
+        "elapsed_s": best,
+        "files_per_s": len(texts) / best,
+        "bytes_per_s": size / best,
+        "classes": classes,
+        "peak_rss_kb": _peak_rss_kb(),
+    }
+
+
+MEASURES = {"analyze": measure_analyze, "parse": measure_parse, "scan": measure_scan}
+
+
+def _isolated(fn, *args):
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+        return pool.submit(fn, *args).result()
+
+
+def _git_revision():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                             text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run(size, shape="mixed", seed=0, repeat=3, measures=tuple(MEASURES), corpus_dir=None):
+    """Gera o corpus (se preciso), roda as medidas e devolve o relatório."""
+    import corpus_tonto
+    tmp = None
+    if corpus_dir is None:
+        tmp = corpus_dir = tempfile.mkdtemp(prefix="tonto_corpus_")
+        paths = corpus_tonto.write_corpus(corpus_dir, size, shape, seed)
+    else:
+        paths = sorted(os.path.join(corpus_dir, n) for n in os.listdir(corpus_dir)
+                       if n.endswith(".tonto"))
+    try:
+        import ply
+        report = {
+            "format": BENCH_FORMAT,
+            "meta": {
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "ply": ply.__version__,
+                "revision": _git_revision(),
+            },
+            "corpus": {
+                "shape": shape if tmp is not None else None,
+                "seed": seed if tmp is not None else None,
+                "dir": None if tmp is not None else corpus_dir,
+                "files": len(paths),
+                "bytes": sum(os.path.getsize(p) for p in paths),
+            },
+            "results": {},
+        }
+        for name in measures:
+            report["results"][name] = _isolated(MEASURES[name], paths, repeat)
+        return report
+    finally:
+        if tmp is not None:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+def print_report(report, baseline=None):
+    c = report["corpus"]
+    print(f"corpus: {c['shape']} seed={c['seed']} {c['files']} arquivos, {c['bytes'] / 1024:.1f} KiB")
+    for name, res in report["results"].items():
+        base = (baseline or {}).get("results", {}).get(name, {})
+        print(f"== {name} ==")
+        for key, value in res.items():
+            line = f"  {key:14} {value:14.4f}" if isinstance(value, float) else f"  {key:14} {value:14}"
+            if key in base and base[key]:
+                line += f"   ({value / base[key]:6.2f}x da base)"
+            print(line)
+
+
+def main(argv=None):
+    import corpus_tonto
+    ap = argparse.ArgumentParser(description="Benchmark do lexer/parser Tonto sobre um corpus sintético")
+    ap.add_argument("--size", default="1MB", help="tamanho do corpus (ex.: 1KB, 10MB, 100MB)")
+    ap.add_argument("--shape", default="mixed", choices=corpus_tonto.SHAPES)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--repeat", type=int, default=3, help="repetições (vale a melhor)")
+    ap.add_argument("--only", choices=sorted(MEASURES), action="append", help="roda só esta medida")
+    ap.add_argument("--corpus-dir", help="usa um corpus já gerado em vez de gerar um temporário")
+    ap.add_argument("--json", help="grava o relatório neste arquivo")
+    ap.add_argument("--compare", help="relatório JSON de base para comparação")
+    args = ap.parse_args(argv)
+
+    report = run(corpus_tonto.parse_size(args.size), args.shape, args.seed, args.repeat,
+                 tuple(args.only or MEASURES), args.corpus_dir)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
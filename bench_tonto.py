@@ -0,0 +1,461 @@
+# bench_tonto.py
+# Benchmarks de inicialização e vazão do lexer/parser Tonto.
+#
+#   python bench_tonto.py [--docs N] [--threads N]
+#
+# Para vazão sobre corpus sintético e relatórios JSON, ver bench_corpus.py.
+import argparse
+import importlib.util
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import ply.lex as lex
+
+import lexer_tonto
+from lexer_tonto import (build_lexer, prebuild_lexer, get_lexer, analyze, analyze_stream,
+                         find_column, LineIndex)
+from parser_tonto import build_parser
+from cache_tonto import Cache
+from colunas_tonto import analyze_columnar
+from corpus_tonto import generate, letters
+import binario_tonto
+from arvore_tonto import Node, deep_size
+
+SAMPLE = '''
+package mypkg {
+  Person : kind
+  hasParent : material
+  Planeta1 : Person
+  CPFDataType
+  number
+  ordered
+  "uma string de teste"
+  true
+  <>-- --<>
+}
+'''
+
+PARSE_SAMPLE = '''
+package MyPkg {
+    Person : kind {
+        name : string
+    }
+    enum EyeColor {
+        Blue Green Brown
+    }
+}
+'''
+
+
+def _tokenize(lexer, text):
+    lexer.input(text)
+    n = 0
+    while lexer.token():
+        n += 1
+    return n
+
+
+def bench_startup(docs):
+    """Compara lex.lex() por documento com clone do lexer pré-construído."""
+    t0 = time.perf_counter()
+    for _ in range(docs):
+        _tokenize(build_lexer(), SAMPLE)
+    rebuild = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    prebuild_lexer()
+    first = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(docs):
+        _tokenize(get_lexer(), SAMPLE)
+    clone = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(docs):
+        analyze(SAMPLE)
+    full = time.perf_counter() - t0
+
+    print(f"== startup/vazão ({docs} documentos pequenos) ==")
+    print(f"lex.lex() por documento : {rebuild:8.3f}s  ({docs / rebuild:10.0f} docs/s)")
+    print(f"prebuild_lexer() único  : {first * 1000:8.2f}ms")
+    print(f"clone por documento     : {clone:8.3f}s  ({docs / clone:10.0f} docs/s)")
+    print(f"analyze() por documento : {full:8.3f}s  ({docs / full:10.0f} docs/s)")
+    print(f"ganho (rebuild/clone)   : {rebuild / clone:8.1f}x")
+
+
+def bench_parser(docs, threads):
+    """Um parser por documento x um parser reutilizado x vários em threads."""
+    t0 = time.perf_counter()
+    for _ in range(docs):
+        build_parser().parse(PARSE_SAMPLE)
+    fresh = time.perf_counter() - t0
+
+    parser = build_parser()
+    t0 = time.perf_counter()
+    for _ in range(docs):
+        parser.parse(PARSE_SAMPLE)
+    reused = time.perf_counter() - t0
+
+    def worker(n):
+        p = build_parser()
+        for _ in range(n):
+            p.parse(PARSE_SAMPLE)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(threads) as ex:
+        list(ex.map(worker, [docs // threads] * threads))
+    pooled = time.perf_counter() - t0
+
+    print(f"== parser ({docs} documentos) ==")
+    print(f"parser novo por documento : {fresh:8.3f}s  ({docs / fresh:10.0f} docs/s)")
+    print(f"parser reutilizado        : {reused:8.3f}s  ({docs / reused:10.0f} docs/s)")
+    print(f"{threads} parsers em threads    : {pooled:8.3f}s  ({docs / pooled:10.0f} docs/s)")
+
+
+def bench_cache(docs):
+    """analyze()+parse() sem cache x cache frio x cache quente."""
+    texts = [PARSE_SAMPLE.replace("MyPkg", "Pkg" + letters(i)) for i in range(docs)]
+    tmp = tempfile.mkdtemp(prefix="tonto_cache_")
+    try:
+        def run(cache):
+            parser = build_parser(cache)
+            t0 = time.perf_counter()
+            for text in texts:
+                analyze(text, cache)
+                parser.parse(text)
+            return time.perf_counter() - t0
+
+        plain = run(None)
+        cold = run(Cache(tmp))
+        warm = run(Cache(tmp))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    print(f"== cache em disco ({docs} documentos distintos) ==")
+    print(f"sem cache   : {plain:8.3f}s")
+    print(f"cache frio  : {cold:8.3f}s")
+    print(f"cache quente: {warm:8.3f}s")
+
+
+def _peak(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_stream(sizes):
+    """Pico de memória de analyze() x analyze_stream() conforme o arquivo cresce."""
+    print("== streaming (pico de memória, MiB) ==")
+    print(f"{'cópias':>8} {'arquivo':>9} {'analyze':>9} {'stream':>9}")
+    fd, path = tempfile.mkstemp(suffix=".tonto")
+    os.close(fd)
+    try:
+        for n in sizes:
+            with open(path, "w") as f:
+                for _ in range(n):
+                    f.write(PARSE_SAMPLE)
+
+            def full():
+                with open(path) as f:
+                    analyze(f.read())
+
+            def stream():
+                st = analyze_stream(path, chunk_size=64 * 1024)
+                for _ in st:
+                    pass
+                st.summary
+
+            mib = 1024 * 1024
+            print(f"{n:8d} {os.path.getsize(path) / mib:9.2f} "
+                  f"{_peak(full) / mib:9.2f} {_peak(stream) / mib:9.2f}")
+    finally:
+        os.remove(path)
+
+
+def bench_columnar(copies):
+    """Lista de dicts (analyze) x TokenBuffer colunar: tempo e memória retida."""
+    text = PARSE_SAMPLE * copies
+    results = {}
+    for name, fn in (("dicts", analyze), ("colunar", analyze_columnar)):
+        t0 = time.perf_counter()
+        fn(text)
+        elapsed = time.perf_counter() - t0
+        tracemalloc.start()
+        kept = fn(text)
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del kept
+        results[name] = (elapsed, size)
+    print(f"== tokens colunares ({copies} cópias, {len(text) / 1024:.0f} KiB) ==")
+    for name, (elapsed, size) in results.items():
+        print(f"{name:8}: {elapsed:8.3f}s  {size / (1024 * 1024):8.2f} MiB retidos")
+
+
+def bench_long_lines(copies):
+    """Colunas via rfind por token (find_column) x busca binária no LineIndex."""
+    line = " ".join(PARSE_SAMPLE.split())
+    text = "\n".join([line * copies] * 4)
+    lexer = get_lexer()
+    lexer.input(text)
+    toks = list(iter(lexer.token, None))
+
+    t0 = time.perf_counter()
+    old = [find_column(text, tok) for tok in toks]
+    rfind = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    index = LineIndex(text)
+    new = [index.column(tok.lexpos) for tok in toks]
+    bisect = time.perf_counter() - t0
+
+    assert old == new
+    print(f"== colunas em linhas longas (4 linhas de {len(line) * copies / 1024:.0f} KiB, {len(toks)} tokens) ==")
+    print(f"find_column (rfind): {rfind:8.3f}s")
+    print(f"LineIndex (bisect) : {bisect:8.3f}s")
+
+
+# regras de identificador anteriores: uma por forma, ancoradas com \b, e
+# classify_token chamado na regra e de novo na análise
+LEGACY_LEXER = r"""
+from lexer_tonto import *
+from lexer_tonto import classify_token, t_error
+
+def t_STRING(t):
+    r'\"([^\\\n]|(\\.))*?\"'
+    t.value = t.value[1:-1]
+    return t
+
+def t_NUMBER(t):
+    r'\d+(\.\d+)?'
+    t.value = float(t.value) if '.' in t.value else int(t.value)
+    return t
+
+def t_BOOLEAN_LITERAL(t):
+    r'\b(true|false)\b'
+    t.value = True if t.value == 'true' else False
+    return t
+
+def t_NEW_DATATYPE(t):
+    r'\b[A-Za-z]+DataType\b'
+    return t
+
+def t_INSTANCE_NAME(t):
+    r'\b[A-Za-z_][A-Za-z_]*\d+\b'
+    return t
+
+def t_CLASS_NAME(t):
+    r'\b[A-Z][A-Za-z_]*\b'
+    return classify_token(t)
+
+def t_NATIVE_TYPE(t):
+    r'\b(number|string|boolean|date|time|datetime)\b'
+    return t
+
+def t_ENUM(t):
+    r'enum'
+    return t
+
+def t_RELATION_NAME(t):
+    r'\b[a-z][A-Za-z_]*\b'
+    return classify_token(t)
+
+def t_IDENT(t):
+    r'\b[A-Za-z_][A-Za-z0-9_]*\b'
+    return classify_token(t)
+
+def t_newline(t):
+    r'\n+'
+    t.lexer.lineno += t.value.count("\n")
+"""
+
+
+def _legacy_lexer():
+    """Lexer com as regras de identificador anteriores, para comparação."""
+    tmp = tempfile.mkdtemp(prefix="tonto_legacy_")
+    try:
+        path = os.path.join(tmp, "legacy_lexer.py")
+        with open(path, "w") as f:
+            f.write(LEGACY_LEXER)
+        spec = importlib.util.spec_from_file_location("legacy_lexer", path)
+        legacy = sys.modules["legacy_lexer"] = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(legacy)
+        return lex.lex(module=legacy)
+    finally:
+        sys.modules.pop("legacy_lexer", None)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def bench_identifiers(copies):
+    """Regra única com tabela de grafias x regras por forma + reclassificação."""
+    words = " ".join(["Pessoa kind trabalha_em material empresa1 CpfDataType",
+                      "nome string ordered genset Empresa role datetime x_1y"] * copies)
+    legacy = _legacy_lexer()
+
+    def run_legacy():
+        legacy.input(words)
+        n = 0
+        for tok in iter(legacy.token, None):
+            if tok.type in ("CLASS_NAME", "RELATION_NAME", "INSTANCE_NAME", "NEW_DATATYPE"):
+                lexer_tonto.classify_token(tok)
+            n += 1
+        return n
+
+    def run_current():
+        lexer = get_lexer()
+        lexer.input(words)
+        return sum(1 for _ in iter(lexer.token, None))
+
+    results = {}
+    for name, fn in (("regras por forma", run_legacy), ("regra única", run_current)):
+        t0 = time.perf_counter()
+        n = fn()
+        results[name] = (time.perf_counter() - t0, n)
+    assert len({n for _, n in results.values()}) == 1
+    print(f"== identificadores ({len(words) / 1024:.0f} KiB) ==")
+    for name, (elapsed, n) in results.items():
+        print(f"{name:16}: {elapsed:8.3f}s  ({n / elapsed:10.0f} tokens/s)")
+
+
+def _big_package(size):
+    """Um único pacote com ~`size` bytes, juntando corpos do corpus sintético."""
+    bodies = [text.split("{", 1)[1].rsplit("}", 1)[0] for _, text in generate(size, "mixed", 7)]
+    return "package Grande {\n" + "".join(bodies) + "}\n"
+
+
+_NODE_TYPES = {cls.kind: cls for cls in Node.__subclasses__()}
+
+
+def _tree_rows(node):
+    """Nó -> [kind, start, end, campos...] (filhos aninhados), para JSON."""
+    values = [[_tree_rows(c) for c in v] if f == node.child_field else v
+              for f, v in ((f, getattr(node, f)) for f in node.fields)]
+    return [node.kind, node.start, node.end, *values]
+
+
+def _tree_from_rows(row):
+    """Inverso de _tree_rows (as tuplas voltam do JSON como listas)."""
+    kind, start, end, *values = row
+    cls = _NODE_TYPES[kind]
+    values = [[_tree_from_rows(c) for c in v] if f == cls.child_field
+              else tuple(v) if f == "modifiers" else v
+              for f, v in zip(cls.fields, values)]
+    return cls(start, end, *values)
+
+
+def bench_binary(size):
+    """Consultar o modelo: re-parse x JSON x binário via mmap, com o mesmo conteúdo
+    (as árvores de parse inteiras, com spans)."""
+    text = _big_package(size)
+    model = build_parser().parse(text)
+    trees = [model.tree]
+    tmp = tempfile.mkdtemp(prefix="tonto_bin_")
+    try:
+        json_path = os.path.join(tmp, "modelo.json")
+        bin_path = os.path.join(tmp, "modelo.tontob")
+        t0 = time.perf_counter()
+        with open(json_path, "w") as f:
+            json.dump([_tree_rows(t) for t in trees], f, separators=(",", ":"))
+        write_json = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        binario_tonto.dump(model, bin_path)
+        write_bin = time.perf_counter() - t0
+        probes = [c["name"] for c in model["classes"][::max(1, len(model["classes"]) // 100)]]
+
+        def reparse():
+            m = build_parser().parse(text)
+            return [next(c for c in m["classes"] if c["name"] == n) for n in probes]
+
+        def from_json():
+            with open(json_path) as f:
+                rows = json.load(f)
+            by_name = {row[3]: row for package in rows for row in package[4] if row[0] == "class"}
+            return [by_name[n] for n in probes]
+
+        def from_bin():
+            with binario_tonto.load(bin_path) as m:
+                return [m.classes.find(n) for n in probes]
+
+        def from_json_full():
+            with open(json_path) as f:
+                return [_tree_from_rows(row) for row in json.load(f)]
+
+        def from_bin_full():
+            with binario_tonto.load(bin_path) as m:
+                return m.trees()
+
+        print(f"== modelo serializado ({len(text) / 1024:.0f} KiB de fonte, "
+              f"{len(model['classes'])} classes, {len(probes)} consultas) ==")
+        print(f"tamanho JSON     : {os.path.getsize(json_path) / 1024:8.0f} KiB  (grava em {write_json:.3f}s)")
+        print(f"tamanho binário  : {os.path.getsize(bin_path) / 1024:8.0f} KiB  (grava em {write_bin:.3f}s)")
+        for name, fn in (("re-parse", reparse), ("JSON", from_json), ("binário (mmap)", from_bin),
+                         ("JSON completo", from_json_full), ("binário completo", from_bin_full)):
+            t0 = time.perf_counter()
+            result = fn()
+            print(f"{name:17}: {time.perf_counter() - t0:8.4f}s")
+            if name.endswith("completo") and result != trees:
+                print(f"{name}: árvores diferentes do parse!")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _copy(value):
+    """Cópia não internada de uma string (como o lexer produzia antes)."""
+    return "".join(list(value)) if isinstance(value, str) else value
+
+
+def _as_tuples(node):
+    """Árvore antiga: ("kind", campos...), com filhos em listas e strings copiadas."""
+    values = [[_as_tuples(c) if isinstance(c, Node) else _copy(c) for c in v] if isinstance(v, list)
+              else tuple(map(_copy, v)) if isinstance(v, tuple) else _copy(v)
+              for v in (getattr(node, f) for f in node.fields)]
+    return (node.kind, *values)
+
+
+def _as_dicts(node):
+    """Um dict por nó com os campos e o span (start, end)."""
+    item = {"kind": node.kind, "start": node.start, "end": node.end}
+    for f in node.fields:
+        v = getattr(node, f)
+        item[f] = ([_as_dicts(c) if isinstance(c, Node) else _copy(c) for c in v] if isinstance(v, list)
+                   else _copy(v))
+    return item
+
+
+def bench_ast(size):
+    """Memória da árvore sintática: nós com __slots__ x tuplas x dicts."""
+    text = _big_package(size)
+    tree = build_parser().parse(text).tree
+    nodes = sum(1 for _ in tree.walk())
+    print(f"== árvore sintática ({len(text) / 1024:.0f} KiB de fonte, {nodes} nós) ==")
+    for name, value in (("nós (slots)", tree), ("tuplas", _as_tuples(tree)), ("dicts", _as_dicts(tree))):
+        size = deep_size(value)
+        print(f"{name:12}: {size / 1024:8.0f} KiB  ({size / nodes:6.1f} bytes/nó)")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmarks do lexer/parser Tonto")
+    ap.add_argument("--docs", type=int, default=2000)
+    ap.add_argument("--threads", type=int, default=4)
+    args = ap.parse_args()
+    bench_startup(args.docs)
+    bench_parser(args.docs, args.threads)
+    bench_cache(args.docs)
+    bench_stream([1000, 5000, 20000])
+    bench_columnar(5000)
+    bench_long_lines(2000)
+    bench_identifiers(5000)
+    bench_binary(4 * 1024 * 1024)
+    bench_ast(4 * 1024 * 1024)
+
+
+if __name__ == "__main__":
+    main()
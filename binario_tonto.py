@@ -0,0 +1,496 @@
+# binario_tonto.py
+# Formato binário compacto do modelo analisado (Ontologia), para ferramentas
+# que só precisam consultar o modelo (diagramas, geradores de código) sem
+# re-analisar o texto-fonte. O arquivo é aberto com mmap e navegado no lugar:
+# só os registros e strings efetivamente consultados são decodificados.
+# O modelo é gravado a partir da árvore de parse (arvore_tonto), sem perdas:
+# BinaryModel.trees() devolve as mesmas árvores, com os mesmos spans.
+#
+#   python binario_tonto.py ARQUIVO.tonto [-o ARQUIVO.tontob]
+#
+# Layout (inteiros little-endian; u32 no cabeçalho e nas tabelas):
+#   cabeçalho   MAGIC, versão, nº de seções, nº de strings, offset da tabela
+#               de strings
+#   seções      por seção: nome (string), formato dos registros (string no
+#               formato do struct, um código B/H/I por campo), nº de
+#               registros, offset dos registros, offset do índice por chave
+#   registros   por colunas: os valores de cada campo (LAYOUT) contíguos,
+#               cada coluna com a menor largura (u8/u16/u32) que comporta o
+#               seu maior valor; strings como índice na tabela, o maior valor
+#               da largura = ausente
+#   índice      permutação dos registros ordenada pelo primeiro campo,
+#               para busca binária por nome (u8/u16/u32 conforme o nº de
+#               registros)
+#   strings     offsets (n + 1) seguidos dos bytes UTF-8 concatenados, as
+#               mais frequentes primeiro (índices pequenos: estereótipos,
+#               tipos e modificadores cabem em um byte)
+import argparse
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from collections import Counter, namedtuple
+from functools import partial
+from operator import add
+
+MAGIC = b"TONTOBIN"
+FORMAT_VERSION = 3
+
+# seção -> (tipo do registro, campos); campos de texto são índices de string.
+# Uma seção por tipo de nó de arvore_tonto, em pré-ordem; os itens de um
+# package apontam para ele (`package`) e os filhos de classes, datatypes,
+# enums e gensets ficam contíguos na seção do filho (`*_first`, `*_count`).
+# `start`/`length` são a extensão do nó no texto e `line`/`col` o seu início.
+LAYOUT = {
+    "packages": ("Package", ("name", "start", "length", "line", "col")),
+    "classes": ("Class", ("name", "stereotype", "package", "attr_first", "attr_count",
+                          "rel_first", "rel_count", "start", "length", "line", "col")),
+    "attributes": ("Attribute", ("name", "type", "start", "length", "line", "col")),
+    "relations_internal": ("RelationInternal", ("stereotype", "target", "owner",
+                                                "start", "length", "line", "col")),
+    "datatypes": ("Datatype", ("name", "package", "attr_first", "attr_count",
+                               "start", "length", "line", "col")),
+    "enums": ("Enum", ("name", "package", "item_first", "item_count", "start", "length", "line", "col")),
+    "enum_items": ("EnumItem", ("name", "enum")),
+    "generalizations": ("Genset", ("general", "specific", "package", "mod_first", "mod_count",
+                                   "start", "length", "line", "col")),
+    "modifiers": ("Modifier", ("name", "genset")),
+    "relations_external": ("RelationExternal", ("stereotype", "name", "source", "target", "package",
+                                                "start", "length", "line", "col")),
+    "imports": ("Import", ("name", "package", "start", "length", "line", "col")),
+    "references": ("Reference", ("kind", "name", "line", "col")),
+}
+FIELDS = {secao: fields for secao, (_, fields) in LAYOUT.items()}
+_TEXT = {"name", "stereotype", "type", "target", "general", "specific", "source", "kind"}
+
+RECORDS = {secao: namedtuple(type_name, fields) for secao, (type_name, fields) in LAYOUT.items()}
+
+_HEADER = struct.Struct("<8sIIII")
+_SECTION = struct.Struct("<IIIII")
+_WIDTHS = (("B", 0xFF), ("H", 0xFFFF), ("I", 0xFFFFFFFF))
+_TOP = dict(_WIDTHS)
+_SIZES = {"B": 1, "H": 2, "I": 4}
+_ARRAY = {"B": "B", "H": "H", "I": "I" if array("I").itemsize == 4 else "L"}
+
+
+def _code(limit):
+    """Código struct do menor inteiro sem sinal que comporta `limit`."""
+    for code, top in _WIDTHS:
+        if limit <= top:
+            return code
+    raise ValueError(f"valor {limit} não cabe em u32")
+
+
+def _rows(ontologia):
+    """secao -> lista de tuplas de campos (ainda com strings), da árvore de parse."""
+    from parser_tonto import package_trees
+    index = getattr(ontologia, "line_index", None)
+    rows = {secao: [] for secao in FIELDS}
+
+    def place(node):
+        line, col = index.position(node.start) if index is not None else (0, 0)
+        return (node.start, node.end - node.start, line, col)
+
+    def attributes(nodes):
+        first = len(rows["attributes"])
+        for a in nodes:
+            rows["attributes"].append((a.name, a.type) + place(a))
+        return first, len(nodes)
+
+    for package in package_trees(ontologia):
+        p = len(rows["packages"])
+        rows["packages"].append((package.name,) + place(package))
+        for item in package.items:
+            kind = item.kind
+            if kind == "class":
+                c = len(rows["classes"])
+                attrs = attributes([e for e in item.elements if e.kind == "attribute"])
+                first = len(rows["relations_internal"])
+                relations = [e for e in item.elements if e.kind == "relation_internal"]
+                for r in relations:
+                    rows["relations_internal"].append((r.stereotype, r.target, c) + place(r))
+                rows["classes"].append((item.name, item.stereotype, p) + attrs
+                                       + (first, len(relations)) + place(item))
+            elif kind == "datatype":
+                attrs = attributes(item.attributes)
+                rows["datatypes"].append((item.name, p) + attrs + place(item))
+            elif kind == "enum":
+                e = len(rows["enums"])
+                first = len(rows["enum_items"])
+                rows["enum_items"].extend((name, e) for name in item.items)
+                rows["enums"].append((item.name, p, first, len(item.items)) + place(item))
+            elif kind == "genset":
+                g = len(rows["generalizations"])
+                first = len(rows["modifiers"])
+                rows["modifiers"].extend((name, g) for name in item.modifiers)
+                rows["generalizations"].append((item.general, item.specific, p, first,
+                                                len(item.modifiers)) + place(item))
+            elif kind == "relation_external":
+                rows["relations_external"].append((item.stereotype, item.name, item.source,
+                                                   item.target, p) + place(item))
+            elif kind == "import":
+                rows["imports"].append((item.name, p) + place(item))
+
+    offsets = getattr(ontologia, "spans", None) or {}
+    offsets = offsets.get("references", ())
+    for i, ref in enumerate(ontologia.get("references", [])):
+        if index is not None and i < len(offsets):
+            line, col = index.position(offsets[i])
+        else:
+            line, col = 0, 0
+        rows["references"].append((ref["kind"], ref["name"], line, col))
+    return rows
+
+
+def dumps(ontologia):
+    """Serializa uma Ontologia em bytes, a partir da sua árvore de parse.
+
+    Levanta ValueError se o modelo não tiver árvore (package_trees).
+    """
+    rows = _rows(ontologia)
+    # colunas de cada seção; as de texto decidem a numeração das strings
+    columns = {secao: [list(c) for c in zip(*rows[secao])] or [[] for _ in fields]
+               for secao, fields in FIELDS.items()}
+    counts = Counter(secao for secao in FIELDS)
+    for secao, fields in FIELDS.items():
+        for field, column in zip(fields, columns[secao]):
+            if field in _TEXT:
+                counts.update(column)
+    counts.pop(None, None)
+    names = sorted(counts, key=counts.get, reverse=True)
+    ids = {name: i for i, name in enumerate(names)}
+
+    formats = {}
+    for secao, fields in FIELDS.items():
+        codes = []
+        for j, field in enumerate(fields):
+            column = columns[secao][j]
+            if field in _TEXT:
+                column = [ids.get(v) for v in column]
+                # o maior valor da largura fica para "ausente"
+                code = _code(max((v + 1 for v in column if v is not None), default=0))
+                columns[secao][j] = [_TOP[code] if v is None else v for v in column]
+            else:
+                code = _code(max(column, default=0))
+            codes.append(code)
+        formats[secao] = "".join(codes)
+    for fmt in formats.values():
+        if fmt not in ids:
+            ids[fmt] = len(names)
+            names.append(fmt)
+
+    offset = _HEADER.size + _SECTION.size * len(FIELDS)
+    table, body = [], []
+    for secao in FIELDS:
+        data = []
+        for code, column in zip(formats[secao], columns[secao]):
+            values = array(_ARRAY[code], column)
+            if sys.byteorder == "big":
+                values.byteswap()
+            data.append(values.tobytes())
+        data = b"".join(data)
+        count = len(rows[secao])
+        keys = [row[0] or "" for row in rows[secao]]
+        order = sorted(range(count), key=keys.__getitem__)   # estável: empates na ordem do texto
+        index = struct.pack("<%d%s" % (count, _code(max(count - 1, 0))), *order)
+        table.append(_SECTION.pack(ids[secao], ids[formats[secao]], count, offset, offset + len(data)))
+        body.append(data)
+        body.append(index)
+        offset += len(data) + len(index)
+
+    blob = [name.encode("utf-8") for name in names]
+    starts = [0]
+    for b in blob:
+        starts.append(starts[-1] + len(b))
+    strings_part = struct.pack("<%dI" % len(starts), *starts) + b"".join(blob)
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, len(FIELDS), len(names), offset)
+    return b"".join([header] + table + body + [strings_part])
+
+
+def dump(ontologia, path):
+    """Grava o modelo em `path` (troca atômica do arquivo)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(dumps(ontologia))
+    os.replace(tmp, path)
+
+
+class Section:
+    """Registros de uma seção, decodificados um a um sob demanda."""
+
+    def __init__(self, model, name, fmt, count, offset, index_offset):
+        self.model = model
+        self.name = name
+        self.fields = FIELDS[name]
+        self.count = count
+        self._codes = fmt
+        # colunas contíguas, uma após a outra
+        self._starts = []
+        for code in fmt:
+            self._starts.append(offset)
+            offset += count * _SIZES[code]
+        self._cells = [struct.Struct("<" + code) for code in fmt]
+        self._index = struct.Struct("<" + _code(max(count - 1, 0)))
+        self._index_offset = index_offset
+        self._type = RECORDS[name]
+        self._new = partial(tuple.__new__, self._type)
+        # valor "ausente" de cada coluna de texto (None nas numéricas)
+        self._none = [_TOP[code] if f in _TEXT else None for f, code in zip(self.fields, fmt)]
+        self._text = [j for j, none in enumerate(self._none) if none is not None]
+
+    def __len__(self):
+        return self.count
+
+    def _cell(self, j, i):
+        cell = self._cells[j]
+        return cell.unpack_from(self.model.buffer, self._starts[j] + i * cell.size)[0]
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        row = [self._cell(j, i) for j in range(len(self.fields))]
+        for j in self._text:
+            row[j] = None if row[j] == self._none[j] else self.model.string(row[j])
+        return self._new(row)
+
+    def __iter__(self):
+        """Todos os registros, montados a partir das colunas decodificadas em bloco."""
+        return map(self._type, *self.columns().values())
+
+    def column(self, field):
+        """Todos os valores de um campo, decodificados em bloco."""
+        j = self.fields.index(field)
+        code = self._codes[j]
+        values = array(_ARRAY[code])
+        start = self._starts[j]
+        values.frombytes(self.model.buffer[start:start + self.count * _SIZES[code]])
+        if sys.byteorder == "big":
+            values.byteswap()
+        none = self._none[j]
+        if none is None:
+            return values.tolist()
+        strings = self.model.strings()
+        return [None if v == none else strings[v] for v in values]
+
+    def columns(self):
+        """campo -> lista dos valores de todos os registros (varredura completa
+        sem um objeto por registro)."""
+        return {field: self.column(field) for field in self.fields}
+
+    def slice(self, first, count):
+        """Os `count` registros a partir de `first` (os filhos de um nó)."""
+        return [self[i] for i in range(first, first + count)]
+
+    def _key_at(self, rank):
+        """Primeiro campo do registro na posição `rank` da ordem por chave."""
+        (i,) = self._index.unpack_from(self.model.buffer, self._index_offset + self._index.size * rank)
+        sid = self._cell(0, i)
+        return i, ("" if sid == self._none[0] else self.model.string(sid))
+
+    def _first(self, key):
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid)[1] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def find_all(self, key):
+        """Registros cujo primeiro campo (nome, general...) é `key`, por busca binária."""
+        out = []
+        rank = self._first(key)
+        while rank < self.count:
+            i, k = self._key_at(rank)
+            if k != key:
+                break
+            out.append(self[i])
+            rank += 1
+        return out
+
+    def find(self, key):
+        found = self.find_all(key)
+        return found[0] if found else None
+
+
+class BinaryModel:
+    """Modelo binário aberto via mmap; as seções são atributos (`model.classes`)."""
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self.buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._load()
+
+    @classmethod
+    def from_bytes(cls, data):
+        model = cls.__new__(cls)
+        model._file = None
+        model.buffer = data
+        model._load()
+        return model
+
+    def _load(self):
+        magic, version, nsections, nstrings, strings = _HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("não é um modelo binário Tonto")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"versão {version} do formato não suportada (esperada {FORMAT_VERSION})")
+        self._nstrings = nstrings
+        self._strings = strings
+        self._blob = strings + 4 * (nstrings + 1)
+        self._decoded = {}
+        self._all = None
+        self.sections = {}
+        for k in range(nsections):
+            name, fmt, count, offset, index = _SECTION.unpack_from(
+                self.buffer, _HEADER.size + k * _SECTION.size)
+            name = self.string(name)
+            self.sections[name] = Section(self, name, self.string(fmt), count, offset, index)
+
+    def strings(self):
+        """A tabela de strings inteira, decodificada uma vez (para varreduras)."""
+        if self._all is None:
+            n = self._nstrings
+            starts = struct.unpack_from("<%dI" % (n + 1), self.buffer, self._strings)
+            blob = self.buffer[self._blob:self._blob + starts[-1]]
+            self._all = [blob[a:b].decode("utf-8") for a, b in zip(starts, starts[1:])]
+        return self._all
+
+    def string(self, i):
+        if self._all is not None:
+            return self._all[i]
+        text = self._decoded.get(i)
+        if text is None:
+            start, end = struct.unpack_from("<II", self.buffer, self._strings + 4 * i)
+            text = self._decoded[i] = bytes(self.buffer[self._blob + start:self._blob + end]).decode("utf-8")
+        return text
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__["sections"][name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def trees(self, columns=None):
+        """Reconstrói as árvores de parse (arvore_tonto.Package), com os spans.
+
+        `columns` (seção -> Section.columns()) evita decodificar de novo as
+        seções que quem chama já leu.
+        """
+        from arvore_tonto import (Attribute, Class, Datatype, Enum, Genset, Import, Package,
+                                  RelationExternal, RelationInternal)
+        cols = columns or {name: section.columns() for name, section in self.sections.items()}
+
+        def nodes(cls, secao, *fields):
+            c = cols[secao]
+            return list(map(cls, c["start"], map(add, c["start"], c["length"]), *(c[f] for f in fields)))
+
+        attributes = nodes(Attribute, "attributes", "name", "type")
+        relations = nodes(RelationInternal, "relations_internal", "stereotype", "target")
+        enum_items = cols["enum_items"]["name"]
+        modifiers = cols["modifiers"]["name"]
+        items = [[] for _ in cols["packages"]["name"]]
+
+        c = cols["classes"]
+        for node, p, a, na, r, nr in zip(nodes(Class, "classes", "name", "stereotype"), c["package"],
+                                         c["attr_first"], c["attr_count"], c["rel_first"], c["rel_count"]):
+            node.elements = attributes[a:a + na]
+            if nr:
+                node.elements += relations[r:r + nr]
+                node.elements.sort(key=lambda n: n.span)
+            items[p].append(node)
+        c = cols["datatypes"]
+        for node, p, a, na in zip(nodes(Datatype, "datatypes", "name"), c["package"],
+                                  c["attr_first"], c["attr_count"]):
+            node.attributes = attributes[a:a + na]
+            items[p].append(node)
+        c = cols["enums"]
+        for node, p, i, ni in zip(nodes(Enum, "enums", "name"), c["package"],
+                                  c["item_first"], c["item_count"]):
+            node.items = enum_items[i:i + ni]
+            items[p].append(node)
+        c = cols["generalizations"]
+        for node, p, m, nm in zip(nodes(Genset, "generalizations", "general", "specific"),
+                                  c["package"], c["mod_first"], c["mod_count"]):
+            node.modifiers = tuple(modifiers[m:m + nm])
+            items[p].append(node)
+        for secao, cls, fields in (("relations_external", RelationExternal,
+                                    ("stereotype", "name", "source", "target")),
+                                   ("imports", Import, ("name",))):
+            for node, p in zip(nodes(cls, secao, *fields), cols[secao]["package"]):
+                items[p].append(node)
+
+        packages = nodes(Package, "packages", "name")
+        for package, children in zip(packages, items):
+            children.sort(key=lambda n: n.span)
+            package.items = children
+        return packages
+
+    def to_ontologia(self):
+        """Decodifica tudo de volta para uma Ontologia (árvore e seções, sem spans).
+
+        As seções de declaração estão na ordem do texto, a mesma do parse.
+        """
+        from parser_tonto import Ontologia
+        cols = {name: section.columns() for name, section in self.sections.items()}
+        trees = self.trees(cols)
+        ontologia = Ontologia()
+        ontologia.tree = trees[0] if len(trees) == 1 else trees
+        for secao, field in (("packages", "name"), ("datatypes", "name"), ("enums", "name"),
+                             ("generalizations", "general"), ("relations_internal", "stereotype"),
+                             ("relations_external", "stereotype"), ("imports", "name")):
+            ontologia[secao] = cols[secao][field]
+        c = cols["classes"]
+        ontologia["classes"] = [{"name": n, "stereotype": st} for n, st in zip(c["name"], c["stereotype"])]
+        c = cols["references"]
+        ontologia["references"] = [{"kind": k, "name": n} for k, n in zip(c["kind"], c["name"])]
+        return ontologia
+
+    def close(self):
+        if self._file is not None:
+            self.buffer.close()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load(path):
+    """Abre um modelo gravado por dump()."""
+    return BinaryModel(path)
+
+
+def main(argv=None):
+    from parser_tonto import build_parser
+    from lexer_tonto import format_diagnostic
+    ap = argparse.ArgumentParser(description="Grava o modelo de um arquivo Tonto em formato binário")
+    ap.add_argument("file", help="arquivo .tonto")
+    ap.add_argument("-o", "--output", help="saída (padrão: ARQUIVO.tontob)")
+    args = ap.parse_args(argv)
+
+    with open(args.file, encoding="utf-8") as f:
+        ontologia = build_parser().parse(f.read())
+    for d in ontologia.diagnostics:
+        print(format_diagnostic(d, args.file), file=sys.stderr)
+    output = args.output or os.path.splitext(args.file)[0] + ".tontob"
+    try:
+        dump(ontologia, output)
+    except ValueError as e:
+        sys.exit(f"{args.file}: {e}")
+    with load(output) as model:
+        counts = {name: len(section) for name, section in model.sections.items()}
+    print(f"{output}: {os.path.getsize(output)} bytes, {counts}")
+
+
+if __name__ == "__main__":
+    main()
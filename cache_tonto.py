@@ -0,0 +1,141 @@
+# cache_tonto.py
+# Cache em disco de fluxos de tokens e de resultados de parse, indexado pelo
+# hash do conteúdo do arquivo mais a versão do lexer/gramática. Qualquer
+# mudança em lexer_tonto.py, parser_tonto.py, arvore_tonto.py (os nós da
+# árvore vão no pickle do modelo) ou nas tabelas (parsetab.py) muda a versão
+# e invalida as entradas antigas, que saem por LRU.
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+
+import arvore_tonto
+import lexer_tonto
+import parser_tonto
+
+CACHE_FORMAT = 1
+DEFAULT_DIR = ".tonto_cache"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _read_source(module):
+    with open(module.__file__, "rb") as f:
+        return f.read()
+
+
+def cache_version():
+    """Assinatura de tudo que pode mudar a saída do lexer/parser."""
+    h = hashlib.sha256()
+    h.update(str(CACHE_FORMAT).encode())
+    h.update(parser_tonto.table_signature().encode())
+    h.update(lexer_tonto.lexer_signature().encode())
+    h.update(_read_source(lexer_tonto))
+    h.update(_read_source(parser_tonto))
+    h.update(_read_source(arvore_tonto))
+    return h.hexdigest()
+
+
+def pack_tokens(tokens_out):
+    """Lista de dicts -> lista de tuplas (type, value, line, col, subtype)."""
+    return [(t['type'], t['value'], t['line'], t['col'], t['subtype']) for t in tokens_out]
+
+
+def unpack_tokens(rows):
+    return [
+        {'type': ty, 'value': v, 'line': ln, 'col': col, 'subtype': st}
+        for ty, v, ln, col, st in rows
+    ]
+
+
+class Cache:
+    """Cache LRU limitado por tamanho total (bytes) em um diretório.
+
+    Cada entrada é um arquivo pickle; o mtime marca o último uso e a remoção
+    começa pelos mais antigos quando `max_bytes` é ultrapassado.
+    """
+
+    def __init__(self, directory=DEFAULT_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.version = cache_version()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._size = sum(e.stat().st_size for e in self._entries())
+
+    def _entries(self):
+        return [e for e in os.scandir(self.directory) if e.name.endswith(".pkl")]
+
+    def key(self, kind, text):
+        h = hashlib.sha256(self.version.encode())
+        h.update(text.encode("utf-8"))
+        return f"{kind}-{h.hexdigest()}"
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".pkl")
+
+    def get(self, kind, text):
+        path = self._path(self.key(kind, text))
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError,
+                AttributeError, ImportError, TypeError):   # pickle de outra versão
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)  # marca uso recente (LRU)
+        except OSError:
+            pass
+        self.hits += 1
+        return value
+
+    def put(self, kind, text, value):
+        path = self._path(self.key(kind, text))
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(value, f, pickle.HIGHEST_PROTOCOL)
+        size = os.path.getsize(tmp)
+        with self._lock:
+            try:
+                old = os.path.getsize(path)   # substituída: sai da conta
+            except OSError:
+                old = 0
+            os.replace(tmp, path)
+            self._size += size - old
+            if self._size > self.max_bytes:
+                self.evict()
+
+    def evict(self):
+        """Remove as entradas usadas há mais tempo até caber em `max_bytes`."""
+        entries = sorted(self._entries(), key=lambda e: e.stat().st_mtime)
+        total = sum(e.stat().st_size for e in entries)
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                total -= size
+            except OSError:
+                pass
+        self._size = total
+
+    # --- atalhos usados por analyze() e TontoParser ---
+    def get_tokens(self, text):
+        hit = self.get("tokens", text)
+        if hit is None:
+            return None
+        rows, summary = hit
+        return unpack_tokens(rows), summary
+
+    def put_tokens(self, text, tokens_out, summary):
+        self.put("tokens", text, (pack_tokens(tokens_out), summary))
+
+    def get_model(self, text):
+        return self.get("model", text)
+
+    def put_model(self, text, ontologia):
+        self.put("model", text, ontologia)
@@ -0,0 +1,185 @@
+# colunas_tonto.py
+# Armazenamento colunar de tokens: em vez de um dict de cinco chaves por
+# token, tipos e subtipos viram códigos inteiros e posição/tamanho/linha/coluna
+# ficam em colunas `array` (ou NumPy, se instalado). Os valores são
+# decodificados do texto-fonte apenas quando pedidos.
+import sys
+from array import array
+from collections import Counter, defaultdict
+
+from lexer_tonto import (SUBTYPE_COUNTERS, TYPE_COUNTERS, tokens, get_lexer, line_index,
+                         summary_table)
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional
+    np = None
+
+# códigos inteiros de tipo e subtipo (0 = sem subtipo)
+TYPE_NAMES = sorted(set(tokens) | {"PACKAGE"})
+TYPE_CODES = {name: i for i, name in enumerate(TYPE_NAMES)}
+SUBTYPE_NAMES = [None, "STEREOTYPE_CLASS", "STEREOTYPE_RELATION", "RESERVED_WORD"]
+SUBTYPE_CODES = {name: i for i, name in enumerate(SUBTYPE_NAMES)}
+
+
+def _decode(type_name, raw):
+    """Reproduz a conversão de valor feita pelas regras t_* do lexer."""
+    if type_name == "STRING":
+        return raw[1:-1]
+    if type_name == "NUMBER":
+        return float(raw) if "." in raw else int(raw)
+    if type_name == "BOOLEAN_LITERAL":
+        return raw == "true"
+    return sys.intern(raw)
+
+
+class TokenRow:
+    """Visão barata de uma linha do buffer com acesso estilo dict."""
+
+    __slots__ = ("buffer", "index")
+
+    KEYS = ("type", "value", "line", "col", "subtype")
+
+    def __init__(self, buffer, index):
+        self.buffer = buffer
+        self.index = index
+
+    def __getitem__(self, key):
+        b, i = self.buffer, self.index
+        if key == "type":
+            return TYPE_NAMES[b.type[i]]
+        if key == "value":
+            return b.value(i)
+        if key == "line":
+            return b.line[i]
+        if key == "col":
+            return b.col[i]
+        if key == "subtype":
+            return SUBTYPE_NAMES[b.subtype[i]]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return self.KEYS
+
+    def as_dict(self):
+        return {k: self[k] for k in self.KEYS}
+
+    def __repr__(self):
+        return f"TokenRow({self.as_dict()!r})"
+
+
+class TokenBuffer:
+    """Tokens de um documento em colunas paralelas.
+
+    Colunas: type/subtype (códigos), offset/length (no texto-fonte), line, col.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.type = array("B")
+        self.subtype = array("B")
+        self.offset = array("l")
+        self.length = array("l")
+        self.line = array("l")
+        self.col = array("l")
+        self._values = {}
+        self.line_index = None
+
+    def __len__(self):
+        return len(self.type)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return TokenRow(self, i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield TokenRow(self, i)
+
+    def raw(self, i):
+        start = self.offset[i]
+        return self.text[start:start + self.length[i]]
+
+    def value(self, i):
+        """Valor do token i, decodificado sob demanda (e memorizado)."""
+        v = self._values.get(i)
+        if v is None:
+            v = self._values[i] = _decode(TYPE_NAMES[self.type[i]], self.raw(i))
+        return v
+
+    def span(self, i):
+        """((linha, coluna), (linha, coluna)) do início e do fim do token i."""
+        start = self.offset[i]
+        return self.line_index.span(start, start + self.length[i])
+
+    def to_dicts(self):
+        """Converte para o formato de analyze() (lista de dicts)."""
+        return [row.as_dict() for row in self]
+
+    def columns(self):
+        """Colunas como arrays NumPy (cópia zero a partir dos buffers `array`)."""
+        if np is None:
+            raise ImportError("NumPy não está instalado")
+        return {
+            name: np.frombuffer(col, dtype="i%d" % col.itemsize if col.typecode == "l" else np.uint8)
+            for name, col in (("type", self.type), ("subtype", self.subtype),
+                              ("offset", self.offset), ("length", self.length),
+                              ("line", self.line), ("col", self.col))
+        }
+
+    def _code_counts(self):
+        """Contagem por código de tipo e de subtipo (vetorizada quando possível)."""
+        if np is not None and len(self):
+            t = np.bincount(np.frombuffer(self.type, dtype=np.uint8), minlength=len(TYPE_NAMES))
+            s = np.bincount(np.frombuffer(self.subtype, dtype=np.uint8), minlength=len(SUBTYPE_NAMES))
+            return t.tolist(), s.tolist()
+        tc, sc = Counter(self.type.tobytes()), Counter(self.subtype.tobytes())
+        return ([tc.get(i, 0) for i in range(len(TYPE_NAMES))],
+                [sc.get(i, 0) for i in range(len(SUBTYPE_NAMES))])
+
+    def counters(self):
+        """Contadores no mesmo formato usado por lexer_tonto.summary_table()."""
+        type_counts, subtype_counts = self._code_counts()
+        counters = defaultdict(int)
+        # tokens com subtipo (IDENT ou IMPORT) contam pelo subtipo; os demais pelo tipo
+        for name, key in SUBTYPE_COUNTERS.items():
+            counters[key] += subtype_counts[SUBTYPE_CODES[name]]
+        for name, key in TYPE_COUNTERS.items():
+            counters[key] += type_counts[TYPE_CODES[name]]
+        return counters
+
+    def summary(self):
+        return summary_table(self.counters())
+
+
+def analyze_columnar(text):
+    """Equivalente a analyze(), mas devolve um TokenBuffer (e a síntese)."""
+    buf = TokenBuffer(text)
+    lexer = get_lexer()
+    lexer.input(text)
+    index = buf.line_index = line_index(lexer)
+    column = index.column
+    append_type, append_sub = buf.type.append, buf.subtype.append
+    append_off, append_len = buf.offset.append, buf.length.append
+    append_line, append_col = buf.line.append, buf.col.append
+    codes, sub_codes = TYPE_CODES, SUBTYPE_CODES
+    while True:
+        tok = lexer.token()
+        if not tok:
+            break
+        append_type(codes[tok.type])
+        append_sub(sub_codes[getattr(tok, "stype", None)])
+        append_off(tok.lexpos)
+        append_len(lexer.lexpos - tok.lexpos)
+        append_line(tok.lineno)
+        append_col(column(tok.lexpos))
+    return buf, buf.summary()
@@ -0,0 +1,360 @@
+# compilador_tonto.py
+# Driver de compilação multi-arquivo: descobre os .tonto de um projeto, monta o
+# grafo de imports, analisa todos os arquivos em paralelo (ProcessPoolExecutor;
+# o parse de um arquivo não depende dos outros) e junta os modelos de cada
+# arquivo na ordem de dependência.
+#
+#   python compilador_tonto.py RAIZ [-j N] [--json] [--cache [DIR]]
+import argparse
+import bisect
+import json
+import os
+import re
+import sys
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from cache_tonto import Cache, DEFAULT_DIR
+from lexer_tonto import LineIndex, format_diagnostic
+from parser_tonto import Ontologia, SECOES, build_parser
+from semantica_tonto import resolve_project
+
+EXTENSAO = ".tonto"
+
+# varredura barata do texto-fonte, sem passar pelo lexer
+RE_IMPORT = re.compile(r'^\s*import\s+([A-Za-z_][\w.]*)', re.M)
+RE_PACKAGE = re.compile(r'^\s*package\s+([A-Za-z_][\w.]*)', re.M)
+
+
+def discover(root):
+    """Lista (ordenada) os arquivos .tonto sob `root`; aceita também um arquivo."""
+    if os.path.isfile(root):
+        return [os.path.abspath(root)]
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in filenames:
+            if name.endswith(EXTENSAO):
+                found.append(os.path.abspath(os.path.join(dirpath, name)))
+    found.sort()
+    return found
+
+
+def scan_source(text):
+    """Retorna (pacotes declarados, imports) de um texto-fonte."""
+    return RE_PACKAGE.findall(text), RE_IMPORT.findall(text)
+
+
+class ImportGraph:
+    """Grafo de imports entre arquivos de um projeto.
+
+    `deps[arquivo]` é o conjunto de arquivos dos quais ele depende e
+    `unresolved` a lista de (arquivo, import) que não casaram com nada.
+    """
+
+    def __init__(self, root, files):
+        self.root = os.path.abspath(root if os.path.isdir(root) else os.path.dirname(root))
+        self.files = list(files)
+        self.deps = {f: set() for f in self.files}
+        self.unresolved = []
+        self.packages = defaultdict(set)   # nome do pacote -> arquivos
+        self.users = defaultdict(set)      # arquivo -> arquivos que o importam
+        self._imports = {}
+        self._declared = {}                # arquivo -> pacotes declarados
+
+    @classmethod
+    def build(cls, root, files=None):
+        graph = cls(root, discover(root) if files is None else files)
+        for path in graph.files:
+            with open(path, encoding="utf-8") as f:
+                packages, imports = scan_source(f.read())
+            for name in packages:
+                graph.packages[name].add(path)
+            graph._declared[path] = packages
+            graph._imports[path] = imports
+        graph.link(graph.files)
+        return graph
+
+    def link(self, paths):
+        """(Re)calcula as dependências e os imports não resolvidos de `paths`."""
+        relinked = set(paths)
+        self.unresolved = [u for u in self.unresolved if u[0] not in relinked]
+        for path in paths:
+            for dep in self.deps.get(path, ()):
+                self.users[dep].discard(path)
+            deps = self.deps[path] = set()
+            for name in self._imports.get(path, ()):
+                targets = self.resolve(name)
+                if targets:
+                    deps.update(t for t in targets if t != path)
+                else:
+                    self.unresolved.append((path, name))
+            for dep in deps:
+                self.users[dep].add(path)
+
+    def update(self, path, packages, imports):
+        """Inclui ou atualiza um arquivo (varredura de scan_source) sem religar.
+
+        Devolve True se a estrutura mudou (arquivo novo ou outros pacotes
+        declarados): aí qualquer import pode resolver diferente e o chamador
+        religa todos os arquivos; senão basta religar `path`.
+        """
+        new = path not in self.deps
+        if new:
+            bisect.insort(self.files, path)
+            self.deps[path] = set()
+        old = self._declared.get(path, [])
+        self._imports[path] = imports
+        if not new and old == packages:
+            return False
+        for name in old:
+            self._discard_package(name, path)
+        for name in packages:
+            self.packages[name].add(path)
+        self._declared[path] = packages
+        return True
+
+    def remove(self, path):
+        """Tira um arquivo do grafo; os que o importavam precisam ser religados."""
+        for name in self._declared.pop(path, ()):
+            self._discard_package(name, path)
+        self._imports.pop(path, None)
+        self.link([path])
+        del self.deps[path]
+        self.users.pop(path, None)
+        self.unresolved = [u for u in self.unresolved if u[0] != path]
+        self.files.remove(path)
+
+    def _discard_package(self, name, path):
+        files = self.packages.get(name)
+        if files is not None:
+            files.discard(path)
+            if not files:
+                del self.packages[name]
+
+    def resolve(self, name):
+        """Resolve `a.b.C` para os arquivos que o declaram.
+
+        Tenta o nome completo e os prefixos como nome de pacote e, em seguida,
+        os caminhos a/b/C.tonto, a/b.tonto, a.tonto relativos à raiz.
+        """
+        parts = name.split(".")
+        for n in range(len(parts), 0, -1):
+            found = self.packages.get(".".join(parts[:n]))
+            if found:
+                return found
+        for n in range(len(parts), 0, -1):
+            path = os.path.join(self.root, *parts[:n]) + EXTENSAO
+            if path in self.deps:
+                return {path}
+        return set()
+
+    def dependents(self):
+        """Mapa inverso: arquivo -> arquivos que o importam."""
+        rev = {f: set() for f in self.files}
+        for path, deps in self.deps.items():
+            for dep in deps:
+                rev[dep].add(path)
+        return rev
+
+    def topological_order(self):
+        """Ordem em que dependências vêm antes; ciclos vão ao final, na ordem original."""
+        pending = {f: len(d) for f, d in self.deps.items()}
+        rev = self.dependents()
+        ready = [f for f in self.files if pending[f] == 0]
+        order = []
+        while ready:
+            path = ready.pop()
+            order.append(path)
+            for user in sorted(rev[path]):
+                pending[user] -= 1
+                if pending[user] == 0:
+                    ready.append(user)
+        done = set(order)
+        order.extend(f for f in self.files if f not in done)
+        return order
+
+
+# --- trabalho executado em cada processo ---
+_worker_parser = None
+_worker_cache = None
+
+
+def compile_file(path, cache_dir=None):
+    """Lexa e analisa um arquivo; retorna um dicionário serializável."""
+    global _worker_parser, _worker_cache
+    if cache_dir is not None and (_worker_cache is None or _worker_cache.directory != cache_dir):
+        _worker_cache = Cache(cache_dir)
+        _worker_parser = None
+    cache = _worker_cache if cache_dir is not None else None
+    if _worker_parser is None or _worker_parser.cache is not cache:
+        _worker_parser = build_parser(cache)
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    ontologia = _worker_parser.parse(text)
+    if ontologia.line_index is None:
+        ontologia.line_index = LineIndex(text)
+    return {
+        "path": path,
+        "summary": ontologia.summary,
+        "ontologia": ontologia,
+        "diagnostics": ontologia.diagnostics,
+    }
+
+
+class ProjectLines:
+    """Índice de linhas de vários arquivos, cada um em uma faixa de offsets.
+
+    Mesma interface de lexer_tonto.LineIndex para `position`/`column`, com
+    as respostas no arquivo dono do offset.
+    """
+
+    def __init__(self):
+        self.bases = []     # offset inicial da faixa de cada arquivo
+        self.paths = []
+        self.indexes = []   # LineIndex de cada arquivo
+        self.length = 0
+
+    def add(self, path, index):
+        """Acrescenta um arquivo; devolve a base dos offsets dele."""
+        base = self.length
+        self.bases.append(base)
+        self.paths.append(path)
+        self.indexes.append(index)
+        self.length += index.length + 1
+        return base
+
+    def _find(self, offset):
+        i = bisect.bisect_right(self.bases, offset) - 1
+        if i < 0 or offset > self.length:
+            raise IndexError(f"offset {offset} fora do projeto")
+        return i
+
+    def path(self, offset):
+        return self.paths[self._find(offset)]
+
+    def position(self, offset):
+        """offset -> (linha, coluna) no arquivo dono"""
+        i = self._find(offset)
+        return self.indexes[i].position(offset - self.bases[i])
+
+    def column(self, offset):
+        return self.position(offset)[1]
+
+    def locate(self, offset):
+        """offset -> (arquivo, linha, coluna)"""
+        i = self._find(offset)
+        return (self.paths[i], *self.indexes[i].position(offset - self.bases[i]))
+
+
+class Projeto:
+    """Resultado de compilar um projeto: modelos por arquivo e modelo unido."""
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.results = {}
+
+    @property
+    def order(self):
+        return self.graph.topological_order()
+
+    def merged(self):
+        """Une as Ontologias dos arquivos, dependências primeiro.
+
+        Os spans de cada arquivo entram deslocados para a faixa dele em um
+        ProjectLines (o `line_index` do modelo unido): `position()` responde
+        na linha/coluna do arquivo de origem e `line_index.path(offset)` diz
+        qual arquivo é.
+        """
+        ontologia = Ontologia()
+        lines = ontologia.line_index = ProjectLines()
+        for path in self.order:
+            result = self.results.get(path)
+            if result is None:
+                continue
+            part = result["ontologia"]
+            base = lines.add(path, part.line_index)
+            for secao in SECOES:
+                for value, offset in zip(part[secao], part.spans[secao]):
+                    ontologia.record(secao, value, base + offset)
+        return ontologia
+
+    def diagnostics(self):
+        """(arquivo, diagnóstico) de todos os arquivos, na ordem de compilação."""
+        for path in self.order:
+            result = self.results.get(path)
+            if result is not None:
+                for d in result["diagnostics"]:
+                    yield path, d
+
+    def resolve(self):
+        """Passo semântico (semantica_tonto) sobre os modelos de todos os arquivos."""
+        return resolve_project((path, self.results[path]["ontologia"])
+                               for path in self.order if path in self.results)
+
+    def summary(self):
+        total = Counter()
+        for result in self.results.values():
+            total.update(result["summary"])
+        return dict(total)
+
+
+def compile_project(root, workers=None, cache_dir=None):
+    """Compila todos os .tonto de `root` em paralelo.
+
+    O parse de um arquivo não precisa de nada das suas dependências, então
+    todos os arquivos vão ao pool de uma vez; a ordem de dependência só vale
+    na hora de juntar os modelos (Projeto.merged). Com `cache_dir` os
+    resultados são reaproveitados do cache em disco (cache_tonto).
+    """
+    graph = ImportGraph.build(root)
+    projeto = Projeto(graph)
+    files = graph.files
+    if workers == 1 or len(files) <= 1:
+        for path in files:
+            projeto.results[path] = compile_file(path, cache_dir)
+        return projeto
+
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunksize = max(1, len(files) // (workers * 4))
+        for path, result in zip(files, pool.map(compile_file, files, repeat(cache_dir),
+                                                chunksize=chunksize)):
+            projeto.results[path] = result
+    return projeto
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Compila um projeto Tonto multi-arquivo")
+    ap.add_argument("root", help="diretório do projeto (ou um arquivo .tonto)")
+    ap.add_argument("-j", "--jobs", type=int, default=None, help="processos (padrão: núcleos)")
+    ap.add_argument("--json", action="store_true", help="imprime o modelo unido em JSON")
+    ap.add_argument("--cache", nargs="?", const=DEFAULT_DIR, default=None,
+                    help=f"usa o cache em disco (padrão: {DEFAULT_DIR})")
+    args = ap.parse_args(argv)
+
+    projeto = compile_project(args.root, workers=args.jobs, cache_dir=args.cache)
+    for path, name in projeto.graph.unresolved:
+        print(f"[AVISO] import não resolvido '{name}' em {os.path.relpath(path)}", file=sys.stderr)
+    errors = 0
+    for path, d in projeto.diagnostics():
+        print(format_diagnostic(d, os.path.relpath(path)), file=sys.stderr)
+        errors += d["severity"] == "error"
+    for path, d in projeto.resolve().diagnostics:
+        print(format_diagnostic(d, os.path.relpath(path)), file=sys.stderr)
+        errors += d["severity"] == "error"
+    if args.json:
+        json.dump(projeto.merged(), sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        print(f"Arquivos: {len(projeto.results)}")
+        print("Síntese:", projeto.summary())
+        merged = projeto.merged()
+        print("Modelo:", {secao: len(merged[secao]) for secao in SECOES})
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
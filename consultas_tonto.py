@@ -0,0 +1,296 @@
+# consultas_tonto.py
+# Índice de consultas sobre modelos já analisados, para as perguntas que as
+# ferramentas repetem: "subkinds/roles/phases abaixo de Pessoa", "classes com
+# estereótipo kind", "relações mediation que tocam X". As declarações ficam
+# indexadas por nome e estereótipo, as relações por estereótipo e por ponta,
+# e o fecho transitivo do grafo de generalizações é memorizado por classe.
+#
+# O índice é alimentado por documento (update/remove): cada documento contribui
+# um conjunto de fatos e, quando muda, só os fatos que entraram ou saíram são
+# aplicados. Uma aresta de generalização que muda invalida apenas o fecho dos
+# ancestrais do general e dos descendentes do specific.
+#
+#   python consultas_tonto.py ARQUIVO|DIR [--sob Classe [--estereotipo E ...]]
+#                             [--com-estereotipo E] [--relacoes E] [--tocando Classe]
+import argparse
+import sys
+import time
+from collections import Counter, defaultdict, namedtuple
+
+from parser_tonto import build_parser, package_trees
+
+Declaration = namedtuple("Declaration", "package kind name stereotype")
+Generalization = namedtuple("Generalization", "package general specific modifiers")
+Relation = namedtuple("Relation", "package stereotype name source target")
+
+
+def facts(ontologia):
+    """Fatos (Declaration, Generalization, Relation) de um documento analisado."""
+    out = []
+    for tree in package_trees(ontologia):
+        package = tree.name
+        for item in tree.items:
+            kind = item.kind
+            if kind == "class":
+                out.append(Declaration(package, "class", item.name, item.stereotype))
+                for element in item.elements:
+                    if element.kind == "relation_internal":
+                        out.append(Relation(package, element.stereotype, None, item.name, element.target))
+            elif kind in ("datatype", "enum"):
+                out.append(Declaration(package, kind, item.name, None))
+            elif kind == "genset":
+                out.append(Generalization(package, item.general, item.specific, item.modifiers))
+            elif kind == "relation_external":
+                out.append(Relation(package, item.stereotype, item.name, item.source, item.target))
+    return out
+
+
+def _closure(start, edges, memo):
+    """Todos os nós alcançáveis a partir de `start` (sem ele), reaproveitando
+    fechos já memorizados dos nós intermediários."""
+    seen = set()
+    stack = list(edges.get(start, ()))
+    while stack:
+        node = stack.pop()
+        if node in seen:
+            continue
+        seen.add(node)
+        known = memo.get(node)
+        if known is not None:
+            seen |= known
+        else:
+            stack.extend(edges.get(node, ()))
+    seen.discard(start)  # ciclos de generalização não incluem a própria classe
+    return frozenset(seen)
+
+
+class QueryIndex:
+    """Índice incremental sobre um ou mais documentos.
+
+    Os conjuntos devolvidos são frozensets memorizados: a mesma pergunta, sem
+    mudança no modelo entre uma e outra, custa uma consulta a dicionário.
+    """
+
+    def __init__(self):
+        self._documents = {}                    # chave -> Counter de fatos
+        self._count = Counter()                 # fato -> nº de documentos/ocorrências
+        self._by_name = defaultdict(set)        # nome -> {Declaration}
+        self._by_stereotype = defaultdict(set)  # estereótipo -> {nome de classe}
+        self._children = defaultdict(set)       # general -> {specific}
+        self._parents = defaultdict(set)        # specific -> {general}
+        self._edges = Counter()                 # (general, specific) -> nº de gensets
+        self._gensets = defaultdict(set)        # specific -> {Generalization}
+        self._relations_by_stereotype = defaultdict(set)
+        self._relations_by_end = defaultdict(set)
+        self._descendants = {}
+        self._ancestors = {}
+        self._memo = {}                         # consultas por estereótipo/ponta
+
+    # --- atualização ---
+    def update(self, key, ontologia):
+        """Substitui a contribuição do documento `key` (arquivo, URI...)."""
+        new = Counter(facts(ontologia))
+        old = self._documents.get(key, Counter())
+        self._documents[key] = new
+        for fact, n in (old - new).items():
+            for _ in range(n):
+                self._remove(fact)
+        for fact, n in (new - old).items():
+            for _ in range(n):
+                self._add(fact)
+
+    def remove(self, key):
+        for fact, n in self._documents.pop(key, Counter()).items():
+            for _ in range(n):
+                self._remove(fact)
+
+    def _add(self, fact):
+        self._count[fact] += 1
+        if self._count[fact] > 1:
+            return
+        if isinstance(fact, Declaration):
+            self._by_name[fact.name].add(fact)
+            if fact.kind == "class":
+                self._by_stereotype[fact.stereotype].add(fact.name)
+                self._memo.pop(("stereotype", fact.stereotype), None)
+            self._memo.pop(("name", fact.name), None)
+            self._memo.pop(("stereotypes", fact.name), None)
+        elif isinstance(fact, Generalization):
+            self._gensets[fact.specific].add(fact)
+            self._memo.pop(("gensets", fact.specific), None)
+            edge = (fact.general, fact.specific)
+            self._edges[edge] += 1
+            if self._edges[edge] == 1:
+                self._invalidate(*edge)
+                self._children[fact.general].add(fact.specific)
+                self._parents[fact.specific].add(fact.general)
+        else:
+            self._relation_sets(fact, set.add)
+
+    def _remove(self, fact):
+        self._count[fact] -= 1
+        if self._count[fact] > 0:
+            return
+        del self._count[fact]
+        if isinstance(fact, Declaration):
+            self._by_name[fact.name].discard(fact)
+            if fact.kind == "class":
+                self._by_stereotype[fact.stereotype].discard(fact.name)
+                # outra declaração de mesmo nome e estereótipo mantém a classe
+                if any(d.kind == "class" and d.stereotype == fact.stereotype
+                       for d in self._by_name[fact.name]):
+                    self._by_stereotype[fact.stereotype].add(fact.name)
+                self._memo.pop(("stereotype", fact.stereotype), None)
+            self._memo.pop(("name", fact.name), None)
+            self._memo.pop(("stereotypes", fact.name), None)
+        elif isinstance(fact, Generalization):
+            self._gensets[fact.specific].discard(fact)
+            self._memo.pop(("gensets", fact.specific), None)
+            edge = (fact.general, fact.specific)
+            self._edges[edge] -= 1
+            if self._edges[edge] == 0:
+                del self._edges[edge]
+                self._invalidate(*edge)
+                self._children[fact.general].discard(fact.specific)
+                self._parents[fact.specific].discard(fact.general)
+        else:
+            self._relation_sets(fact, set.discard)
+
+    def _relation_sets(self, fact, op):
+        op(self._relations_by_stereotype[fact.stereotype], fact)
+        self._memo.pop(("relations", fact.stereotype), None)
+        for end in {fact.source, fact.target}:
+            op(self._relations_by_end[end], fact)
+            self._memo.pop(("touching", end), None)
+
+    def _invalidate(self, general, specific):
+        """A aresta general -> specific vai mudar: descarta os fechos afetados
+        (calculados com o grafo atual, antes da mudança)."""
+        if not self._descendants and not self._ancestors:
+            return  # nada memorizado (ex.: carga inicial)
+        up = self.ancestors(general) | {general}
+        down = self.descendants(specific) | {specific}
+        for name in up:
+            self._descendants.pop(name, None)
+        for name in down:
+            self._ancestors.pop(name, None)
+
+    # --- consultas ---
+    def _frozen(self, key, source):
+        found = self._memo.get(key)
+        if found is None:
+            found = self._memo[key] = frozenset(source)
+        return found
+
+    def declarations(self, name):
+        """Declarações (class/enum/datatype) com esse nome, em qualquer pacote."""
+        return self._frozen(("name", name), self._by_name.get(name, ()))
+
+    def stereotypes_of(self, name):
+        """Estereótipos das classes com esse nome (mais de um se a classe foi
+        declarada em vários pacotes)."""
+        key = ("stereotypes", name)
+        found = self._memo.get(key)
+        if found is None:
+            found = self._memo[key] = frozenset(d.stereotype for d in self.declarations(name)
+                                                if d.kind == "class")
+        return found
+
+    def classes(self, stereotype):
+        """Nomes das classes com o estereótipo (kind, role, phase...)."""
+        return self._frozen(("stereotype", stereotype), self._by_stereotype.get(stereotype, ()))
+
+    def descendants(self, name, *stereotypes):
+        """Classes que especializam `name`, direta ou indiretamente; com
+        `stereotypes`, só as que têm um deles."""
+        found = self._descendants.get(name)
+        if found is None:
+            found = self._descendants[name] = _closure(name, self._children, self._descendants)
+        if not stereotypes:
+            return found
+        # válido enquanto o fecho e os conjuntos por estereótipo forem os mesmos objetos
+        sets = tuple(self.classes(s) for s in stereotypes)
+        key = ("descendants", name, stereotypes)
+        cached = self._memo.get(key)
+        if cached is not None and cached[0] is found and all(a is b for a, b in zip(cached[1], sets)):
+            return cached[2]
+        result = frozenset().union(*(found & s for s in sets))
+        self._memo[key] = (found, sets, result)
+        return result
+
+    def ancestors(self, name):
+        """Classes que `name` especializa, direta ou indiretamente."""
+        found = self._ancestors.get(name)
+        if found is None:
+            found = self._ancestors[name] = _closure(name, self._parents, self._ancestors)
+        return found
+
+    def parents(self, name):
+        return frozenset(self._parents.get(name, ()))
+
+    def children(self, name):
+        return frozenset(self._children.get(name, ()))
+
+    def is_a(self, name, general):
+        return name == general or general in self.ancestors(name)
+
+    def gensets(self, specific):
+        """Generalizações em que `specific` é o specific (com os modificadores)."""
+        return self._frozen(("gensets", specific), self._gensets.get(specific, ()))
+
+    def relations(self, stereotype=None, touching=None):
+        """Relações com o estereótipo e/ou com `touching` como origem ou alvo."""
+        if stereotype is None and touching is None:
+            return frozenset(f for f in self._count if isinstance(f, Relation))
+        if touching is None:
+            return self._frozen(("relations", stereotype), self._relations_by_stereotype.get(stereotype, ()))
+        ends = self._frozen(("touching", touching), self._relations_by_end.get(touching, ()))
+        if stereotype is None:
+            return ends
+        return ends.intersection(self._relations_by_stereotype.get(stereotype, ()))
+
+
+def build_index(documents):
+    """Índice de (chave, Ontologia) — por exemplo (arquivo, modelo)."""
+    index = QueryIndex()
+    for key, ontologia in documents:
+        index.update(key, ontologia)
+    return index
+
+
+def main(argv=None):
+    from compilador_tonto import discover
+    from lexer_tonto import format_diagnostic
+    ap = argparse.ArgumentParser(description="Consultas sobre o modelo de arquivos Tonto")
+    ap.add_argument("root", help="arquivo .tonto ou diretório do projeto")
+    ap.add_argument("--sob", help="classes que especializam esta (fecho transitivo)")
+    ap.add_argument("--estereotipo", action="append", default=[], help="filtra --sob por estereótipo")
+    ap.add_argument("--com-estereotipo", help="classes com este estereótipo")
+    ap.add_argument("--relacoes", help="relações com este estereótipo")
+    ap.add_argument("--tocando", help="relações com esta classe como origem ou alvo")
+    args = ap.parse_args(argv)
+
+    parser = build_parser()
+    documents = []
+    for path in discover(args.root):
+        with open(path, encoding="utf-8") as f:
+            ontologia = parser.parse(f.read())
+        for d in ontologia.diagnostics:
+            print(format_diagnostic(d, path), file=sys.stderr)
+        if ontologia.tree is not None:
+            documents.append((path, ontologia))
+    t0 = time.perf_counter()
+    index = build_index(documents)
+    print(f"índice: {len(index._count)} fatos em {time.perf_counter() - t0:.3f}s", file=sys.stderr)
+
+    if args.sob:
+        print(" ".join(sorted(index.descendants(args.sob, *args.estereotipo))))
+    if args.com_estereotipo:
+        print(" ".join(sorted(index.classes(args.com_estereotipo))))
+    if args.relacoes or args.tocando:
+        for r in sorted(index.relations(args.relacoes, args.tocando), key=lambda r: tuple(map(str, r))):
+            print(f"{r.package}: {r.source} -{r.stereotype}{' ' + r.name if r.name else ''}-> {r.target}")
+
+
+if __name__ == "__main__":
+    main()
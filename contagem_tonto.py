@@ -0,0 +1,200 @@
+# contagem_tonto.py
+# Modo só-contagem: a tabela de síntese de analyze() (classes, relações,
+# palavras reservadas, instâncias, tipos nativos e meta-atributos) para um
+# corpus inteiro, sem montar tokens nem calcular colunas. Todas as categorias
+# vêm de identificadores, então basta uma varredura com re.findall que separa
+# os identificadores do resto (strings, números, símbolos e as mesmas
+# sequências inválidas que o lexer descarta) e um Counter por grafia: cada
+# grafia distinta é classificada uma vez (lexer_tonto.classify_spelling).
+#
+# Os arquivos são contados em paralelo (ProcessPoolExecutor); os totais por
+# arquivo ficam em uma matriz arquivos x categorias (NumPy, se instalado)
+# para percentis e arquivos fora da curva.
+#
+#   python contagem_tonto.py RAIZ [-j N] [--percentis 50,90,99] [--por-arquivo] [--json]
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from lexer_tonto import (SPELLINGS_MAX, SUBTYPE_COUNTERS, TYPE_COUNTERS, classify_spelling,
+                         iter_chunks, summary_table)
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional
+    np = None
+
+# colunas da matriz, na ordem de summary_table()
+CATEGORIAS = ("classes", "relations", "words_reserved", "instances", "native_types", "meta_attributes")
+
+# as alternativas do lexer, na mesma ordem (regras-função, símbolos do mais
+# longo ao mais curto, espaços) e, por último, as sequências descartadas por
+# t_error; só o identificador tem grupo, os demais casam como ''
+_SCAN = re.compile(
+    r'"(?:[^\\\n]|\\.)*?"'
+    r'|\d+(?:\.\d+)?'
+    r'|([A-Za-z_][A-Za-z0-9_]*)'
+    r'|<>--|--<>|\.\.|[{}()\[\]*@:,.]'
+    r'|[ \t\r\n]+'
+    r'|//[^\n]*|"[^\n]*|.(?:(?!<>--|--<>)[^A-Za-z0-9_\s"{}()\[\].*@:,])*')
+
+_KEYS = {}   # grafia -> contador de _token_record (ou None)
+
+
+def _counter_key(word):
+    key = _KEYS.get(word, False)
+    if key is False:
+        type_, stype = classify_spelling(word)
+        key = SUBTYPE_COUNTERS.get(stype) or TYPE_COUNTERS.get(type_)
+        if len(_KEYS) < SPELLINGS_MAX:
+            _KEYS[word] = key
+    return key
+
+
+def count_text(text, counters=None):
+    """Acumula em `counters` os contadores de analyze() para `text`."""
+    counters = defaultdict(int) if counters is None else counters
+    for word, n in Counter(_SCAN.findall(text)).items():
+        if word:
+            key = _counter_key(word)
+            if key is not None:
+                counters[key] += n
+    return counters
+
+
+def scan_text(text):
+    """A mesma síntese de analyze(text)[1], sem tokens nem colunas."""
+    return summary_table(count_text(text))
+
+
+def scan_file(path):
+    """Síntese de um arquivo como tupla na ordem de CATEGORIAS.
+
+    O arquivo é lido em blocos alinhados em fim de linha (nenhum token
+    atravessa uma quebra de linha), então a memória não depende do tamanho.
+    """
+    counters = defaultdict(int)
+    for chunk in iter_chunks(path):
+        count_text(chunk, counters)
+    summary = summary_table(counters)
+    return tuple(summary[c] for c in CATEGORIAS)
+
+
+def _percentile(values, q):
+    """Percentil com interpolação linear (o padrão de numpy.percentile)."""
+    values = sorted(values)
+    if not values:
+        return 0.0
+    pos = (len(values) - 1) * q / 100
+    lo = int(pos)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (pos - lo)
+
+
+class CorpusStats:
+    """Totais por arquivo (`rows`, arquivos x CATEGORIAS) e do corpus."""
+
+    def __init__(self, paths, rows):
+        self.paths = list(paths)
+        if np is not None:
+            self.rows = np.array(rows, dtype=np.int64).reshape(len(self.paths), len(CATEGORIAS))
+        else:
+            self.rows = [list(r) for r in rows]
+
+    def __len__(self):
+        return len(self.paths)
+
+    def column(self, categoria):
+        i = CATEGORIAS.index(categoria)
+        if np is not None:
+            return self.rows[:, i]
+        return [r[i] for r in self.rows]
+
+    def totals(self):
+        if np is not None:
+            return dict(zip(CATEGORIAS, self.rows.sum(axis=0).tolist()))
+        return {c: sum(self.column(c)) for c in CATEGORIAS}
+
+    def file(self, path):
+        row = self.rows[self.paths.index(path)]
+        return dict(zip(CATEGORIAS, row.tolist() if np is not None else row))
+
+    def percentiles(self, qs=(50, 90, 99)):
+        """categoria -> [percentil q de cada q em `qs`] sobre os arquivos."""
+        if np is not None and len(self):
+            table = np.percentile(self.rows, qs, axis=0)
+            return {c: table[:, i].tolist() for i, c in enumerate(CATEGORIAS)}
+        return {c: [_percentile(self.column(c), q) for q in qs] for c in CATEGORIAS}
+
+    def outliers(self, k=3.0):
+        """(arquivo, categoria, valor) acima de Q3 + k·IQR da categoria."""
+        fences = {c: q3 + k * (q3 - q1) for c, (q1, q3) in self.percentiles((25, 75)).items()}
+        out = []
+        if np is not None:
+            limits = np.array([fences[c] for c in CATEGORIAS])
+            for f, i in zip(*np.nonzero(self.rows > limits)):
+                out.append((self.paths[f], CATEGORIAS[i], int(self.rows[f, i])))
+        else:
+            for path, row in zip(self.paths, self.rows):
+                out.extend((path, c, v) for c, v in zip(CATEGORIAS, row) if v > fences[c])
+        return out
+
+
+def scan_corpus(paths, workers=None):
+    """Conta todos os arquivos, um processo por núcleo (workers=1: serial)."""
+    paths = list(paths)
+    workers = workers or os.cpu_count()
+    if workers == 1 or len(paths) <= 1:
+        rows = [scan_file(p) for p in paths]
+    else:
+        chunksize = max(1, len(paths) // (workers * 8))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            rows = list(pool.map(scan_file, paths, chunksize=chunksize))
+    return CorpusStats(paths, rows)
+
+
+def main(argv=None):
+    from compilador_tonto import discover
+    ap = argparse.ArgumentParser(description="Síntese (só contagens) de um corpus Tonto")
+    ap.add_argument("root", help="diretório do corpus (ou um arquivo .tonto)")
+    ap.add_argument("-j", "--jobs", type=int, default=None, help="processos (padrão: núcleos)")
+    ap.add_argument("--percentis", default="50,90,99", help="percentis por arquivo (padrão: 50,90,99)")
+    ap.add_argument("--fora-da-curva", type=float, default=3.0, metavar="K",
+                    help="relata arquivos acima de Q3 + K·IQR (padrão: 3)")
+    ap.add_argument("--por-arquivo", action="store_true", help="mostra a síntese de cada arquivo")
+    ap.add_argument("--json", action="store_true", help="relatório em JSON")
+    args = ap.parse_args(argv)
+
+    qs = [float(q) for q in args.percentis.split(",") if q]
+    t0 = time.perf_counter()
+    stats = scan_corpus(discover(args.root), args.jobs)
+    elapsed = time.perf_counter() - t0
+    outliers = stats.outliers(args.fora_da_curva)
+    if args.json:
+        report = {"files": len(stats), "elapsed_s": elapsed, "totals": stats.totals(),
+                  "percentiles": {"q": qs, **stats.percentiles(qs)},
+                  "outliers": [{"path": p, "category": c, "value": v} for p, c, v in outliers]}
+        if args.por_arquivo:
+            report["per_file"] = {p: stats.file(p) for p in stats.paths}
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+        return
+    if args.por_arquivo:
+        for path in stats.paths:
+            print(os.path.relpath(path), stats.file(path))
+    print(f"{len(stats)} arquivos em {elapsed:.3f}s")
+    print("Síntese:", stats.totals())
+    print(f"{'percentil':<16}" + "".join(f"{q:>10g}" for q in qs))
+    for categoria, values in stats.percentiles(qs).items():
+        print(f"{categoria:<16}" + "".join(f"{v:>10.1f}" for v in values))
+    for path, categoria, value in outliers:
+        print(f"[fora da curva] {os.path.relpath(path)}: {categoria} = {value}")
+
+
+if __name__ == "__main__":
+    main()
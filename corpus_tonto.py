@@ -0,0 +1,194 @@
+# corpus_tonto.py
+# Gerador de corpus Tonto sintético e reprodutível (mesma semente -> mesmos
+# arquivos), com tamanho e formato controláveis, para benchmarks.
+#
+#   python corpus_tonto.py SAIDA --size 10MB --shape mixed [--seed N]
+#
+# Formatos (shape):
+#   packages   muitos arquivos pequenos, um pacote cada
+#   deep       poucas classes com corpos longos (muitos atributos/relações)
+#   enums      pacotes dominados por enums
+#   gensets    pacotes dominados por generalizações
+#   relations  pacotes dominados por relações externas
+#   mixed      mistura de todos os itens
+# Todo arquivo gerado é aceito pela gramática de parser_tonto.
+import argparse
+import os
+import random
+import re
+
+from lexer_tonto import STEREOTYPE_CLASSES, STEREOTYPE_RELATIONS, NATIVE_TYPES
+
+SHAPES = ("packages", "deep", "enums", "gensets", "relations", "mixed")
+
+# estereótipos que o lexer reconhece (comparação em minúsculas)
+_CLASS_STEREOTYPES = sorted(s for s in STEREOTYPE_CLASSES if s == s.lower())
+_RELATION_STEREOTYPES = sorted(s for s in STEREOTYPE_RELATIONS if s == s.lower())
+_NATIVE = sorted(NATIVE_TYPES)
+
+# pesos dos itens de pacote por formato
+_ITEM_WEIGHTS = {
+    "packages":  {"class": 6, "enum": 1, "datatype": 1, "genset": 1, "relation": 1},
+    "deep":      {"class": 1},
+    "enums":     {"class": 1, "enum": 8},
+    "gensets":   {"class": 2, "genset": 8},
+    "relations": {"class": 2, "relation": 8},
+    "mixed":     {"class": 4, "enum": 1, "datatype": 1, "genset": 1, "relation": 2},
+}
+# tamanho alvo de cada arquivo por formato
+_FILE_BYTES = {"packages": 2 * 1024, "deep": 256 * 1024}
+_DEFAULT_FILE_BYTES = 64 * 1024
+
+_UNITS = {"": 1, "B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3}
+
+
+def parse_size(text):
+    """'10MB' -> 10485760"""
+    m = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([KMG]?B?)\s*', text.upper())
+    if not m:
+        raise ValueError(f"tamanho inválido: {text!r}")
+    return int(float(m.group(1)) * _UNITS[m.group(2)])
+
+
+def letters(n):
+    """Nome sem dígitos (dígitos virariam INSTANCE_NAME): 0 -> A, 26 -> BA..."""
+    out = ""
+    while True:
+        out = chr(65 + n % 26) + out
+        n //= 26
+        if not n:
+            return out
+
+
+class _Package:
+    """Gera o texto de um pacote item a item até atingir o tamanho alvo."""
+
+    def __init__(self, rng, shape, index):
+        self.rng = rng
+        self.shape = shape
+        self.name = "Pkg" + letters(index)
+        self.classes = []
+        self.counter = 0
+        kinds, weights = zip(*_ITEM_WEIGHTS[shape].items())
+        self.kinds = kinds
+        self.weights = weights
+
+    def _new_name(self, prefix):
+        self.counter += 1
+        return prefix + letters(self.counter)
+
+    def _class_ref(self):
+        return self.rng.choice(self.classes) if self.classes else "Thing"
+
+    def _attribute(self):
+        rng = self.rng
+        name = "attr" + letters(rng.randrange(10000)).lower()
+        kind = rng.random()
+        if kind < 0.6:
+            type_ = rng.choice(_NATIVE)
+        elif kind < 0.8:
+            type_ = self._class_ref()
+        else:
+            type_ = letters(rng.randrange(500)) + "DataType"
+        return f"{name} : {type_}"
+
+    def _class(self):
+        rng = self.rng
+        name = self._new_name("Class")
+        self.classes.append(name)
+        head = f"    {name} : {rng.choice(_CLASS_STEREOTYPES)}"
+        if self.shape == "deep":
+            n = rng.randrange(50, 400)
+        else:
+            n = rng.randrange(0, 6)
+        if not n:
+            return head + "\n"
+        body = []
+        for _ in range(n):
+            if rng.random() < 0.8:
+                body.append("        " + self._attribute())
+            else:
+                body.append(f"        {rng.choice(_RELATION_STEREOTYPES)} [..] <>-- [..] {self._class_ref()}")
+        return head + " {\n" + "\n".join(body) + "\n    }\n"
+
+    def _enum(self):
+        name = self._new_name("Enum")
+        items = " ".join("Item" + letters(i) for i in range(self.rng.randrange(2, 12)))
+        return f"    enum {name} {{ {items} }}\n"
+
+    def _datatype(self):
+        name = letters(self.counter) + "DataType"
+        self.counter += 1
+        attrs = "\n".join("        " + self._attribute() for _ in range(self.rng.randrange(1, 5)))
+        return f"    {name} {{\n{attrs}\n    }}\n"
+
+    def _genset(self):
+        general = self._class_ref()
+        specific = self._class_ref()
+        tail = ", complete" if self.rng.random() < 0.5 else ""
+        return f"    {general} {specific} {{ genset : disjoint{tail} }}\n"
+
+    def _relation(self):
+        rng = self.rng
+        stereo = rng.choice(_RELATION_STEREOTYPES)
+        return (f"    @{stereo} {rng.choice(_RELATION_STEREOTYPES)} "
+                f"{self._class_ref()} --<> {self._class_ref()}\n")
+
+    def render(self, target):
+        parts = [f"package {self.name} {{\n"]
+        size = len(parts[0]) + 2
+        makers = {"class": self._class, "enum": self._enum, "datatype": self._datatype,
+                  "genset": self._genset, "relation": self._relation}
+        while size < target:
+            kind = self.rng.choices(self.kinds, self.weights)[0]
+            if kind != "class" and not self.classes:
+                kind = "class"
+            item = makers[kind]()
+            parts.append(item)
+            size += len(item)
+        parts.append("}\n")
+        return "".join(parts)
+
+
+def generate(size, shape="mixed", seed=0):
+    """Gera (nome_do_arquivo, texto) até somar aproximadamente `size` bytes."""
+    if shape not in SHAPES:
+        raise ValueError(f"formato desconhecido: {shape!r} (use {', '.join(SHAPES)})")
+    rng = random.Random(seed)
+    per_file = _FILE_BYTES.get(shape, _DEFAULT_FILE_BYTES)
+    total = 0
+    index = 0
+    while total < size:
+        target = min(per_file, size - total)
+        text = _Package(rng, shape, index).render(target)
+        yield f"{shape}_{index:06d}.tonto", text
+        total += len(text.encode("utf-8"))
+        index += 1
+
+
+def write_corpus(directory, size, shape="mixed", seed=0):
+    """Grava o corpus em `directory`; retorna a lista de caminhos."""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for name, text in generate(size, shape, seed):
+        path = os.path.join(directory, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Gera um corpus Tonto sintético")
+    ap.add_argument("output", help="diretório de saída")
+    ap.add_argument("--size", default="1MB", help="tamanho total (ex.: 1KB, 10MB, 100MB)")
+    ap.add_argument("--shape", default="mixed", choices=SHAPES)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+    paths = write_corpus(args.output, parse_size(args.size), args.shape, args.seed)
+    total = sum(os.path.getsize(p) for p in paths)
+    print(f"{len(paths)} arquivos, {total / 1024:.1f} KiB em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# debug_servidor.py
+# Cliente LSP roteirizado: sobe servidor_tonto.py, abre um documento, aplica
+# edições incrementais e imprime diagnósticos, símbolos e uma definição.
+import json
+import os
+import subprocess
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+code = """package MyPkg {
+    Person : kind {
+        name : string
+    }
+    Student : role {
+        tutor : Person
+    }
+    Person Student { genset : disjoint }
+}
+"""
+
+proc = subprocess.Popen([sys.executable, os.path.join(HERE, "servidor_tonto.py")],
+                        stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+next_id = 0
+
+
+def send(method, params, request=True):
+    global next_id
+    msg = {"jsonrpc": "2.0", "method": method, "params": params}
+    if request:
+        next_id += 1
+        msg["id"] = next_id
+    body = json.dumps(msg).encode("utf-8")
+    proc.stdin.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+    proc.stdin.flush()
+    if request:
+        while True:
+            reply = receive()
+            if reply.get("id") == msg["id"]:
+                return reply.get("result")
+
+
+def receive():
+    length = 0
+    while True:
+        line = proc.stdout.readline().strip()
+        if not line:
+            break
+        name, _, value = line.decode("ascii").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    msg = json.loads(proc.stdout.read(length))
+    if msg.get("method") == "textDocument/publishDiagnostics":
+        print("=== DIAGNÓSTICOS ===")
+        for d in msg["params"]["diagnostics"]:
+            start = d["range"]["start"]
+            print(f"  {start['line'] + 1}:{start['character'] + 1} {d['message']}")
+    return msg
+
+
+uri = "file:///tmp/exemplo.tonto"
+send("initialize", {"capabilities": {}})
+send("initialized", {}, request=False)
+send("textDocument/didOpen", {"textDocument": {"uri": uri, "languageId": "tonto",
+                                               "version": 1, "text": code}}, request=False)
+receive()
+
+print("=== SÍMBOLOS ===")
+for sym in send("textDocument/documentSymbol", {"textDocument": {"uri": uri}}):
+    print(" ", sym["name"], [c["name"] for c in sym["children"]])
+
+print("=== DEFINIÇÃO de 'Person' na linha 6 ===")
+print(" ", send("textDocument/definition", {"textDocument": {"uri": uri},
+                                            "position": {"line": 5, "character": 18}}))
+
+# troca 'Person' por 'Pessoa' no atributo da linha 6 e insere um ';'
+send("textDocument/didChange", {
+    "textDocument": {"uri": uri, "version": 2},
+    "contentChanges": [
+        {"range": {"start": {"line": 5, "character": 16}, "end": {"line": 5, "character": 22}},
+         "text": "Pessoa"},
+        {"range": {"start": {"line": 2, "character": 21}, "end": {"line": 2, "character": 21}},
+         "text": ";"},
+    ]}, request=False)
+receive()
+
+send("shutdown", None)
+send("exit", None, request=False)
+print("código de saída:", proc.wait())
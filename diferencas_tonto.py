@@ -0,0 +1,261 @@
+# diferencas_tonto.py
+# Diff estrutural entre duas versões de um modelo. Cada nó da árvore do parse
+# (projeto > package > classe > atributos/relações, enums > itens...) recebe
+# um hash de conteúdo estável no estilo Merkle: o hash do nó cobre os seus
+# campos e o hash dos filhos. Os filhos ficam em um trie pelo hash da chave
+# (nós internos de FANOUT ramos, folhas com até LEAF filhos), de modo que a
+# comparação só desce pelos ramos cujos hashes diferem: com as duas árvores
+# montadas, o custo do diff acompanha o tamanho da mudança, não o do modelo.
+#
+#   python diferencas_tonto.py ANTIGO NOVO [--json]
+#
+# ANTIGO e NOVO são arquivos .tonto ou diretórios de projeto.
+import argparse
+import hashlib
+import json
+import sys
+import time
+
+from parser_tonto import build_parser, package_trees
+
+FANOUT = 16   # ramos por nó interno do trie (um dígito hexadecimal do hash)
+LEAF = 32     # até quantos filhos um nó do trie compara chave a chave
+
+# tipo do nó da árvore do parse (arvore_tonto) -> (tipo no diff, nome, campos, filhos)
+_ITENS = {
+    "class": lambda n: ("class", n.name, (n.stereotype,), n.elements),
+    "attribute": lambda n: ("attribute", n.name, (n.type,), ()),
+    "relation_internal": lambda n: ("relation", n.target, (n.stereotype,), ()),
+    "datatype": lambda n: ("datatype", n.name, (), n.attributes),
+    "enum": lambda n: ("enum", n.name, (), n.items),
+    "genset": lambda n: ("genset", f"{n.general} {n.specific}", (", ".join(n.modifiers),), ()),
+    "relation_external": lambda n: ("relation", n.name, (n.stereotype, n.source, n.target), ()),
+    "import": lambda n: ("import", n.name, (), ()),
+}
+
+# rótulo de cada campo, para relatar o que mudou
+CAMPOS = {
+    "class": ("stereotype",),
+    "attribute": ("type",),
+    "genset": ("modifiers",),
+}
+_CAMPOS_RELACAO = {1: ("stereotype",), 3: ("stereotype", "source", "target")}
+
+
+def _digest(*parts):
+    return hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=16).digest()
+
+
+class Node:
+    """Um nó do modelo: tipo, nome, campos próprios e filhos (Children)."""
+
+    __slots__ = ("kind", "name", "fields", "children", "digest")
+
+    def __init__(self, kind, name, fields=(), children=None):
+        self.kind = kind
+        self.name = name
+        self.fields = tuple(fields)
+        self.children = children
+        self.digest = _digest(kind, name, self.fields, children.digest if children else b"")
+
+    def __repr__(self):
+        return f"Node({self.kind} {self.name}, {self.digest.hex()[:8]})"
+
+
+class Children:
+    """Filhos de um nó indexados por chave em um trie de hashes.
+
+    A chave de um filho é (tipo, nome) e, para repetições, (tipo, nome, n).
+    O ramo no nível `depth` é o dígito hexadecimal `depth` do hash da chave,
+    então as duas versões de um mesmo nó têm tries alinhados. Conjuntos
+    pequenos (a maioria: atributos de uma classe) nem calculam esse hash.
+    """
+
+    __slots__ = ("digest", "leaf", "buckets", "size")
+
+    def __init__(self, entries, depth=0):
+        # entries: lista de (hash da chave ou None, chave, Node)
+        self.size = len(entries)
+        if len(entries) <= LEAF or depth >= 32:
+            self.leaf = {key: node for _, key, node in entries}
+            self.buckets = None
+            self.digest = _digest(*sorted((key, node.digest) for _, key, node in entries))
+        else:
+            groups = [[] for _ in range(FANOUT)]
+            for entry in entries:
+                byte = entry[0][depth >> 1]
+                groups[byte >> 4 if depth & 1 == 0 else byte & 15].append(entry)
+            self.leaf = None
+            self.buckets = [Children(g, depth + 1) if g else None for g in groups]
+            self.digest = _digest(*(b.digest if b else b"" for b in self.buckets))
+
+    def __len__(self):
+        return self.size
+
+    def items(self):
+        if self.buckets is None:
+            yield from self.leaf.items()
+        else:
+            for bucket in self.buckets:
+                if bucket is not None:
+                    yield from bucket.items()
+
+
+_EMPTY = Children([])
+
+
+def _children(items):
+    entries = []
+    seen = {}
+    for node in items:
+        key = (node.kind, node.name)
+        n = seen.get(key, 0)
+        seen[key] = n + 1
+        if n:
+            key = key + (n,)
+        entries.append((None, key, node))
+    if not entries:
+        return None
+    if len(entries) > LEAF:
+        entries = [(_digest(key), key, node) for _, key, node in entries]
+    return Children(entries)
+
+
+def _node(item):
+    if isinstance(item, str):   # item de enum
+        return Node("item", item)
+    kind, name, fields, sub = _ITENS[item.kind](item)
+    return Node(kind, name, fields, _children(_node(s) for s in sub))
+
+
+def build(documents):
+    """Árvore Merkle (nó "project") de uma ou várias Ontologias.
+
+    Itens de um mesmo package espalhado por vários arquivos viram filhos de
+    um único nó package.
+    """
+    packages = {}
+    for ontologia in documents:
+        for package in package_trees(ontologia):
+            packages.setdefault(package.name, []).extend(package.items)
+    return Node("project", None, (), _children(
+        Node("package", name, (), _children(_node(i) for i in items))
+        for name, items in packages.items()))
+
+
+def _path(parent, node):
+    return f"{parent}.{node.name}" if parent else str(node.name)
+
+
+def _labels(node):
+    if node.kind == "relation":
+        return _CAMPOS_RELACAO[len(node.fields)]
+    return CAMPOS.get(node.kind, ())
+
+
+def _change(out, action, node, path, old=None, new=None, field=None):
+    change = {"action": action, "kind": node.kind, "path": path}
+    if field is not None:
+        change.update(field=field, old=old, new=new)
+    elif action != "removed":
+        change["fields"] = dict(zip(_labels(node), node.fields))
+    out.append(change)
+
+
+def _diff_node(old, new, path, out):
+    if old.fields != new.fields:
+        for label, a, b in zip(_labels(new), old.fields, new.fields):
+            if a != b:
+                _change(out, "changed", new, path, a, b, label)
+    a, b = old.children or _EMPTY, new.children or _EMPTY
+    if a.digest != b.digest:
+        _diff_children(a, b, path, out)
+
+
+def _diff_children(a, b, path, out):
+    if a.digest == b.digest:
+        return
+    if a.buckets is not None and b.buckets is not None:
+        for x, y in zip(a.buckets, b.buckets):
+            if x is not None or y is not None:
+                _diff_children(x or _EMPTY, y or _EMPTY, path, out)
+        return
+    old = dict(a.items())
+    new = dict(b.items())
+    for key, node in old.items():
+        other = new.get(key)
+        if other is None:
+            _change(out, "removed", node, _path(path, node))
+        elif other.digest != node.digest:
+            _diff_node(node, other, _path(path, node), out)
+    for key, node in new.items():
+        if key not in old:
+            _change(out, "added", node, _path(path, node))
+
+
+def diff(old, new):
+    """Lista de mudanças entre duas árvores de build(), ordenada por caminho.
+
+    Cada mudança é um dict {"action": added|removed|changed, "kind", "path"}
+    com "fields" (itens novos) ou "field", "old" e "new" (campo alterado).
+    Subárvores inteiras adicionadas ou removidas aparecem uma vez, pela raiz.
+    """
+    out = []
+    if old.digest != new.digest:
+        _diff_node(old, new, "", out)
+    out.sort(key=lambda c: (c["path"], c["action"]))
+    return out
+
+
+def format_change(c):
+    if c["action"] == "changed":
+        return f"~ {c['kind']} {c['path']}: {c['field']} {c['old']} -> {c['new']}"
+    sign = "+" if c["action"] == "added" else "-"
+    fields = "".join(f" {k}={v}" for k, v in c.get("fields", {}).items())
+    return f"{sign} {c['kind']} {c['path']}{fields}"
+
+
+def _load(root, parser):
+    from compilador_tonto import discover
+    from lexer_tonto import format_diagnostic
+    documents = []
+    for path in discover(root):
+        with open(path, encoding="utf-8") as f:
+            ontologia = parser.parse(f.read())
+        for d in ontologia.diagnostics:
+            print(format_diagnostic(d, path), file=sys.stderr)
+        documents.append(ontologia)
+    return documents
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Diff estrutural entre duas versões de um modelo Tonto")
+    ap.add_argument("old", help="arquivo .tonto ou diretório (versão antiga)")
+    ap.add_argument("new", help="arquivo .tonto ou diretório (versão nova)")
+    ap.add_argument("--json", action="store_true", help="mudanças em JSON")
+    args = ap.parse_args(argv)
+
+    parser = build_parser()
+    try:
+        t0 = time.perf_counter()
+        old = build(_load(args.old, parser))
+        new = build(_load(args.new, parser))
+        t1 = time.perf_counter()
+    except ValueError as e:
+        print(f"erro: {e}", file=sys.stderr)
+        sys.exit(2)
+    changes = diff(old, new)
+    t2 = time.perf_counter()
+    if args.json:
+        json.dump(changes, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        for c in changes:
+            print(format_change(c))
+        print(f"{len(changes)} mudanças (parse+hash {t1 - t0:.3f}s, diff {t2 - t1:.4f}s)",
+              file=sys.stderr)
+    sys.exit(1 if changes else 0)
+
+
+if __name__ == "__main__":
+    main()
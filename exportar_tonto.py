@@ -0,0 +1,276 @@
+# exportar_tonto.py
+# Exportação do modelo para JSON em fluxo: o arquivo-fonte é lido em blocos
+# (lexer_tonto.iter_chunks), o parser roda sobre esse fluxo de tokens e cada
+# package, classe, relação e generalização é escrito na saída assim que a sua
+# redução termina, sem montar a Ontologia inteira na memória. A memória fica
+# limitada ao bloco atual, aos blocos ainda referenciados pela pilha do LR e
+# ao buffer de escrita.
+#
+#   python exportar_tonto.py ARQUIVO.tonto [-o SAIDA.json] [--formato tonto|ontouml]
+#
+# Formatos:
+#   tonto     {"format": "tonto", "version": 1, "elements": [...], "diagnostics": [...]}
+#             um elemento por registro do parser ({"section", ..., "line", "col"}),
+#             na ordem das reduções
+#   ontouml   {"type": "Project", "model": {"type": "Package", "contents": [...]}}
+#             no estilo do ontouml-schema (Class, Relation, Generalization);
+#             ids derivados dos nomes, então referências não precisam esperar
+#             a declaração do alvo
+import argparse
+import bisect
+import copy
+import json
+import sys
+
+from lexer_tonto import CHUNK_SIZE, LineIndex, format_diagnostic, get_lexer, iter_chunks
+
+BUFFER_SIZE = 1 << 20
+FORMATOS = ("tonto", "ontouml")
+
+
+_dump = json.JSONEncoder(ensure_ascii=False).encode
+
+
+class JsonWriter:
+    """Formato `tonto`: um objeto por registro dentro de "elements"."""
+
+    def __init__(self, out):
+        self.out = out
+        self._first = True
+
+    def begin(self):
+        self.out.write('{"format": "tonto", "version": 1, "elements": [')
+
+    def _element(self, item):
+        self.out.write("\n" if self._first else ",\n")
+        self._first = False
+        self.out.write(_dump(item))
+
+    def element(self, secao, value, line, col, ends=None):
+        """Um registro completo; `ends` traz as pontas (general, source...)."""
+        if secao == "classes":
+            item = {"section": secao, "name": value["name"], "stereotype": value["stereotype"]}
+        elif secao == "references":
+            item = {"section": secao, "kind": value["kind"], "name": value["name"]}
+        elif secao.startswith("relations"):
+            item = {"section": secao, "stereotype": value}
+        elif secao == "generalizations":
+            item = {"section": secao}
+        else:
+            item = {"section": secao, "name": value}
+        if ends:
+            item.update(ends)
+        item["line"] = line
+        item["col"] = col
+        self._element(item)
+
+    def end(self, diagnostics):
+        self.out.write("\n], \"diagnostics\": ")
+        self.out.write(_dump(diagnostics))
+        self.out.write("}\n")
+
+
+class OntoUMLWriter(JsonWriter):
+    """Formato `ontouml`: Project > Package > contents.
+
+    O nome do package só é conhecido na última redução, então "id" e "name"
+    do Package (e do Project) vêm depois de "contents".
+    """
+
+    def __init__(self, out):
+        super().__init__(out)
+        self.package = None
+        self._count = 0
+
+    def begin(self):
+        self.out.write('{"type": "Project", "model": {"type": "Package", "contents": [')
+
+    def _id(self, prefix):
+        self._count += 1
+        return f"{prefix}:{self._count}"
+
+    @staticmethod
+    def _class(name):
+        return {"type": "Class", "id": f"class:{name}"} if name is not None else None
+
+    def _property(self, name):
+        return {"type": "Property", "id": self._id("property"), "propertyType": self._class(name)}
+
+    def element(self, secao, value, line, col, ends=None):
+        ends = ends or {}
+        if secao == "classes":
+            item = dict(self._class(value["name"]), name=value["name"], stereotype=value["stereotype"])
+        elif secao == "datatypes":
+            item = dict(self._class(value), name=value, stereotype="datatype")
+        elif secao == "enums":
+            item = dict(self._class(value), name=value, stereotype="enumeration")
+        elif secao == "generalizations":
+            item = {"type": "Generalization", "id": self._id("generalization"),
+                    "general": self._class(ends.get("general")),
+                    "specific": self._class(ends.get("specific"))}
+        elif secao.startswith("relations"):
+            item = {"type": "Relation", "id": self._id("relation"), "name": None, "stereotype": value,
+                    "properties": [self._property(ends.get("source")),
+                                   self._property(ends.get("target"))]}
+        elif secao == "packages":
+            self.package = value
+            return
+        else:  # imports e references não têm equivalente no schema
+            return
+        self._element(item)
+
+    def end(self, diagnostics):
+        # sem package (entrada vazia ou sem package reconhecido): ids nulos
+        name = self.package
+        package_id = _dump(f"package:{name}" if name is not None else None)
+        project_id = _dump(f"project:{name}" if name is not None else None)
+        self.out.write(f'\n], "id": {package_id}, "name": {_dump(name)}}}, '
+                       f'"id": {project_id}, "name": {_dump(name)}}}\n')
+
+
+WRITERS = {"tonto": JsonWriter, "ontouml": OntoUMLWriter}
+
+
+class ExportSink:
+    """Faz as vezes da Ontologia durante o parse: repassa cada registro ao writer.
+
+    As produções registram as pontas (`reference`) antes do item, então
+    gensets e relações externas já saem completos. A relação interna é
+    reduzida antes da classe dona; o nome da dona vem da pilha do LR, onde
+    `CLASS_NAME : IDENT {` ainda aguarda o fim do bloco.
+    """
+
+    keep_tree = False
+
+    def __init__(self, writer, positions, lr):
+        self.writer = writer
+        self.positions = positions
+        self._lr = lr
+        self._ends = {}
+
+    def _owner(self):
+        stack = self._lr.symstack
+        for i in range(len(stack) - 1, 2, -1):
+            if stack[i].type == "LBRACE" and stack[i - 3].type == "CLASS_NAME" \
+                    and stack[i - 2].type == "COLON" and stack[i - 1].type == "IDENT":
+                return stack[i - 3].value
+        return None
+
+    def reference(self, kind, name, offset):
+        if kind != "type":
+            self._ends[kind] = name
+        self.record("references", {"kind": kind, "name": name}, offset)
+
+    def record(self, secao, value, offset):
+        line, col = self.positions.position(offset)
+        if secao == "references":
+            self.writer.element(secao, value, line, col)
+            return
+        ends, self._ends = self._ends, {}
+        if secao == "relations_internal":
+            ends = {"source": self._owner(), "target": ends.get("target")}
+        self.writer.element(secao, value, line, col, ends)
+
+
+class _ChunkFeed:
+    """Lexer para o parser sobre blocos de texto, com offsets absolutos.
+
+    Guarda o LineIndex de cada bloco enquanto algum token dele estiver na
+    pilha do LR (um item ainda não reduzido); os demais são descartados.
+    Serve também de índice de linhas (`position`/`column`) para o parser.
+    """
+
+    def __init__(self, chunks, lr):
+        self._chunks = iter(chunks)
+        self._lr = lr
+        self.lexer = get_lexer()
+        self.diagnostics = self.lexer.diagnostics
+        self.lexdata = ""
+        self._line_index = (self.lexdata, self)
+        self.lineno = 1
+        self.end = 0
+        self._bases = []    # offset inicial de cada bloco retido
+        self._blocks = []   # (primeira linha, LineIndex) de cada bloco retido
+
+    def token(self):
+        while True:
+            tok = self.lexer.token() if self._bases else None
+            if tok is not None:
+                tok.lexpos += self._bases[-1]
+                tok.lexer = self
+                return tok
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return None
+            self._advance(chunk)
+
+    def _advance(self, chunk):
+        if self._bases:
+            keep = {len(self._bases) - 1}
+            for tok in getattr(self._lr, "symstack", ()):
+                if hasattr(tok, "lexpos"):
+                    keep.add(bisect.bisect_right(self._bases, tok.lexpos) - 1)
+            self._bases = [b for i, b in enumerate(self._bases) if i in keep]
+            self._blocks = [b for i, b in enumerate(self._blocks) if i in keep]
+        lineno = self.lexer.lineno
+        self.lexer.input(chunk)
+        self.lexer.lineno = lineno
+        self._bases.append(self.end)
+        self._blocks.append((lineno, LineIndex(chunk)))
+        self.end += len(chunk)
+
+    def position(self, offset):
+        i = bisect.bisect_right(self._bases, offset) - 1
+        if i < 0:
+            return 1, 1
+        first, index = self._blocks[i]
+        line, col = index.position(offset - self._bases[i])
+        return first + line - 1, col
+
+    def column(self, offset):
+        return self.position(offset)[1]
+
+
+def export_chunks(chunks, out, formato="tonto"):
+    """Analisa o texto dado em blocos (alinhados em fim de linha) e escreve o
+    JSON em `out` à medida que as reduções acontecem. Devolve os diagnósticos."""
+    from parser_tonto import _get_base_parser, syntax_error
+    writer = WRITERS[formato](out)
+    lr = copy.copy(_get_base_parser())
+    feed = _ChunkFeed(chunks, lr)
+    lr.errorfunc = lambda p: syntax_error(p, feed, feed.end)
+    lr.ontologia = ExportSink(writer, feed, lr)
+    writer.begin()
+    lr.parse(lexer=feed)
+    writer.end(feed.diagnostics)
+    return feed.diagnostics
+
+
+def export_file(path, output, formato="tonto", chunk_size=CHUNK_SIZE):
+    """Exporta `path` para o arquivo `output` com escrita bufferizada."""
+    with open(output, "w", encoding="utf-8", buffering=BUFFER_SIZE) as out:
+        return export_chunks(iter_chunks(path, chunk_size), out, formato)
+
+
+def export_text(text, out, formato="tonto"):
+    """Exporta um texto já em memória (um único bloco) para `out`."""
+    return export_chunks([text] if text else [], out, formato)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Exporta um arquivo Tonto para JSON em fluxo")
+    ap.add_argument("file", help="arquivo .tonto")
+    ap.add_argument("-o", "--output", help="saída (padrão: ARQUIVO.json)")
+    ap.add_argument("--formato", choices=FORMATOS, default="tonto", help="esquema do JSON")
+    args = ap.parse_args(argv)
+
+    output = args.output or args.file.rsplit(".", 1)[0] + ".json"
+    diagnostics = export_file(args.file, output, args.formato)
+    for d in diagnostics:
+        print(format_diagnostic(d, args.file), file=sys.stderr)
+    print(f"{output}: {args.formato}, {len(diagnostics)} diagnósticos")
+    sys.exit(0 if not any(d["severity"] == "error" for d in diagnostics) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+# gerar_tabelas.py
+# Regera as tabelas distribuídas junto dos módulos: lextab_tonto.py (lexer em
+# modo optimize), parsetab.py e parser.out (tabelas LALR). Rode depois de
+# alterar regras t_* em lexer_tonto.py ou produções p_* em parser_tonto.py;
+# em produção as tabelas são apenas lidas, nunca regeradas.
+#
+#   python gerar_tabelas.py [--dir DIRETORIO]
+import argparse
+
+import lexer_tonto
+import parser_tonto
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Regera lextab_tonto.py, parsetab.py e parser.out")
+    ap.add_argument("--dir", default=lexer_tonto.TABLES_DIR, help="diretório de saída")
+    args = ap.parse_args(argv)
+    lexer_tonto.write_lextab(args.dir)
+    parser_tonto.write_parsetab(args.dir)
+    print(f"tabelas gravadas em {args.dir}")
+
+
+if __name__ == "__main__":
+    main()
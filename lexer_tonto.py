@@ -1,8 +1,13 @@
 # lexer_tonto.py
+import os
 import re
+import mmap
 import sys
-import ply.lex as lex
-from collections import Counter, defaultdict
+import hashlib
+import threading
+from array import array
+from bisect import bisect_right
+from collections import defaultdict
 
 # --- listas conforme especificação ---
 STEREOTYPE_CLASSES = {
@@ -34,9 +39,11 @@ tokens = [
     'LBRACE','RBRACE','LPAREN','RPAREN','LBRACKET','RBRACKET',
     'RANGE_DOTS','LEFT_ARROW','RIGHT_ARROW','STAR','AT','COLON',
     'PACKAGE',
+    'IMPORT',
     'ENUM',
     'IDENT',
     'COMMA',
+    'DOT',
 ]
 
 
@@ -54,6 +61,7 @@ t_STAR = r'\*'
 t_AT = r'@'
 t_COLON = r':'
 t_COMMA = r','
+t_DOT = r'\.'
 
 t_ignore = ' \t\r'  # espaços e tabs
 
@@ -73,49 +81,29 @@ def t_NUMBER(t):
         t.value = int(t.value)
     return t
 
-# boolean literal lowercase true/false
-def t_BOOLEAN_LITERAL(t):
-    r'\b(true|false)\b'
-    t.value = True if t.value == 'true' else False
-    return t
-
-# New data type: letters only, terminando em DataType, sem números e sem underscores
-def t_NEW_DATATYPE(t):
-    r'\b[A-Za-z]+DataType\b'
-    return t
-
-# Instance names: termina com um inteiro (um ou mais dígitos)
-# Permitir letras e underscores antes, mas obrigar a terminar em dígitos
-def t_INSTANCE_NAME(t):
-    r'\b[A-Za-z_][A-Za-z_]*\d+\b'
-    return t
-
-# Class names: inicia com Maiúscula, seguido de letras ou underscores (sem dígitos)
-def t_CLASS_NAME(t):
-    r'\b[A-Z][A-Za-z_]*\b'
-    t = classify_token(t)
-    return t
-    
-def t_NATIVE_TYPE(t):
-    r'\b(number|string|boolean|date|time|datetime)\b'
-    return t
-
-def t_ENUM(t):
-    r'enum'
-    return t
-
-
-# Relation names: inicia com minúscula, seguido de letras ou underscores (sem dígitos)
-def t_RELATION_NAME(t):
-    r'\b[a-z][A-Za-z_]*\b'
-    t = classify_token(t)
-    return t
-
-
-# fallback identifier (qualquer outro identificador)
+# Identificadores: uma única regra casa a palavra inteira e a classifica
+# por uma tabela grafia -> (tipo, subtipo), calculada uma vez por grafia.
+# As formas seguem as convenções de nomes:
+#   true/false                     -> BOOLEAN_LITERAL
+#   letras terminando em DataType  -> NEW_DATATYPE
+#   letras/underscores + dígitos   -> INSTANCE_NAME
+#   inicia com maiúscula, sem dígitos -> CLASS_NAME
+#   tipos nativos (minúsculas)     -> NATIVE_TYPE
+#   enum                           -> ENUM
+#   inicia com minúscula, sem dígitos -> RELATION_NAME
+#   qualquer outro identificador   -> IDENT
+# e CLASS_NAME/RELATION_NAME/IDENT ainda passam pelas listas de palavras
+# (KEYWORDS, mesma precedência de classify_token).
 def t_IDENT(t):
-    r'\b[A-Za-z_][A-Za-z0-9_]*\b'
-    t = classify_token(t)
+    r'[A-Za-z_][A-Za-z0-9_]*'
+    entry = _SPELLINGS.get(t.value)
+    if entry is None:
+        entry = _remember_spelling(t.value)
+    t.type, stype, t.value = entry
+    if stype:
+        t.stype = stype
+    elif t.type == 'BOOLEAN_LITERAL':
+        t.value = t.value == 'true'
     return t
 
 
@@ -125,16 +113,50 @@ def t_newline(t):
     t.lexer.lineno += t.value.count("\n")
     # não retorna token
 
-    # erro
+# erro: descarta de uma vez a sequência inválida inteira (não caractere a
+# caractere) e registra um único diagnóstico para ela; a sequência vai até o
+# próximo caractere que pode iniciar um token (ou o fim da linha, para '//'
+# e strings sem fechamento)
+_INVALID_RUN = re.compile(r'//[^\n]*|"[^\n]*|.(?:(?!<>--|--<>)[^A-Za-z0-9_\s"{}()\[\].*@:,])*')
+
 def t_error(t):
-    col = find_column(t.lexer.lexdata, t)
-    msg = f"Lexical error: caractere inválido '{t.value[0]}' na linha {t.lineno}, coluna {col}"
-    # Sugestão simples: se for dígito em nome, indique convenção
-    suggestion = ""
-    if re.match(r'\d', t.value[0]):
-        suggestion = " (verifique convenções de nomes/instâncias)."
-    print(msg + suggestion)
-    t.lexer.skip(1)
+    run = _INVALID_RUN.match(t.lexer.lexdata, t.lexpos).group()
+    if run.startswith('//'):
+        msg = "comentário '//' não suportado"
+    elif run.startswith('"'):
+        msg = "string sem aspas de fechamento"
+    else:
+        msg = f"caracteres inválidos '{run}'"
+    report(t.lexer, "lexer", msg, t.lineno, line_index(t.lexer).column(t.lexpos), len(run))
+    t.lexer.skip(len(run))
+
+# --- diagnósticos ---
+# Erros não são impressos: cada um vira um dict acumulado em
+# lexer.diagnostics (zerado por get_lexer()/analyze()/TontoParser.parse()),
+# para que uma única passada relate todos os problemas do documento.
+def diagnostic(source, message, line, col, length=1, severity="error"):
+    return {
+        'severity': severity,
+        'source': source,
+        'message': message,
+        'line': line,
+        'col': col,
+        'length': length,
+    }
+
+def report(lexer, source, message, line, col, length=1, severity="error"):
+    diags = getattr(lexer, 'diagnostics', None)
+    if diags is None:
+        diags = lexer.diagnostics = []
+    diags.append(diagnostic(source, message, line, col, length, severity))
+
+def format_diagnostic(d, path=None):
+    """'arquivo:linha:coluna: erro (lexer): mensagem'"""
+    where = f"{d['line']}:{d['col']}"
+    if path:
+        where = f"{path}:{where}"
+    severity = "erro" if d['severity'] == "error" else "aviso"
+    return f"{where}: {severity} ({d['source']}): {d['message']}"
 
 def find_column(input, token):
     last_cr = input.rfind('\n', 0, token.lexpos)
@@ -142,57 +164,318 @@ def find_column(input, token):
         last_cr = -1
     return (token.lexpos - last_cr)
 
+# --- índice de inícios de linha ---
+# Construído uma vez por documento; converte offset <-> (linha, coluna) com
+# busca binária, sem o rfind por token de find_column() (que degrada em linhas
+# muito longas). Linhas e colunas começam em 1, como em find_column().
+_NEWLINE = re.compile('\n')
+
+class LineIndex:
+    __slots__ = ("starts", "length")
+
+    def __init__(self, text):
+        starts = array('l', [0])
+        starts.extend(m.end() for m in _NEWLINE.finditer(text))
+        self.starts = starts
+        self.length = len(text)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def line(self, offset):
+        return bisect_right(self.starts, offset)
+
+    def column(self, offset):
+        return offset - self.starts[bisect_right(self.starts, offset) - 1] + 1
+
+    def position(self, offset):
+        """offset -> (linha, coluna)"""
+        if not 0 <= offset <= self.length:
+            raise IndexError(f"offset {offset} fora do documento")
+        line = bisect_right(self.starts, offset)
+        return line, offset - self.starts[line - 1] + 1
+
+    def offset(self, line, col):
+        """(linha, coluna) -> offset"""
+        if not 1 <= line <= len(self.starts):
+            raise IndexError(f"linha {line} fora do documento")
+        offset = self.starts[line - 1] + col - 1
+        end = self.starts[line] if line < len(self.starts) else self.length + 1
+        if not self.starts[line - 1] <= offset < end:
+            raise IndexError(f"coluna {col} fora da linha {line}")
+        return offset
+
+    def span(self, start, end):
+        """(start, end) -> ((linha, coluna), (linha, coluna))"""
+        return self.position(start), self.position(end)
+
+
+def line_index(lexer):
+    """LineIndex do documento atual do lexer (construído na primeira consulta)."""
+    cached = getattr(lexer, '_line_index', None)
+    if cached is None or cached[0] is not lexer.lexdata:
+        cached = lexer._line_index = (lexer.lexdata, LineIndex(lexer.lexdata))
+    return cached[1]
+
+
 # --- utilitário para classificar tokens que precisam de distinção semântica ---
-def classify_token(t):
-    val = t.value
-    lower = val.lower()
-
-    # Palavra-chave PACKAGE
-    if lower == "package":
-        t.type = "PACKAGE"
-        return t
-
-    # Estereótipos de classes
-    if lower in STEREOTYPE_CLASSES:
-        t.type = 'IDENT'
-        t.stype = 'STEREOTYPE_CLASS'
-        return t
-
-    # Estereótipos de relações
-    if lower in STEREOTYPE_RELATIONS:
-        t.type = 'IDENT'
-        t.stype = 'STEREOTYPE_RELATION'
-        return t
-
-    # Palavras reservadas
-    if lower in RESERVED_WORDS:
-        t.type = 'IDENT'
-        t.stype = 'RESERVED_WORD'
-        return t
-
-    # Tipos nativos
-    if lower in NATIVE_TYPES:
-        t.type = 'NATIVE_TYPE'
-        return t
-
-    # Meta-atributos
-    if lower in META_ATTRIBUTES:
-        t.type = 'META_ATTRIBUTE'
-        return t
+# palavra (comparada em minúsculas) -> (tipo, subtipo); a primeira lista vence
+# 'import' tem token próprio (IMPORT), mas continua contando como palavra reservada
+KEYWORDS = {"package": ("PACKAGE", None), "import": ("IMPORT", "RESERVED_WORD")}
+for _words, _entry in (
+    (STEREOTYPE_CLASSES, ('IDENT', 'STEREOTYPE_CLASS')),
+    (STEREOTYPE_RELATIONS, ('IDENT', 'STEREOTYPE_RELATION')),
+    (RESERVED_WORDS, ('IDENT', 'RESERVED_WORD')),
+    (NATIVE_TYPES, ('NATIVE_TYPE', None)),
+    (META_ATTRIBUTES, ('META_ATTRIBUTE', None)),
+):
+    for _word in _words:
+        KEYWORDS.setdefault(_word, _entry)
 
+def classify_token(t):
+    entry = KEYWORDS.get(t.value.lower())
+    if entry:
+        t.type, stype = entry
+        if stype:
+            t.stype = stype
     return t
 
+_RE_DATATYPE = re.compile(r'[A-Za-z]+DataType\Z')
+_RE_INSTANCE = re.compile(r'[A-Za-z_]+\d+\Z')
+_RE_CLASS = re.compile(r'[A-Z][A-Za-z_]*\Z')
+_RE_RELATION = re.compile(r'[a-z][A-Za-z_]*\Z')
+
+def classify_spelling(word):
+    """(tipo, subtipo) de um identificador; ver o comentário de t_IDENT."""
+    if word == 'true' or word == 'false':
+        return ('BOOLEAN_LITERAL', None)
+    if _RE_DATATYPE.match(word):
+        return ('NEW_DATATYPE', None)
+    if _RE_INSTANCE.match(word):
+        return ('INSTANCE_NAME', None)
+    if _RE_CLASS.match(word):
+        kind = 'CLASS_NAME'
+    elif word in NATIVE_TYPES:
+        return ('NATIVE_TYPE', None)
+    elif word == 'enum':
+        return ('ENUM', None)
+    elif _RE_RELATION.match(word):
+        kind = 'RELATION_NAME'
+    else:
+        kind = 'IDENT'
+    return KEYWORDS.get(word.lower(), (kind, None))
+
+# tabela pré-calculada grafia -> (tipo, subtipo, grafia); novas grafias entram
+# na primeira ocorrência (até SPELLINGS_MAX, para não crescer sem limite). A
+# grafia guardada é a string devolvida como valor do token, então todas as
+# ocorrências de um mesmo nome compartilham um único objeto str (internação).
+SPELLINGS_MAX = 1 << 18
+_SPELLINGS = {}
+
+def _remember_spelling(word):
+    entry = classify_spelling(word) + (word,)
+    if len(_SPELLINGS) < SPELLINGS_MAX:
+        _SPELLINGS[word] = entry
+    return entry
+
+for _word in list(KEYWORDS) + ['true', 'false', 'enum']:
+    _remember_spelling(_word)
+    _remember_spelling(_word.capitalize())
+
 # função principal de tokenização que aplica classificação extra
 def build_lexer(**kwargs):
+    import ply.lex as lex
     lexer = lex.lex(module=sys.modules[__name__], **kwargs)
     return lexer
 
-# função que percorre e retorna lista analítica + síntese
-def analyze(text):
+# --- lexer pré-construído, compartilhado pelo processo ---
+# lex.lex() reflete sobre o módulo, valida cada regra t_* e recompila a regex
+# mestre; isso é feito uma única vez e cada chamada recebe um clone barato.
+# A base vem do lextab distribuído junto do módulo (gerado por
+# gerar_tabelas.py); se ele estiver desatualizado o lexer é construído em
+# memória, sem regravar nada.
+TABLES_DIR = os.path.dirname(os.path.abspath(__file__))
+LEXTAB = "lextab_tonto"
+
+_base_lexer = None
+_base_lock = threading.Lock()
+
+
+def lexer_signature():
+    """Hash das regras do lexer (tokens, regex de strings e docstrings das funções t_*)."""
+    mod = sys.modules[__name__]
+    h = hashlib.sha1()
+    h.update(repr(tokens).encode())
+    h.update(repr(t_ignore).encode())
+    for name in sorted(dir(mod)):
+        if not name.startswith("t_"):
+            continue
+        rule = getattr(mod, name)
+        if callable(rule):
+            h.update(f"{name}={rule.__doc__}".encode())
+        else:
+            h.update(f"{name}={rule}".encode())
+    return h.hexdigest()
+
+
+def load_table_module(name):
+    """Importa TABLES_DIR/<name>.py pelo caminho, sem depender do cwd/sys.path."""
+    import importlib.util
+    path = os.path.join(TABLES_DIR, name + ".py")
+    if not os.path.exists(path):
+        return None
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def stale_tables_warning(what):
+    sys.stderr.write(f"[AVISO] {what} desatualizado; rode 'python gerar_tabelas.py'\n")
+
+
+def _load_lextab():
+    """O lextab distribuído, se corresponder às regras atuais; senão None."""
+    tab = load_table_module(LEXTAB)
+    if tab is None or getattr(tab, "_tonto_signature", None) != lexer_signature():
+        return None
+    return tab
+
+
+def _lexer_from_tab(tab):
+    import ply.lex as lex
+    lexer = lex.Lexer()
+    lexer.lexoptimize = 1
+    lexer.readtab(tab, vars(sys.modules[__name__]))
+    return lexer
+
+
+def write_lextab(directory=TABLES_DIR):
+    """Gera o lextab (modo optimize do PLY) com a assinatura das regras."""
     lexer = build_lexer()
+    lexer.writetab(LEXTAB, directory)
+    with open(os.path.join(directory, LEXTAB + ".py"), "a") as f:
+        f.write("_tonto_signature = %r\n" % lexer_signature())
+
+
+def prebuild_lexer(optimize=True):
+    """Constrói (uma vez) o lexer base do processo.
+
+    Com optimize (padrão) a base é carregada do lextab distribuído; com
+    optimize=False, ou se o lextab não corresponder às regras, é construída
+    por reflexão com lex.lex().
+    """
+    global _base_lexer
+    if _base_lexer is not None:
+        return _base_lexer
+    with _base_lock:
+        if _base_lexer is None:
+            tab = _load_lextab() if optimize else None
+            if tab is not None:
+                _base_lexer = _lexer_from_tab(tab)
+            else:
+                if optimize:
+                    stale_tables_warning(LEXTAB + ".py")
+                _base_lexer = build_lexer()
+    return _base_lexer
+
+
+def get_lexer():
+    """Retorna um lexer novo (clone do lexer pré-construído), com estado zerado."""
+    lexer = prebuild_lexer().clone()
+    lexer.lineno = 1
+    lexer.diagnostics = []
+    return lexer
+
+# contagem de um token (já classificado por t_IDENT); devolve o registro analítico
+def _token_record(tok, col, counters):
+    # marcação de estereótipo/reserved/etc.
+    stype = getattr(tok, 'stype', None)
+    if stype == 'STEREOTYPE_CLASS':
+        counters['stereotype_class'] += 1
+    elif stype == 'STEREOTYPE_RELATION':
+        counters['stereotype_relation'] += 1
+    elif stype == 'RESERVED_WORD':
+        counters['reserved_word'] += 1
+    elif tok.type == 'NATIVE_TYPE':
+        counters['native_type'] += 1
+    elif tok.type == 'META_ATTRIBUTE':
+        counters['meta_attribute'] += 1
+    elif tok.type == 'INSTANCE_NAME':
+        counters['instance'] += 1
+    elif tok.type == 'CLASS_NAME':
+        counters['class_name'] += 1
+    elif tok.type == 'RELATION_NAME':
+        counters['relation_name'] += 1
+
+    # salvar token com posição
+    return {
+        'type': tok.type,
+        'value': tok.value,
+        'line': tok.lineno,
+        'col': col,
+        'subtype': stype
+    }
+
+# tipo/subtipo de token -> contador de summary_table (a mesma correspondência
+# de _token_record); o subtipo tem precedência
+TYPE_COUNTERS = {
+    "NATIVE_TYPE": "native_type",
+    "META_ATTRIBUTE": "meta_attribute",
+    "INSTANCE_NAME": "instance",
+    "CLASS_NAME": "class_name",
+    "RELATION_NAME": "relation_name",
+}
+SUBTYPE_COUNTERS = {
+    "STEREOTYPE_CLASS": "stereotype_class",
+    "STEREOTYPE_RELATION": "stereotype_relation",
+    "RESERVED_WORD": "reserved_word",
+}
+
+def counting_tokens(token, counters):
+    """Envolve `token` (o lexer.token de um parse) contando em `counters`
+    cada token devolvido, como _token_record: a síntese sai do próprio parse."""
+    subtype, type_ = SUBTYPE_COUNTERS.get, TYPE_COUNTERS.get
+
+    def next_token():
+        tok = token()
+        if tok is not None:
+            key = subtype(getattr(tok, 'stype', None)) or type_(tok.type)
+            if key is not None:
+                counters[key] += 1
+        return tok
+    return next_token
+
+# montar síntese pedida no enunciado
+def summary_table(counters):
+    return {
+        'classes': counters.get('class_name', 0) + counters.get('stereotype_class', 0),
+        'relations': counters.get('relation_name', 0) + counters.get('stereotype_relation', 0),
+        'words_reserved': counters.get('reserved_word', 0),
+        'instances': counters.get('instance', 0),
+        'native_types': counters.get('native_type', 0),
+        'meta_attributes': counters.get('meta_attribute', 0)
+    }
+
+# função que percorre e retorna lista analítica + síntese
+# `cache` (opcional) é um cache_tonto.Cache: o resultado é reaproveitado quando
+# o conteúdo e a versão do lexer não mudaram; `lexer` permite usar um lexer
+# próprio (ex.: o instrumentado de perfil_tonto) em vez de um clone novo.
+# Erros léxicos vão para `diagnostics` (uma lista, se fornecida); documentos
+# com erros não entram no cache
+def analyze(text, cache=None, lexer=None, diagnostics=None):
+    if cache is not None:
+        hit = cache.get_tokens(text)
+        if hit is not None:
+            return hit
+    if lexer is None:
+        lexer = get_lexer()
+    else:
+        lexer.lineno = 1
+        lexer.diagnostics = []
     lexer.input(text)
+    index = line_index(lexer)
     tokens_out = []
-    summary = Counter()
     # contadores detalhados
     counters = defaultdict(int)
 
@@ -201,48 +484,88 @@ def analyze(text):
         if not tok:
             break
         # calcular coluna
-        col = find_column(lexer.lexdata, tok)
-        # classificação adicional
-        if tok.type in ("CLASS_NAME","RELATION_NAME","INSTANCE_NAME","NEW_DATATYPE","RELATION_NAME"):
-            tok = classify_token(tok)
-        # marcação de estereótipo/reserved/etc.
-        stype = getattr(tok, 'stype', None)
-        if stype == 'STEREOTYPE_CLASS':
-            counters['stereotype_class'] += 1
-        elif stype == 'STEREOTYPE_RELATION':
-            counters['stereotype_relation'] += 1
-        elif stype == 'RESERVED_WORD':
-            counters['reserved_word'] += 1
-        elif tok.type == 'NATIVE_TYPE':
-            counters['native_type'] += 1
-        elif tok.type == 'META_ATTRIBUTE':
-            counters['meta_attribute'] += 1
-        elif tok.type == 'INSTANCE_NAME':
-            counters['instance'] += 1
-        elif tok.type == 'CLASS_NAME':
-            counters['class_name'] += 1
-        elif tok.type == 'RELATION_NAME':
-            counters['relation_name'] += 1
-
-        # salvar token com posição
-        tokens_out.append({
-            'type': tok.type,
-            'value': tok.value,
-            'line': tok.lineno,
-            'col': col,
-            'subtype': stype
-        })
-        
-    # montar síntese pedida no enunciado
-    summary_table = {
-        'classes': counters.get('class_name', 0) + counters.get('stereotype_class', 0),
-        'relations': counters.get('relation_name', 0) + counters.get('stereotype_relation', 0),
-        'words_reserved': counters.get('reserved_word', 0),
-        'instances': counters.get('instance', 0),
-        'native_types': counters.get('native_type', 0),
-        'meta_attributes': counters.get('meta_attribute', 0)
-    }
-    return tokens_out, summary_table                                                                        
+        col = index.column(tok.lexpos)
+        tokens_out.append(_token_record(tok, col, counters))
+
+    summary = summary_table(counters)
+    if diagnostics is not None:
+        diagnostics.extend(lexer.diagnostics)
+    if cache is not None and not lexer.diagnostics:
+        cache.put_tokens(text, tokens_out, summary)
+    return tokens_out, summary
+
+# --- modo streaming ---
+# Strings não atravessam quebras de linha, então todo '\n' é fronteira de
+# token: o arquivo é lido (via mmap) em blocos que terminam em fim de linha e
+# cada bloco é lexado com o número de linha acumulado. A memória fica limitada
+# ao tamanho do bloco (ou da maior linha), não ao tamanho do arquivo.
+CHUNK_SIZE = 1 << 20
+
+def iter_chunks(path, chunk_size=CHUNK_SIZE, encoding="utf-8"):
+    """Gera blocos de texto de `path` alinhados em fim de linha."""
+    with open(path, "rb") as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # arquivo vazio
+            return
+        with data:
+            size = len(data)
+            pos = 0
+            while pos < size:
+                end = min(pos + chunk_size, size)
+                if end < size:
+                    cut = data.rfind(b"\n", pos, end)
+                    if cut < 0:
+                        # linha maior que o bloco: estende até o próximo '\n'
+                        cut = data.find(b"\n", end)
+                        if cut < 0:
+                            cut = size - 1
+                    end = cut + 1
+                yield data[pos:end].decode(encoding)
+                pos = end
+
+
+class StreamAnalysis:
+    """Análise preguiçosa de um arquivo: itere para obter os tokens.
+
+    `summary` é atualizado a cada token produzido e `diagnostics` a cada erro
+    léxico; ambos ficam completos quando a iteração termina.
+    """
+
+    def __init__(self, path, chunk_size=CHUNK_SIZE):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.counters = defaultdict(int)
+        self.diagnostics = []
+
+    @property
+    def summary(self):
+        return summary_table(self.counters)
+
+    def __iter__(self):
+        lexer = get_lexer()
+        lexer.diagnostics = self.diagnostics
+        counters = self.counters
+        for chunk in iter_chunks(self.path, self.chunk_size):
+            lineno = lexer.lineno
+            lexer.input(chunk)
+            lexer.lineno = lineno
+            index = line_index(lexer)
+            while True:
+                tok = lexer.token()
+                if not tok:
+                    break
+                yield _token_record(tok, index.column(tok.lexpos), counters)
+
+
+def iter_tokens(path, chunk_size=CHUNK_SIZE):
+    """Gera os tokens de `path` sem carregar o arquivo inteiro."""
+    return iter(StreamAnalysis(path, chunk_size))
+
+
+def analyze_stream(path, chunk_size=CHUNK_SIZE):
+    """Versão streaming de analyze(): devolve um StreamAnalysis iterável."""
+    return StreamAnalysis(path, chunk_size)
 
 # --- se executado diretamente faz um teste rápido ---
 if __name__ == "__main__":
@@ -264,3 +587,7 @@ if __name__ == "__main__":
     for t in toks:
         print(f"{t['line']:3}:{t['col']:3}  {t['type']:15} {t['value']} {('['+t['subtype']+']') if t['subtype'] else ''}")
     print("\nSíntese:", synth)
+    diags = []
+    analyze(sample + "\n  x ; y // comentário\n", diagnostics=diags)
+    for d in diags:
+        print(format_diagnostic(d))
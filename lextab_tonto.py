@@ -0,0 +1,11 @@
+# lextab_tonto.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('AT', 'BOOLEAN_LITERAL', 'CLASS_NAME', 'COLON', 'COMMA', 'DOT', 'ENUM', 'IDENT', 'IMPORT', 'INSTANCE_NAME', 'LBRACE', 'LBRACKET', 'LEFT_ARROW', 'LPAREN', 'META_ATTRIBUTE', 'NATIVE_TYPE', 'NEW_DATATYPE', 'NUMBER', 'PACKAGE', 'RANGE_DOTS', 'RBRACE', 'RBRACKET', 'RELATION_NAME', 'RIGHT_ARROW', 'RPAREN', 'STAR', 'STRING'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_STRING>\\"([^\\\\\\n]|(\\\\.))*?\\")|(?P<t_NUMBER>\\d+(\\.\\d+)?)|(?P<t_IDENT>[A-Za-z_][A-Za-z0-9_]*)|(?P<t_newline>\\n+)|(?P<t_LEFT_ARROW>\\<\\>\\--)|(?P<t_RIGHT_ARROW>\\--\\<\\>)|(?P<t_RANGE_DOTS>\\.\\.)|(?P<t_DOT>\\.)|(?P<t_LBRACE>\\{)|(?P<t_LBRACKET>\\[)|(?P<t_LPAREN>\\()|(?P<t_RBRACE>\\})|(?P<t_RBRACKET>\\])|(?P<t_RPAREN>\\))|(?P<t_STAR>\\*)|(?P<t_AT>@)|(?P<t_COLON>:)|(?P<t_COMMA>,)', [None, ('t_STRING', 'STRING'), None, None, ('t_NUMBER', 'NUMBER'), None, ('t_IDENT', 'IDENT'), ('t_newline', 'newline'), (None, 'LEFT_ARROW'), (None, 'RIGHT_ARROW'), (None, 'RANGE_DOTS'), (None, 'DOT'), (None, 'LBRACE'), (None, 'LBRACKET'), (None, 'LPAREN'), (None, 'RBRACE'), (None, 'RBRACKET'), (None, 'RPAREN'), (None, 'STAR'), (None, 'AT'), (None, 'COLON'), (None, 'COMMA')])]}
+_lexstateignore = {'INITIAL': ' \t\r'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
+_tonto_signature = '4f49e0d4cacf399332712ffc1011f9e6940b7152'
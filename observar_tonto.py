@@ -0,0 +1,218 @@
+# observar_tonto.py
+# Modo observar: acompanha um projeto Tonto por polling (os.stat de cada
+# arquivo a cada intervalo, sem notificador do sistema) e, quando algo muda,
+# reanalisa só o necessário, reaproveitando os modelos dos arquivos intactos:
+#
+#   - os arquivos alterados ou novos são lidos e analisados de novo;
+#   - o grafo de imports (compilador_tonto.ImportGraph) é religado só para
+#     eles, ou inteiro se um arquivo entrou, saiu ou mudou de pacote;
+#   - as declarações dos pacotes tocados são refeitas na tabela de símbolos
+#     do projeto (as dos demais pacotes continuam as mesmas);
+#   - as referências são resolvidas de novo nos arquivos alterados, nos
+#     demais arquivos dos pacotes tocados e nos que importam algum deles.
+#
+# A resolução de um arquivo só enxerga o próprio pacote e os imports diretos
+# (semantica_tonto), então dependentes indiretos não precisam ser refeitos.
+#
+#   python observar_tonto.py RAIZ [--intervalo S]
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict, namedtuple
+
+from compilador_tonto import EXTENSAO, ImportGraph, scan_source
+from lexer_tonto import format_diagnostic
+from parser_tonto import build_parser
+from semantica_tonto import Resolution, SymbolTable, package_of
+
+INTERVALO = 0.5   # segundos entre varreduras
+
+# resultado de uma reconstrução: arquivos alterados/removidos, arquivos
+# reanalisados (parse ou resolução) e tempos da varredura e da reconstrução
+Rebuild = namedtuple("Rebuild", "changed removed analyzed scan elapsed")
+
+
+def _stamps(root):
+    """arquivo .tonto -> (mtime_ns, tamanho) sob `root`.
+
+    Mesmos arquivos que compilador_tonto.discover, mas com os.scandir e sem
+    ordenar: a varredura roda a cada intervalo.
+    """
+    root = os.path.abspath(root)
+    if os.path.isfile(root):
+        st = os.stat(root)
+        return {root: (st.st_mtime_ns, st.st_size)}
+    stamps = {}
+    stack = [root]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir():
+                        stack.append(entry.path)
+                    elif entry.name.endswith(EXTENSAO):
+                        st = entry.stat()
+                        stamps[entry.path] = (st.st_mtime_ns, st.st_size)
+                except OSError:   # removido durante a varredura
+                    continue
+    return stamps
+
+
+class Watcher:
+    """Estado incremental de um projeto: modelos, grafo e símbolos por arquivo.
+
+    `models[arquivo]` é a Ontologia do arquivo e `diagnostics(arquivo)` os
+    seus diagnósticos léxicos, sintáticos e semânticos, sempre iguais aos de
+    uma análise completa do projeto (arquivos em ordem de caminho).
+    """
+
+    def __init__(self, root, parser=None):
+        self.root = root
+        self.parser = parser or build_parser()
+        self.stamps = {}                   # arquivo -> (mtime_ns, tamanho)
+        self.models = {}                   # arquivo -> Ontologia
+        self.graph = ImportGraph(root, [])
+        self.table = SymbolTable()
+        self.members = defaultdict(set)    # pacote -> arquivos que o declaram
+        self.links = {}                    # arquivo -> Symbol de cada referência
+        self._declared = {}                # arquivo -> diagnósticos de declaração
+        self._resolved = {}                # arquivo -> diagnósticos de resolução
+
+    # --- varredura ---
+    def scan(self):
+        """(alterados ou novos, removidos) desde a varredura anterior."""
+        stamps = _stamps(self.root)
+        old = self.stamps
+        changed = sorted(p for p, stamp in stamps.items() if old.get(p) != stamp)
+        removed = sorted(p for p in old if p not in stamps)
+        self.stamps = stamps
+        return changed, removed
+
+    def poll(self):
+        """Uma varredura e, se algo mudou, a reconstrução; None se nada mudou."""
+        t0 = time.perf_counter()
+        changed, removed = self.scan()
+        scan = time.perf_counter() - t0
+        if not changed and not removed:
+            return None
+        return self.rebuild(changed, removed)._replace(scan=scan)
+
+    # --- reconstrução ---
+    def rebuild(self, changed, removed=()):
+        """Reanalisa `changed` e esquece `removed`, propagando aos dependentes."""
+        t0 = time.perf_counter()
+        graph = self.graph
+        touched = set()        # pacotes com declarações a refazer
+        users = set()          # quem importava os arquivos antes da mudança
+        structural = False
+        for path in removed:
+            model = self.models.pop(path, None)
+            if model is None:
+                continue
+            touched.add(package_of(model))
+            self.members[package_of(model)].discard(path)
+            users |= graph.users.get(path, set())
+            graph.remove(path)
+            self.links.pop(path, None)
+            self._declared.pop(path, None)
+            self._resolved.pop(path, None)
+            structural = True
+        for path in changed:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    text = f.read()
+            except OSError:
+                continue
+            old = self.models.get(path)
+            if old is not None:
+                touched.add(package_of(old))
+                self.members[package_of(old)].discard(path)
+                users |= graph.users.get(path, set())
+            model = self.models[path] = self.parser.parse(text)
+            touched.add(package_of(model))
+            self.members[package_of(model)].add(path)
+            structural |= graph.update(path, *scan_source(text))
+        graph.link(graph.files if structural else [p for p in changed if p in self.models])
+
+        # declarações dos pacotes tocados, na ordem de caminho
+        declaring = sorted(p for package in touched for p in self.members.get(package, ()))
+        for package in touched:
+            self.table.packages.pop(package, None)
+        declared = self._resolution()
+        declared.declare_all([(p, self.models[p]) for p in declaring])
+        for path in declaring:
+            self._declared[path] = []
+        for path, d in declared.diagnostics:
+            self._declared[path].append(d)
+
+        # resolução: alterados, pacotes tocados e quem importa algum deles
+        dirty = set(declaring) | users
+        for path in declaring:
+            dirty |= graph.users.get(path, set())
+        dirty = sorted(p for p in dirty if p in self.models)
+        resolved = self._resolution()
+        resolved.resolve_all([(p, self.models[p]) for p in dirty])
+        for path in dirty:
+            self._resolved[path] = []
+            self.links[path] = resolved.links[path]
+        for path, d in resolved.diagnostics:
+            self._resolved[path].append(d)
+
+        analyzed = sorted(set(dirty) | {p for p in changed if p in self.models})
+        return Rebuild(list(changed), list(removed), analyzed, 0.0, time.perf_counter() - t0)
+
+    def _resolution(self):
+        resolution = Resolution()
+        resolution.table = self.table
+        return resolution
+
+    # --- resultados ---
+    def diagnostics(self, path):
+        model = self.models[path]
+        return model.diagnostics + self._declared.get(path, []) + self._resolved.get(path, [])
+
+    @property
+    def ok(self):
+        return not any(d["severity"] == "error" for path in self.models for d in self.diagnostics(path))
+
+    def run(self, interval=INTERVALO, report=None):
+        """Varre a cada `interval` segundos até Ctrl-C, chamando `report(rebuild)`."""
+        try:
+            while True:
+                rebuild = self.poll()
+                if rebuild is not None and report is not None:
+                    report(rebuild)
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Observa um projeto Tonto e reanalisa só o que mudou")
+    ap.add_argument("root", help="diretório do projeto (ou um arquivo .tonto)")
+    ap.add_argument("--intervalo", type=float, default=INTERVALO,
+                    help=f"segundos entre varreduras (padrão: {INTERVALO})")
+    args = ap.parse_args(argv)
+
+    watcher = Watcher(args.root)
+    root = args.root if os.path.isdir(args.root) else os.path.dirname(args.root)
+
+    def report(rebuild):
+        for path in rebuild.analyzed:
+            for d in watcher.diagnostics(path):
+                print(format_diagnostic(d, os.path.relpath(path, root or ".")), file=sys.stderr)
+        stamp = time.strftime("%H:%M:%S")
+        print(f"[{stamp}] {len(rebuild.changed)} alterados, {len(rebuild.removed)} removidos, "
+              f"{len(rebuild.analyzed)}/{len(watcher.models)} reanalisados em "
+              f"{rebuild.elapsed * 1000:.1f} ms (varredura {rebuild.scan * 1000:.1f} ms)", flush=True)
+
+    watcher.run(args.intervalo, report)
+
+
+if __name__ == "__main__":
+    main()
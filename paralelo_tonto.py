@@ -0,0 +1,211 @@
+# paralelo_tonto.py
+# Léxico (e parse) em paralelo de um único arquivo grande com muitos blocos
+# `package ... { }` de topo. Uma pré-varredura barata, ciente de chaves,
+# strings e comentários '//', acha os pontos de corte seguros (início da linha
+# de um `package` fora de qualquer bloco); os trechos são lexados em um pool
+# de processos e os fluxos de tokens são costurados de volta. Como cada trecho
+# começa no início de uma linha e é lexado a partir do seu número de linha,
+# linhas, colunas e contadores saem idênticos aos de analyze() serial.
+#
+#   python paralelo_tonto.py ARQUIVO.tonto [-j N] [--parse] [--check]
+import argparse
+import os
+import re
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from cache_tonto import pack_tokens, unpack_tokens
+from lexer_tonto import LineIndex, get_lexer, line_index, summary_table, _token_record
+
+MIN_CHUNK = 256 * 1024   # trechos menores que isto não compensam um processo
+
+# a pré-varredura segue as alternativas do lexer na mesma ordem (string,
+# número, identificador, símbolos, espaços) e, por último, as sequências que
+# t_error descarta (lexer_tonto._INVALID_RUN: '//' até o fim da linha, string
+# sem fechamento, caracteres inválidos); só identificadores e chaves têm grupo
+_PRESCAN = re.compile(
+    r'"(?:[^\\\n]|\\.)*?"'
+    r'|\d+(?:\.\d+)?'
+    r'|([A-Za-z_][A-Za-z0-9_]*)'
+    r'|<>--|--<>|\.\.|([{}])|[()\[\]*@:,.]'
+    r'|[ \t\r\n]+'
+    r'|//[^\n]*|"[^\n]*|.(?:(?!<>--|--<>)[^A-Za-z0-9_\s"{}()\[\].*@:,])*')
+
+
+def split_points(text):
+    """Offsets onde começa cada trecho: 0 e a linha de cada `package` de topo
+    a partir do segundo (o que vem antes do primeiro fica no trecho dele)."""
+    points = [0]
+    depth = 0
+    first = True
+    for m in _PRESCAN.finditer(text):
+        word, brace = m.group(1), m.group(2)
+        if brace == "{":
+            depth += 1
+        elif brace == "}":
+            depth = max(0, depth - 1)
+        elif word and depth == 0 and word.lower() == "package":
+            if first:
+                first = False
+                continue
+            start = text.rfind("\n", 0, m.start()) + 1
+            if start > points[-1] and not text[start:m.start()].strip(" \t\r"):
+                points.append(start)
+    return points
+
+
+def plan_chunks(text, workers, min_chunk=MIN_CHUNK):
+    """Agrupa os pontos de corte em trechos (início, fim) de tamanho parecido."""
+    points = split_points(text)
+    target = max(min_chunk, len(text) // max(1, workers * 4))
+    chunks = []
+    start = 0
+    for point in points[1:]:
+        if point - start >= target:
+            chunks.append((start, point))
+            start = point
+    chunks.append((start, len(text)))
+    return chunks
+
+
+def _lex_chunk(chunk, first_line):
+    """Executado no processo filho: tokens empacotados, contadores, diagnósticos."""
+    lexer = get_lexer()
+    lexer.lineno = first_line
+    lexer.input(chunk)
+    index = line_index(lexer)
+    counters = defaultdict(int)
+    rows = []
+    while True:
+        tok = lexer.token()
+        if not tok:
+            break
+        rows.append(_token_record(tok, index.column(tok.lexpos), counters))
+    return pack_tokens(rows), dict(counters), lexer.diagnostics
+
+
+def _chunks_with_lines(text, chunks):
+    line = 1
+    prev = 0
+    for start, end in chunks:
+        line += text.count("\n", prev, start)
+        prev = start
+        yield text[start:end], line
+
+
+def _map(fn, workers, *iterables):
+    """map() serial com um só trecho (ou workers=1); senão em um pool de processos."""
+    if workers == 1 or len(iterables[0]) == 1:
+        return list(map(fn, *iterables))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(fn, *iterables))
+
+
+def analyze_parallel(text, workers=None, min_chunk=MIN_CHUNK, diagnostics=None):
+    """Equivalente a lexer_tonto.analyze(text), com os trechos lexados em paralelo."""
+    workers = workers or os.cpu_count()
+    chunks = plan_chunks(text, workers, min_chunk)
+    pieces, lines = zip(*_chunks_with_lines(text, chunks))
+    tokens_out = []
+    counters = defaultdict(int)
+    for rows, part, diags in _map(_lex_chunk, workers, pieces, lines):
+        tokens_out.extend(unpack_tokens(rows))
+        for key, n in part.items():
+            counters[key] += n
+        if diagnostics is not None:
+            diagnostics.extend(diags)
+    return tokens_out, summary_table(counters)
+
+
+# --- parse ---
+# Cada `package` é autocontido: o trecho de um package vai do seu ponto de
+# corte ao próximo, é analisado sozinho e o resultado é deslocado para as
+# coordenadas do arquivo inteiro.
+_worker_parser = None
+
+
+def _parse_chunk(chunk, first_line, base):
+    global _worker_parser
+    if _worker_parser is None:
+        from parser_tonto import build_parser
+        _worker_parser = build_parser()
+    out = []
+    points = split_points(chunk) + [len(chunk)]
+    line = first_line
+    for start, end in zip(points, points[1:]):
+        piece = chunk[start:end]
+        ontologia = _worker_parser.parse(piece)
+        if ontologia.tree is not None:
+            ontologia.tree = ontologia.tree.moved(base + start)
+        for secao, offsets in ontologia.spans.items():
+            ontologia.spans[secao] = [base + start + off for off in offsets]
+        for d in ontologia.diagnostics:
+            d["line"] += line - 1
+        ontologia.line_index = None
+        out.append(ontologia)
+        line += piece.count("\n")
+    return out
+
+
+def parse_parallel(text, workers=None, min_chunk=MIN_CHUNK):
+    """Analisa um arquivo com vários packages de topo em paralelo.
+
+    Devolve uma única Ontologia com as seções de todos os packages, na ordem
+    do arquivo, `spans` no texto inteiro, `tree` como a lista das árvores e
+    `summary` somada dos trechos.
+    """
+    from parser_tonto import Ontologia
+    workers = workers or os.cpu_count()
+    chunks = plan_chunks(text, workers, min_chunk)
+    pieces, lines = zip(*_chunks_with_lines(text, chunks))
+    bases = [start for start, _ in chunks]
+    results = _map(_parse_chunk, workers, pieces, lines, bases)
+    merged = Ontologia()
+    merged.line_index = LineIndex(text)
+    merged.tree = []
+    summary = defaultdict(int)
+    for part in results:
+        for ontologia in part:
+            for key, n in ontologia.summary.items():
+                summary[key] += n
+            for secao, values in ontologia.items():
+                for value, offset in zip(values, ontologia.spans[secao]):
+                    merged.record(secao, value, offset)
+            merged.diagnostics.extend(ontologia.diagnostics)
+            if ontologia.tree is not None:   # package irrecuperável: só diagnósticos
+                merged.tree.append(ontologia.tree)
+    merged.summary = dict(summary)
+    return merged
+
+
+def main(argv=None):
+    from lexer_tonto import analyze
+    ap = argparse.ArgumentParser(description="Léxico/parse paralelo de um arquivo Tonto com muitos packages")
+    ap.add_argument("file", help="arquivo .tonto")
+    ap.add_argument("-j", "--jobs", type=int, default=None, help="processos (padrão: núcleos)")
+    ap.add_argument("--parse", action="store_true", help="também analisa os packages em paralelo")
+    ap.add_argument("--check", action="store_true", help="compara com analyze() serial")
+    args = ap.parse_args(argv)
+
+    with open(args.file, encoding="utf-8") as f:
+        text = f.read()
+    workers = args.jobs or os.cpu_count()
+    t0 = time.perf_counter()
+    toks, summary = analyze_parallel(text, workers)
+    elapsed = time.perf_counter() - t0
+    print(f"{len(plan_chunks(text, workers))} trechos, {len(toks)} tokens em {elapsed:.3f}s")
+    print("Síntese:", summary)
+    if args.check:
+        t0 = time.perf_counter()
+        serial = analyze(text)
+        print(f"serial: {time.perf_counter() - t0:.3f}s, idêntico: {serial == (toks, summary)}")
+    if args.parse:
+        t0 = time.perf_counter()
+        ontologia = parse_parallel(text, workers)
+        print(f"parse: {len(ontologia['packages'])} packages, {len(ontologia['classes'])} classes, "
+              f"{len(ontologia.diagnostics)} diagnósticos em {time.perf_counter() - t0:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,120 @@
-import ply.yacc as yacc
-from lexer_tonto import tokens, build_lexer
+import copy
+import os
+import sys
+import threading
+from collections import defaultdict
+from arvore_tonto import (Package, Class, Attribute, RelationInternal, Datatype, Enum,
+                          Genset, RelationExternal, Import)
+from lexer_tonto import (tokens, get_lexer, line_index, report, format_diagnostic,
+                         load_table_module, stale_tables_warning, TABLES_DIR,
+                         counting_tokens, summary_table)
 
 # --------------------------
 #   Estrutura de síntese
 # --------------------------
-ontologia = {
-    "packages": [],
-    "classes": [],
-    "datatypes": [],
-    "enums": [],
-    "generalizations": [],
-    "relations_internal": [],
-    "relations_external": [],
-}
+SECOES = (
+    "packages",
+    "classes",
+    "datatypes",
+    "enums",
+    "generalizations",
+    "relations_internal",
+    "relations_external",
+    "imports",
+    "references",
+)
+
+
+class Ontologia(dict):
+    """Resultado de uma análise: as tabelas de síntese de um único documento.
+
+    Continua acessível como dicionário (ontologia["classes"]) e também por
+    atributo (ontologia.classes); `tree` guarda a árvore retornada pela regra
+    inicial, feita de nós de arvore_tonto. `spans[secao][i]` é o offset no texto onde o item i foi
+    declarado e `position()` o converte para (linha, coluna). `diagnostics`
+    lista os erros léxicos e sintáticos do documento, na ordem em que foram
+    encontrados (ver lexer_tonto.diagnostic).
+
+    Forma da árvore (cada nó com `start`/`end` no texto):
+        Package(name, items)
+        Class(name, stereotype, elements)   atributos e relações internas
+        Attribute(name, type)
+        RelationInternal(stereotype, target)
+        Datatype(name, attributes)
+        Enum(name, items)                   itens: nomes
+        Genset(general, specific, modifiers)
+        RelationExternal(stereotype, name, source, target)
+        Import(name)                        nome qualificado
+    Com `keep_tree` falso a lista de itens do package não é mantida.
+    `summary` é a síntese léxica do texto (lexer_tonto.summary_table),
+    contada durante o próprio parse; None em modelos montados por partes.
+    """
+
+    keep_tree = True
+
+    def __init__(self):
+        super().__init__((secao, []) for secao in SECOES)
+        self.tree = None
+        self.diagnostics = []
+        self.spans = {secao: [] for secao in SECOES}
+        self.line_index = None
+        self.summary = None
+
+    def reference(self, kind, name, offset):
+        """Registra um uso de nome (tipo de atributo, ponta de relação...)
+        a ser resolvido por semantica_tonto."""
+        self.record("references", {"kind": kind, "name": name}, offset)
+
+    def record(self, secao, value, offset):
+        self[secao].append(value)
+        self.spans[secao].append(offset)
+
+    def position(self, secao, i):
+        """(linha, coluna) da declaração do item i da seção."""
+        return self.line_index.position(self.spans[secao][i])
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    @property
+    def ok(self):
+        return not any(d["severity"] == "error" for d in self.diagnostics)
+
+
+def package_trees(ontologia):
+    """Lista das árvores (arvore_tonto.Package) de uma Ontologia.
+
+    parse_parallel guarda em `tree` uma lista de árvores; o parse comum, uma
+    só. Sem árvore (erro de sintaxe irrecuperável) levanta ValueError.
+    """
+    tree = ontologia.tree
+    if tree is None:
+        raise ValueError("modelo sem árvore de parse (erro de sintaxe no package?)")
+    return tree if isinstance(tree, list) else [tree]
 
 # --------------------------
-def p_error(p):
+# Erros de sintaxe viram diagnósticos no lexer do parse (o mesmo usado pelos
+# erros léxicos); a recuperação fica a cargo das produções com `error` em
+# package_item e class_element, e o yacc só volta a relatar depois de três
+# tokens aceitos, o que evita cascatas a partir de um único erro.
+def syntax_error(p, lexer, end=None):
+    """`end` é o offset do fim do documento (padrão: len(lexer.lexdata))."""
     if p:
-        print(f"[ERRO] Síntaxe inválida perto de '{p.value}' na linha {p.lineno}")
-    else:
-        print("[ERRO] Fim inesperado do arquivo (EOF).")
+        col = line_index(p.lexer).column(p.lexpos)
+        report(p.lexer, "parser", f"sintaxe inválida perto de '{p.value}'", p.lineno, col,
+               len(str(p.value)))
+    elif lexer is not None:
+        line, col = line_index(lexer).position(len(lexer.lexdata) if end is None else end)
+        report(lexer, "parser", "fim inesperado do arquivo (EOF)", line, col, 0)
+
+
+def p_error(p):
+    # sem o parser não há como achar o lexer no EOF (p=None); TontoParser
+    # substitui esta função por uma que conhece o seu lexer
+    syntax_error(p, p.lexer if p else None)
 
 # ===============================================================
 #   REGRA INICIAL
@@ -36,9 +131,15 @@ def p_start(p):
 
 def p_package(p):
     """package : PACKAGE IDENT LBRACE package_body RBRACE
-               | PACKAGE CLASS_NAME LBRACE package_body RBRACE"""
-    ontologia["packages"].append(p[2])
-    p[0] = ("package", p[2], p[4])
+               | PACKAGE CLASS_NAME LBRACE package_body RBRACE
+               | PACKAGE RELATION_NAME LBRACE package_body RBRACE"""
+    ontologia = p.parser.ontologia
+    ontologia.record("packages", p[2], p.lexpos(2))
+    p[0] = Package(p.lexpos(1), p.lexpos(5) + 1, p[2], p[4] or [])
+    # o package completo já vale como árvore: lixo depois dele (`package P
+    # { ... } x`) faz o parse falhar em `start`, mas não descarta o package
+    if ontologia.keep_tree and ontologia.tree is None:
+        ontologia.tree = p[0]
 
 
 
@@ -51,10 +152,14 @@ def p_package_body(p):
 def p_package_item_list(p):
     """package_item_list : package_item_list package_item
                          | package_item"""
+    # os itens já foram registrados na Ontologia; quem consome só os
+    # registros (exportar_tonto) desliga `keep_tree` e a lista não cresce
+    keep = p.parser.ontologia.keep_tree
     if len(p) == 2:
-        p[0] = [p[1]]
+        p[0] = [p[1]] if keep and p[1] is not None else []
     else:
-        p[1].append(p[2])
+        if keep and p[2] is not None:
+            p[1].append(p[2])
         p[0] = p[1]
 
 
@@ -63,8 +168,24 @@ def p_package_item(p):
                     | class_decl
                     | datatype_decl
                     | generalization
-                    | relation_external"""
-    #p[0] = p[1]
+                    | relation_external
+                    | import_decl"""
+    p[0] = p[1]
+
+
+def _append(p):
+    """Regras `lista : item | lista item`: acumula os itens (sem os de erro)."""
+    if len(p) == 2:
+        p[0] = [p[1]] if p[1] is not None else []
+    else:
+        if p[2] is not None:
+            p[1].append(p[2])
+        p[0] = p[1]
+
+
+def p_package_item_error(p):
+    """package_item : error"""
+    p[0] = None
 
 
 # ===============================================================
@@ -73,20 +194,22 @@ def p_package_item(p):
 
 def p_class_decl(p):
     """class_decl : CLASS_NAME COLON IDENT class_block"""
-    ontologia["classes"].append({"name": p[1], "stereotype": p[3]})
-    p[0] = ("class", p[1])
+    p.parser.ontologia.record("classes", {"name": p[1], "stereotype": p[3]}, p.lexpos(1))
+    elements, end = p[4]
+    p[0] = Class(p.lexpos(1), end or p.lexpos(3) + len(p[3]), p[1], p[3], elements)
 
 
 def p_class_block(p):
     """class_block : LBRACE class_body RBRACE
                    | empty"""
-    pass
+    # (elementos, fim do bloco); sem bloco o fim é o do estereótipo
+    p[0] = (p[2], p.lexpos(3) + 1) if len(p) == 4 else ([], None)
 
 
 def p_class_body(p):
     """class_body : class_body class_element
                   | class_element"""
-    pass
+    _append(p)
 
 
 def p_class_element(p):
@@ -95,12 +218,19 @@ def p_class_element(p):
     p[0] = p[1]
 
 
+def p_class_element_error(p):
+    """class_element : error"""
+    p[0] = None
+
+
 def p_attribute(p):
     """attribute : RELATION_NAME COLON IDENT
                  | RELATION_NAME COLON CLASS_NAME
                  | RELATION_NAME COLON NATIVE_TYPE
                  | RELATION_NAME COLON NEW_DATATYPE"""
-    p[0] = ("attribute", p[1], p[3])
+    if p.slice[3].type in ("CLASS_NAME", "NEW_DATATYPE"):
+        p.parser.ontologia.reference("type", p[3], p.lexpos(3))
+    p[0] = Attribute(p.lexpos(1), p.lexpos(3) + len(p[3]), p[1], p[3])
 
 
 # ===============================================================
@@ -109,14 +239,14 @@ def p_attribute(p):
 
 def p_datatype_decl(p):
     """datatype_decl : NEW_DATATYPE LBRACE attr_list RBRACE"""
-    ontologia["datatypes"].append(p[1])
-    p[0] = ("datatype", p[1])
+    p.parser.ontologia.record("datatypes", p[1], p.lexpos(1))
+    p[0] = Datatype(p.lexpos(1), p.lexpos(4) + 1, p[1], p[3])
 
 
 def p_attr_list(p):
     """attr_list : attribute
                  | attr_list attribute"""
-    pass
+    _append(p)
 
 # ===============================================================
 #   4. DECLARAÇÃO DE ENUMERATED CLASSES
@@ -124,8 +254,8 @@ def p_attr_list(p):
 
 def p_enum_decl(p):
     """enum_decl : ENUM CLASS_NAME LBRACE enum_items RBRACE"""
-    ontologia["enums"].append(p[2])
-    p[0] = ("enum", p[2])
+    p.parser.ontologia.record("enums", p[2], p.lexpos(2))
+    p[0] = Enum(p.lexpos(1), p.lexpos(5) + 1, p[2], p[4])
 
 
 def p_enum_item(p):
@@ -136,6 +266,7 @@ def p_enum_item(p):
 def p_enum_items(p):
     """enum_items : enum_item
                   | enum_items enum_item"""
+    _append(p)
 
 # ===============================================================
 #   5. GENERALIZAÇÕES (GENSET)
@@ -143,19 +274,25 @@ def p_enum_items(p):
 
 def p_generalization(p):
     """generalization : CLASS_NAME CLASS_NAME genset_block"""
-    ontologia["generalizations"].append(p[1])
-    p[0] = ("genset", p[1])
+    # as pontas são registradas antes do item, que assim chega completo a
+    # quem consome os registros em fluxo (exportar_tonto)
+    ontologia = p.parser.ontologia
+    ontologia.reference("general", p[1], p.lexpos(1))
+    ontologia.reference("specific", p[2], p.lexpos(2))
+    ontologia.record("generalizations", p[1], p.lexpos(1))
+    modifiers, end = p[3]
+    p[0] = Genset(p.lexpos(1), end, p[1], p[2], modifiers)
 
 
 def p_genset_block(p):
     """genset_block : LBRACE genset_body RBRACE"""
-    p[0] = p[2]
+    p[0] = (p[2], p.lexpos(3) + 1)
 
 
 def p_genset_body(p):
     """genset_body : IDENT COLON IDENT
                    | IDENT COLON IDENT COMMA IDENT"""
-    p[0] = ("genset_body",)
+    p[0] = tuple(p[3::2])  # modificadores: ("disjoint",), ("disjoint", "complete")...
 
 # ===============================================================
 #   6. RELAÇÕES
@@ -163,14 +300,46 @@ def p_genset_body(p):
 
 def p_relation_internal(p):
     """relation_internal : IDENT LBRACKET RANGE_DOTS RBRACKET LEFT_ARROW LBRACKET RANGE_DOTS RBRACKET CLASS_NAME"""
-    ontologia["relations_internal"].append(p[1])
-    p[0] = ("relation_internal", p[1])
+    p.parser.ontologia.reference("target", p[9], p.lexpos(9))
+    p.parser.ontologia.record("relations_internal", p[1], p.lexpos(1))
+    p[0] = RelationInternal(p.lexpos(1), p.lexpos(9) + len(p[9]), p[1], p[9])
 
 
 def p_relation_external(p):
     """relation_external : AT IDENT IDENT CLASS_NAME RIGHT_ARROW CLASS_NAME"""
-    ontologia["relations_external"].append(p[2])
-    p[0] = ("relation_external", p[2])
+    ontologia = p.parser.ontologia
+    ontologia.reference("source", p[4], p.lexpos(4))
+    ontologia.reference("target", p[6], p.lexpos(6))
+    ontologia.record("relations_external", p[2], p.lexpos(2))
+    p[0] = RelationExternal(p.lexpos(1), p.lexpos(6) + len(p[6]), p[2], p[3], p[4], p[6])
+
+
+# ===============================================================
+#   7. IMPORTS
+# ===============================================================
+
+def p_import_decl(p):
+    """import_decl : IMPORT qualified_name"""
+    name, end = p[2]
+    p.parser.ontologia.record("imports", name, p.lexpos(1))
+    p[0] = Import(p.lexpos(1), end, name)
+
+
+def p_qualified_name(p):
+    """qualified_name : qualified_name DOT name_part
+                      | name_part"""
+    # (nome, fim no texto); nomes compostos também são internados
+    if len(p) == 2:
+        p[0] = p[1]
+    else:
+        p[0] = (sys.intern(p[1][0] + "." + p[3][0]), p[3][1])
+
+
+def p_name_part(p):
+    """name_part : IDENT
+                 | CLASS_NAME
+                 | RELATION_NAME"""
+    p[0] = (p[1], p.lexpos(1) + len(p[1]))
 
 
 # ===============================================================
@@ -180,12 +349,115 @@ def p_empty(p):
 
 
 # ===============================================================
-def build_parser():
-    lexer = build_lexer()
-    parser = yacc.yacc(debug=False)
-    parser.lexer = lexer       
+# As tabelas LALR vêm do parsetab.py distribuído junto do módulo (gerado por
+# gerar_tabelas.py) e são carregadas pelo caminho, sem reflexão do yacc e sem
+# depender do diretório atual. Se a gramática mudou e o parsetab não foi
+# regerado, as tabelas são geradas em memória (sem gravar arquivos).
+TABMODULE = "parsetab"
+
+_base_parser = None
+_base_lock = threading.Lock()
+
+
+def grammar_signature():
+    """Mesma assinatura que o yacc grava em parsetab._lr_signature."""
+    mod = sys.modules[__name__]
+    pfuncs = []
+    for name, item in vars(mod).items():
+        if name.startswith("p_") and name != "p_error" and callable(item):
+            pfuncs.append((item.__code__.co_firstlineno, str(sys.modules[item.__module__]),
+                           name, item.__doc__))
+    pfuncs.sort()
+    return " ".join(sorted(tokens)) + "".join(doc for _, _, _, doc in pfuncs if doc)
+
+
+def table_signature():
+    """_lr_signature das tabelas em uso pelo parser base."""
+    return _get_base_parser().signature
+
+
+def _parser_from_tab(tab):
+    import ply.yacc as yacc
+    lr = yacc.LRTable()
+    lr.read_table(tab)
+    lr.bind_callables(vars(sys.modules[__name__]))
+    parser = yacc.LRParser(lr, p_error)
+    parser.signature = tab._lr_signature
     return parser
 
+
+def write_parsetab(directory=TABLES_DIR, debug=True):
+    """Gera parsetab.py (e parser.out, com debug) em `directory`."""
+    import ply.yacc as yacc
+    yacc.yacc(module=sys.modules[__name__], tabmodule=TABMODULE, outputdir=directory,
+              debug=debug, debugfile=os.path.join(directory, "parser.out"))
+
+
+def _get_base_parser():
+    """Carrega (uma vez por processo) as tabelas LALR."""
+    global _base_parser
+    if _base_parser is None:
+        with _base_lock:
+            if _base_parser is None:
+                tab = load_table_module(TABMODULE)
+                if tab is not None and tab._lr_signature == grammar_signature():
+                    _base_parser = _parser_from_tab(tab)
+                else:
+                    import ply.yacc as yacc
+                    stale_tables_warning(TABMODULE + ".py")
+                    parser = yacc.yacc(module=sys.modules[__name__], debug=False,
+                                       write_tables=False, errorlog=yacc.NullLogger())
+                    parser.signature = grammar_signature()
+                    _base_parser = parser
+    return _base_parser
+
+
+class TontoParser:
+    """Parser reentrante: cada parse() devolve uma Ontologia nova.
+
+    As tabelas LALR são compartilhadas; a pilha do LR e o lexer são próprios de
+    cada instância. Uma instância pode analisar muitos documentos em sequência,
+    e instâncias diferentes podem rodar em threads diferentes. Com `cache`
+    (um cache_tonto.Cache) documentos já vistos não são re-analisados.
+    """
+
+    def __init__(self, cache=None):
+        self.lr = copy.copy(_get_base_parser())
+        self.lr.errorfunc = self._error
+        self.lexer = get_lexer()
+        self.cache = cache
+
+    def _error(self, p):
+        syntax_error(p, self.lexer)
+
+    def parse(self, text):
+        if self.cache is not None:
+            hit = self.cache.get_model(text)
+            if hit is not None:
+                return hit
+        ontologia = Ontologia()
+        self.lexer.lineno = 1
+        self.lexer.diagnostics = ontologia.diagnostics
+        self.lexer.input(text)
+        ontologia.line_index = line_index(self.lexer)
+        self.lr.ontologia = ontologia
+        counters = defaultdict(int)
+        try:
+            tree = self.lr.parse(lexer=self.lexer,
+                                 tokenfunc=counting_tokens(self.lexer.token, counters))
+        finally:
+            del self.lr.ontologia
+        if tree is not None:
+            ontologia.tree = tree
+        ontologia.summary = summary_table(counters)
+        if self.cache is not None:
+            self.cache.put_model(text, ontologia)
+        return ontologia
+
+
+def build_parser(cache=None):
+    return TontoParser(cache)
+
 # ===============================================================
 # Teste rápido
 # ===============================================================
@@ -203,7 +475,8 @@ if __name__ == "__main__":
     """
 
     parser = build_parser()
-    parser.parse(code)
+    ontologia = parser.parse(code)
     print("\nSAÍDA FINAL:")
     print(ontologia)
-
+    for d in ontologia.diagnostics:
+        print(format_diagnostic(d))
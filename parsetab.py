@@ -6,9 +6,9 @@ _tabversion = '3.10'
 
 _lr_method = 'LALR'
 
-_lr_signature = 'AT BOOLEAN_LITERAL CLASS_NAME COLON COMMA ENUM IDENT INSTANCE_NAME LBRACE LBRACKET LEFT_ARROW LPAREN META_ATTRIBUTE NATIVE_TYPE NEW_DATATYPE NUMBER PACKAGE RANGE_DOTS RBRACE RBRACKET RELATION_NAME RIGHT_ARROW RPAREN STAR STRINGstart : packagepackage : PACKAGE IDENT LBRACE package_body RBRACE\n               | PACKAGE CLASS_NAME LBRACE package_body RBRACEpackage_body : package_item_list\n                    | emptypackage_item_list : package_item_list package_item\n                         | package_itempackage_item : enum_decl\n                    | class_decl\n                    | datatype_decl\n                    | generalization\n                    | relation_externalclass_decl : CLASS_NAME COLON IDENT class_blockclass_block : LBRACE class_body RBRACE\n                   | emptyclass_body : class_body class_element\n                  | class_elementclass_element : attribute\n                     | relation_internalattribute : RELATION_NAME COLON IDENT\n                 | RELATION_NAME COLON CLASS_NAME\n                 | RELATION_NAME COLON NATIVE_TYPE\n                 | RELATION_NAME COLON NEW_DATATYPEdatatype_decl : NEW_DATATYPE LBRACE attr_list RBRACEattr_list : attribute\n                 | attr_list attributeenum_decl : ENUM CLASS_NAME LBRACE enum_items RBRACEenum_item : CLASS_NAME\n                 | IDENTenum_items : enum_item\n                  | enum_items enum_itemgeneralization : CLASS_NAME CLASS_NAME genset_blockgenset_block : LBRACE genset_body RBRACEgenset_body : IDENT COLON IDENT\n                   | IDENT COLON IDENT COMMA IDENTrelation_internal : IDENT LBRACKET RANGE_DOTS RBRACKET LEFT_ARROW LBRACKET RANGE_DOTS RBRACKET CLASS_NAMErelation_external : AT IDENT IDENT CLASS_NAME RIGHT_ARROW CLASS_NAMEempty :'
+_lr_signature = 'AT BOOLEAN_LITERAL CLASS_NAME COLON COMMA DOT ENUM IDENT IMPORT INSTANCE_NAME LBRACE LBRACKET LEFT_ARROW LPAREN META_ATTRIBUTE NATIVE_TYPE NEW_DATATYPE NUMBER PACKAGE RANGE_DOTS RBRACE RBRACKET RELATION_NAME RIGHT_ARROW RPAREN STAR STRINGstart : packagepackage : PACKAGE IDENT LBRACE package_body RBRACE\n               | PACKAGE CLASS_NAME LBRACE package_body RBRACE\n               | PACKAGE RELATION_NAME LBRACE package_body RBRACEpackage_body : package_item_list\n                    | emptypackage_item_list : package_item_list package_item\n                         | package_itempackage_item : enum_decl\n                    | class_decl\n                    | datatype_decl\n                    | generalization\n                    | relation_external\n                    | import_declpackage_item : errorclass_decl : CLASS_NAME COLON IDENT class_blockclass_block : LBRACE class_body RBRACE\n                   | emptyclass_body : class_body class_element\n                  | class_elementclass_element : attribute\n                     | relation_internalclass_element : errorattribute : RELATION_NAME COLON IDENT\n                 | RELATION_NAME COLON CLASS_NAME\n                 | RELATION_NAME COLON NATIVE_TYPE\n                 | RELATION_NAME COLON NEW_DATATYPEdatatype_decl : NEW_DATATYPE LBRACE attr_list RBRACEattr_list : attribute\n                 | attr_list attributeenum_decl : ENUM CLASS_NAME LBRACE enum_items RBRACEenum_item : CLASS_NAME\n                 | IDENTenum_items : enum_item\n                  | enum_items enum_itemgeneralization : CLASS_NAME CLASS_NAME genset_blockgenset_block : LBRACE genset_body RBRACEgenset_body : IDENT COLON IDENT\n                   | IDENT COLON IDENT COMMA IDENTrelation_internal : IDENT LBRACKET RANGE_DOTS RBRACKET LEFT_ARROW LBRACKET RANGE_DOTS RBRACKET CLASS_NAMErelation_external : AT IDENT IDENT CLASS_NAME RIGHT_ARROW CLASS_NAMEimport_decl : IMPORT qualified_namequalified_name : qualified_name DOT name_part\n                      | name_partname_part : IDENT\n                 | CLASS_NAME\n                 | RELATION_NAMEempty :'
     
-_lr_action_items = {'PACKAGE':([0,],[3,]),'$end':([1,2,22,29,],[0,-1,-2,-3,]),'IDENT':([3,20,26,28,30,32,38,39,40,41,45,49,52,54,55,56,57,58,60,61,62,63,67,70,78,],[4,28,33,37,41,43,-28,41,-30,-29,59,60,-31,65,59,-17,-18,-19,-20,-21,-22,-23,-16,72,-36,]),'CLASS_NAME':([3,6,7,9,11,12,13,14,15,16,17,18,23,30,31,33,37,38,39,40,41,44,46,47,49,51,52,53,64,66,69,77,],[5,18,18,18,-7,-8,-9,-10,-11,-12,24,25,-6,38,-32,-38,50,-28,38,-30,-29,-13,-15,-24,61,-27,-31,-33,69,-14,-37,78,]),'LBRACE':([4,5,19,24,25,33,],[6,7,27,30,32,45,]),'RBRACE':([6,7,8,9,10,11,12,13,14,15,16,21,23,31,33,34,35,38,39,40,41,42,44,46,47,48,51,52,53,55,56,57,58,60,61,62,63,65,66,67,69,72,78,],[-38,-38,22,-4,-5,-7,-8,-9,-10,-11,-12,29,-6,-32,-38,47,-25,-28,51,-30,-29,53,-13,-15,-24,-26,-27,-31,-33,66,-17,-18,-19,-20,-21,-22,-23,-34,-14,-16,-37,-35,-36,]),'ENUM':([6,7,9,11,12,13,14,15,16,23,31,33,44,46,47,51,53,66,69,],[17,17,17,-7,-8,-9,-10,-11,-12,-6,-32,-38,-13,-15,-24,-27,-33,-14,-37,]),'NEW_DATATYPE':([6,7,9,11,12,13,14,15,16,23,31,33,44,46,47,49,51,53,66,69,],[19,19,19,-7,-8,-9,-10,-11,-12,-6,-32,-38,-13,-15,-24,63,-27,-33,-14,-37,]),'AT':([6,7,9,11,12,13,14,15,16,23,31,33,44,46,47,51,53,66,69,],[20,20,20,-7,-8,-9,-10,-11,-12,-6,-32,-38,-13,-15,-24,-27,-33,-14,-37,]),'COLON':([18,36,43,],[26,49,54,]),'RELATION_NAME':([27,34,35,45,48,55,56,57,58,60,61,62,63,67,78,],[36,36,-25,36,-26,36,-17,-18,-19,-20,-21,-22,-23,-16,-36,]),'NATIVE_TYPE':([49,],[62,]),'RIGHT_ARROW':([50,],[64,]),'LBRACKET':([59,74,],[68,75,]),'COMMA':([65,],[70,]),'RANGE_DOTS':([68,75,],[71,76,]),'RBRACKET':([71,76,],[73,77,]),'LEFT_ARROW':([73,],[74,]),}
+_lr_action_items = {'PACKAGE':([0,],[3,]),'$end':([1,2,28,40,41,],[0,-1,-2,-3,-4,]),'IDENT':([3,24,25,32,34,42,44,50,51,52,53,54,58,62,66,68,69,70,71,72,73,75,76,77,78,82,85,93,],[4,34,37,45,49,54,56,37,-32,54,-34,-33,74,75,-35,80,74,-20,-21,-22,-23,-24,-25,-26,-27,-19,87,-40,]),'CLASS_NAME':([3,7,8,9,11,13,14,15,16,17,18,19,20,21,22,25,29,35,36,37,38,39,42,43,45,49,50,51,52,53,54,57,59,60,62,64,65,66,67,79,81,84,92,],[5,22,22,22,22,-8,-9,-10,-11,-12,-13,-14,-15,30,31,38,-7,-42,-44,-45,-46,-47,51,-36,-48,63,38,-32,51,-34,-33,-16,-18,-28,76,-43,-31,-35,-37,84,-17,-41,93,]),'RELATION_NAME':([3,25,33,46,47,50,58,61,69,70,71,72,73,75,76,77,78,82,93,],[6,39,48,48,-29,39,48,-30,48,-20,-21,-22,-23,-24,-25,-26,-27,-19,-40,]),'LBRACE':([4,5,6,23,30,31,45,],[7,8,9,33,42,44,58,]),'RBRACE':([7,8,9,10,11,12,13,14,15,16,17,18,19,20,26,27,29,35,36,37,38,39,43,45,46,47,51,52,53,54,55,57,59,60,61,64,65,66,67,69,70,71,72,73,75,76,77,78,80,81,82,84,87,93,],[-48,-48,-48,28,-5,-6,-8,-9,-10,-11,-12,-13,-14,-15,40,41,-7,-42,-44,-45,-46,-47,-36,-48,60,-29,-32,65,-34,-33,67,-16,-18,-28,-30,-43,-31,-35,-37,81,-20,-21,-22,-23,-24,-25,-26,-27,-38,-17,-19,-41,-39,-40,]),'error':([7,8,9,11,13,14,15,16,17,18,19,20,29,35,36,37,38,39,43,45,57,58,59,60,64,65,67,69,70,71,72,73,75,76,77,78,81,82,84,93,],[20,20,20,20,-8,-9,-10,-11,-12,-13,-14,-15,-7,-42,-44,-45,-46,-47,-36,-48,-16,73,-18,-28,-43,-31,-37,73,-20,-21,-22,-23,-24,-25,-26,-27,-17,-19,-41,-40,]),'ENUM':([7,8,9,11,13,14,15,16,17,18,19,20,29,35,36,37,38,39,43,45,57,59,60,64,65,67,81,84,],[21,21,21,21,-8,-9,-10,-11,-12,-13,-14,-15,-7,-42,-44,-45,-46,-47,-36,-48,-16,-18,-28,-43,-31,-37,-17,-41,]),'NEW_DATATYPE':([7,8,9,11,13,14,15,16,17,18,19,20,29,35,36,37,38,39,43,45,57,59,60,62,64,65,67,81,84,],[23,23,23,23,-8,-9,-10,-11,-12,-13,-14,-15,-7,-42,-44,-45,-46,-47,-36,-48,-16,-18,-28,78,-43,-31,-37,-17,-41,]),'AT':([7,8,9,11,13,14,15,16,17,18,19,20,29,35,36,37,38,39,43,45,57,59,60,64,65,67,81,84,],[24,24,24,24,-8,-9,-10,-11,-12,-13,-14,-15,-7,-42,-44,-45,-46,-47,-36,-48,-16,-18,-28,-43,-31,-37,-17,-41,]),'IMPORT':([7,8,9,11,13,14,15,16,17,18,19,20,29,35,36,37,38,39,43,45,57,59,60,64,65,67,81,84,],[25,25,25,25,-8,-9,-10,-11,-12,-13,-14,-15,-7,-42,-44,-45,-46,-47,-36,-48,-16,-18,-28,-43,-31,-37,-17,-41,]),'COLON':([22,48,56,],[32,62,68,]),'DOT':([35,36,37,38,39,64,],[50,-44,-45,-46,-47,-43,]),'NATIVE_TYPE':([62,],[77,]),'RIGHT_ARROW':([63,],[79,]),'LBRACKET':([74,89,],[83,90,]),'COMMA':([80,],[85,]),'RANGE_DOTS':([83,90,],[86,91,]),'RBRACKET':([86,91,],[88,92,]),'LEFT_ARROW':([88,],[89,]),}
 
 _lr_action = {}
 for _k, _v in _lr_action_items.items():
@@ -17,7 +17,7 @@ for _k, _v in _lr_action_items.items():
       _lr_action[_x][_k] = _y
 del _lr_action_items
 
-_lr_goto_items = {'start':([0,],[1,]),'package':([0,],[2,]),'package_body':([6,7,],[8,21,]),'package_item_list':([6,7,],[9,9,]),'empty':([6,7,33,],[10,10,46,]),'package_item':([6,7,9,],[11,11,23,]),'enum_decl':([6,7,9,],[12,12,12,]),'class_decl':([6,7,9,],[13,13,13,]),'datatype_decl':([6,7,9,],[14,14,14,]),'generalization':([6,7,9,],[15,15,15,]),'relation_external':([6,7,9,],[16,16,16,]),'genset_block':([25,],[31,]),'attr_list':([27,],[34,]),'attribute':([27,34,45,55,],[35,48,57,57,]),'enum_items':([30,],[39,]),'enum_item':([30,39,],[40,52,]),'genset_body':([32,],[42,]),'class_block':([33,],[44,]),'class_body':([45,],[55,]),'class_element':([45,55,],[56,67,]),'relation_internal':([45,55,],[58,58,]),}
+_lr_goto_items = {'start':([0,],[1,]),'package':([0,],[2,]),'package_body':([7,8,9,],[10,26,27,]),'package_item_list':([7,8,9,],[11,11,11,]),'empty':([7,8,9,45,],[12,12,12,59,]),'package_item':([7,8,9,11,],[13,13,13,29,]),'enum_decl':([7,8,9,11,],[14,14,14,14,]),'class_decl':([7,8,9,11,],[15,15,15,15,]),'datatype_decl':([7,8,9,11,],[16,16,16,16,]),'generalization':([7,8,9,11,],[17,17,17,17,]),'relation_external':([7,8,9,11,],[18,18,18,18,]),'import_decl':([7,8,9,11,],[19,19,19,19,]),'qualified_name':([25,],[35,]),'name_part':([25,50,],[36,64,]),'genset_block':([31,],[43,]),'attr_list':([33,],[46,]),'attribute':([33,46,58,69,],[47,61,71,71,]),'enum_items':([42,],[52,]),'enum_item':([42,52,],[53,66,]),'genset_body':([44,],[55,]),'class_block':([45,],[57,]),'class_body':([58,],[69,]),'class_element':([58,69,],[70,82,]),'relation_internal':([58,69,],[72,72,]),}
 
 _lr_goto = {}
 for _k, _v in _lr_goto_items.items():
@@ -27,42 +27,52 @@ for _k, _v in _lr_goto_items.items():
 del _lr_goto_items
 _lr_productions = [
   ("S' -> start","S'",1,None,None,None),
-  ('start -> package','start',1,'p_start','parser_tonto.py',30),
-  ('package -> PACKAGE IDENT LBRACE package_body RBRACE','package',5,'p_package','parser_tonto.py',39),
-  ('package -> PACKAGE CLASS_NAME LBRACE package_body RBRACE','package',5,'p_package','parser_tonto.py',40),
-  ('package_body -> package_item_list','package_body',1,'p_package_body','parser_tonto.py',47),
-  ('package_body -> empty','package_body',1,'p_package_body','parser_tonto.py',48),
-  ('package_item_list -> package_item_list package_item','package_item_list',2,'p_package_item_list','parser_tonto.py',53),
-  ('package_item_list -> package_item','package_item_list',1,'p_package_item_list','parser_tonto.py',54),
-  ('package_item -> enum_decl','package_item',1,'p_package_item','parser_tonto.py',63),
-  ('package_item -> class_decl','package_item',1,'p_package_item','parser_tonto.py',64),
-  ('package_item -> datatype_decl','package_item',1,'p_package_item','parser_tonto.py',65),
-  ('package_item -> generalization','package_item',1,'p_package_item','parser_tonto.py',66),
-  ('package_item -> relation_external','package_item',1,'p_package_item','parser_tonto.py',67),
-  ('class_decl -> CLASS_NAME COLON IDENT class_block','class_decl',4,'p_class_decl','parser_tonto.py',76),
-  ('class_block -> LBRACE class_body RBRACE','class_block',3,'p_class_block','parser_tonto.py',82),
-  ('class_block -> empty','class_block',1,'p_class_block','parser_tonto.py',83),
-  ('class_body -> class_body class_element','class_body',2,'p_class_body','parser_tonto.py',88),
-  ('class_body -> class_element','class_body',1,'p_class_body','parser_tonto.py',89),
-  ('class_element -> attribute','class_element',1,'p_class_element','parser_tonto.py',94),
-  ('class_element -> relation_internal','class_element',1,'p_class_element','parser_tonto.py',95),
-  ('attribute -> RELATION_NAME COLON IDENT','attribute',3,'p_attribute','parser_tonto.py',100),
-  ('attribute -> RELATION_NAME COLON CLASS_NAME','attribute',3,'p_attribute','parser_tonto.py',101),
-  ('attribute -> RELATION_NAME COLON NATIVE_TYPE','attribute',3,'p_attribute','parser_tonto.py',102),
-  ('attribute -> RELATION_NAME COLON NEW_DATATYPE','attribute',3,'p_attribute','parser_tonto.py',103),
-  ('datatype_decl -> NEW_DATATYPE LBRACE attr_list RBRACE','datatype_decl',4,'p_datatype_decl','parser_tonto.py',114),
-  ('attr_list -> attribute','attr_list',1,'p_attr_list','parser_tonto.py',120),
-  ('attr_list -> attr_list attribute','attr_list',2,'p_attr_list','parser_tonto.py',121),
-  ('enum_decl -> ENUM CLASS_NAME LBRACE enum_items RBRACE','enum_decl',5,'p_enum_decl','parser_tonto.py',130),
-  ('enum_item -> CLASS_NAME','enum_item',1,'p_enum_item','parser_tonto.py',136),
-  ('enum_item -> IDENT','enum_item',1,'p_enum_item','parser_tonto.py',137),
-  ('enum_items -> enum_item','enum_items',1,'p_enum_items','parser_tonto.py',141),
-  ('enum_items -> enum_items enum_item','enum_items',2,'p_enum_items','parser_tonto.py',142),
-  ('generalization -> CLASS_NAME CLASS_NAME genset_block','generalization',3,'p_generalization','parser_tonto.py',149),
-  ('genset_block -> LBRACE genset_body RBRACE','genset_block',3,'p_genset_block','parser_tonto.py',155),
-  ('genset_body -> IDENT COLON IDENT','genset_body',3,'p_genset_body','parser_tonto.py',160),
-  ('genset_body -> IDENT COLON IDENT COMMA IDENT','genset_body',5,'p_genset_body','parser_tonto.py',161),
-  ('relation_internal -> IDENT LBRACKET RANGE_DOTS RBRACKET LEFT_ARROW LBRACKET RANGE_DOTS RBRACKET CLASS_NAME','relation_internal',9,'p_relation_internal','parser_tonto.py',170),
-  ('relation_external -> AT IDENT IDENT CLASS_NAME RIGHT_ARROW CLASS_NAME','relation_external',6,'p_relation_external','parser_tonto.py',176),
-  ('empty -> <empty>','empty',0,'p_empty','parser_tonto.py',183),
+  ('start -> package','start',1,'p_start','parser_tonto.py',119),
+  ('package -> PACKAGE IDENT LBRACE package_body RBRACE','package',5,'p_package','parser_tonto.py',128),
+  ('package -> PACKAGE CLASS_NAME LBRACE package_body RBRACE','package',5,'p_package','parser_tonto.py',129),
+  ('package -> PACKAGE RELATION_NAME LBRACE package_body RBRACE','package',5,'p_package','parser_tonto.py',130),
+  ('package_body -> package_item_list','package_body',1,'p_package_body','parser_tonto.py',137),
+  ('package_body -> empty','package_body',1,'p_package_body','parser_tonto.py',138),
+  ('package_item_list -> package_item_list package_item','package_item_list',2,'p_package_item_list','parser_tonto.py',143),
+  ('package_item_list -> package_item','package_item_list',1,'p_package_item_list','parser_tonto.py',144),
+  ('package_item -> enum_decl','package_item',1,'p_package_item','parser_tonto.py',157),
+  ('package_item -> class_decl','package_item',1,'p_package_item','parser_tonto.py',158),
+  ('package_item -> datatype_decl','package_item',1,'p_package_item','parser_tonto.py',159),
+  ('package_item -> generalization','package_item',1,'p_package_item','parser_tonto.py',160),
+  ('package_item -> relation_external','package_item',1,'p_package_item','parser_tonto.py',161),
+  ('package_item -> import_decl','package_item',1,'p_package_item','parser_tonto.py',162),
+  ('package_item -> error','package_item',1,'p_package_item_error','parser_tonto.py',177),
+  ('class_decl -> CLASS_NAME COLON IDENT class_block','class_decl',4,'p_class_decl','parser_tonto.py',186),
+  ('class_block -> LBRACE class_body RBRACE','class_block',3,'p_class_block','parser_tonto.py',193),
+  ('class_block -> empty','class_block',1,'p_class_block','parser_tonto.py',194),
+  ('class_body -> class_body class_element','class_body',2,'p_class_body','parser_tonto.py',200),
+  ('class_body -> class_element','class_body',1,'p_class_body','parser_tonto.py',201),
+  ('class_element -> attribute','class_element',1,'p_class_element','parser_tonto.py',206),
+  ('class_element -> relation_internal','class_element',1,'p_class_element','parser_tonto.py',207),
+  ('class_element -> error','class_element',1,'p_class_element_error','parser_tonto.py',212),
+  ('attribute -> RELATION_NAME COLON IDENT','attribute',3,'p_attribute','parser_tonto.py',217),
+  ('attribute -> RELATION_NAME COLON CLASS_NAME','attribute',3,'p_attribute','parser_tonto.py',218),
+  ('attribute -> RELATION_NAME COLON NATIVE_TYPE','attribute',3,'p_attribute','parser_tonto.py',219),
+  ('attribute -> RELATION_NAME COLON NEW_DATATYPE','attribute',3,'p_attribute','parser_tonto.py',220),
+  ('datatype_decl -> NEW_DATATYPE LBRACE attr_list RBRACE','datatype_decl',4,'p_datatype_decl','parser_tonto.py',231),
+  ('attr_list -> attribute','attr_list',1,'p_attr_list','parser_tonto.py',237),
+  ('attr_list -> attr_list attribute','attr_list',2,'p_attr_list','parser_tonto.py',238),
+  ('enum_decl -> ENUM CLASS_NAME LBRACE enum_items RBRACE','enum_decl',5,'p_enum_decl','parser_tonto.py',246),
+  ('enum_item -> CLASS_NAME','enum_item',1,'p_enum_item','parser_tonto.py',252),
+  ('enum_item -> IDENT','enum_item',1,'p_enum_item','parser_tonto.py',253),
+  ('enum_items -> enum_item','enum_items',1,'p_enum_items','parser_tonto.py',257),
+  ('enum_items -> enum_items enum_item','enum_items',2,'p_enum_items','parser_tonto.py',258),
+  ('generalization -> CLASS_NAME CLASS_NAME genset_block','generalization',3,'p_generalization','parser_tonto.py',266),
+  ('genset_block -> LBRACE genset_body RBRACE','genset_block',3,'p_genset_block','parser_tonto.py',278),
+  ('genset_body -> IDENT COLON IDENT','genset_body',3,'p_genset_body','parser_tonto.py',283),
+  ('genset_body -> IDENT COLON IDENT COMMA IDENT','genset_body',5,'p_genset_body','parser_tonto.py',284),
+  ('relation_internal -> IDENT LBRACKET RANGE_DOTS RBRACKET LEFT_ARROW LBRACKET RANGE_DOTS RBRACKET CLASS_NAME','relation_internal',9,'p_relation_internal','parser_tonto.py',292),
+  ('relation_external -> AT IDENT IDENT CLASS_NAME RIGHT_ARROW CLASS_NAME','relation_external',6,'p_relation_external','parser_tonto.py',299),
+  ('import_decl -> IMPORT qualified_name','import_decl',2,'p_import_decl','parser_tonto.py',312),
+  ('qualified_name -> qualified_name DOT name_part','qualified_name',3,'p_qualified_name','parser_tonto.py',319),
+  ('qualified_name -> name_part','qualified_name',1,'p_qualified_name','parser_tonto.py',320),
+  ('name_part -> IDENT','name_part',1,'p_name_part','parser_tonto.py',329),
+  ('name_part -> CLASS_NAME','name_part',1,'p_name_part','parser_tonto.py',330),
+  ('name_part -> RELATION_NAME','name_part',1,'p_name_part','parser_tonto.py',331),
+  ('empty -> <empty>','empty',0,'p_empty','parser_tonto.py',337),
 ]
@@ -0,0 +1,215 @@
+# perfil_tonto.py
+# Modo de instrumentação opcional: contagem e tempo acumulado por regra t_*
+# do lexer e por produção p_* do parser, contagem de shifts/reduces do LR e
+# tempo gasto em p_error. Exporta JSON ou o formato "folded" de flamegraph.
+#
+#   python perfil_tonto.py ARQUIVO.tonto [--json SAIDA] [--folded SAIDA]
+#
+# Nada aqui é usado pelo caminho normal: o lexer e o parser instrumentados
+# são cópias com as funções embrulhadas, então desligado o custo é zero.
+import argparse
+import copy
+import json
+import sys
+import time
+from collections import defaultdict
+
+from lexer_tonto import analyze, get_lexer
+from parser_tonto import TontoParser
+
+_clock = time.perf_counter
+
+
+def _entry():
+    return [0, 0.0]
+
+
+class Profile:
+    """Contadores de um perfil: [ocorrências, segundos] por regra/produção."""
+
+    def __init__(self):
+        self.rules = defaultdict(_entry)
+        self.productions = defaultdict(_entry)
+        self.errors = _entry()
+        self.lex_seconds = 0.0
+        self.tokens = 0
+        self.shifts = 0
+
+    @property
+    def reduces(self):
+        # todo reduce chama exatamente uma função de produção
+        return sum(hits for hits, _ in self.productions.values())
+
+    def timed(self, table, key, fn):
+        entry = table[key]
+
+        def wrapper(arg):
+            t0 = _clock()
+            try:
+                return fn(arg)
+            finally:
+                entry[0] += 1
+                entry[1] += _clock() - t0
+        wrapper.__name__ = getattr(fn, "__name__", key)
+        return wrapper
+
+    def to_dict(self):
+        def table(t):
+            return {k: {"hits": h, "seconds": s} for k, (h, s) in
+                    sorted(t.items(), key=lambda kv: -kv[1][1])}
+        return {
+            "lexer": {
+                "tokens": self.tokens,
+                "seconds": self.lex_seconds,
+                "rules": table(self.rules),
+            },
+            "parser": {
+                "shifts": self.shifts,
+                "reduces": self.reduces,
+                "productions": table(self.productions),
+                "p_error": {"hits": self.errors[0], "seconds": self.errors[1]},
+            },
+        }
+
+    def folded(self):
+        """Linhas 'pilha;quadro microssegundos' (stackcollapse / flamegraph.pl)."""
+        lines = []
+        for name, (hits, secs) in self.rules.items():
+            if hits:
+                lines.append(f"lexer;{name} {round(secs * 1e6)}")
+        for name, (hits, secs) in self.productions.items():
+            if hits:
+                lines.append(f"parser;{name} {round(secs * 1e6)}")
+        if self.errors[0]:
+            lines.append(f"parser;p_error {round(self.errors[1] * 1e6)}")
+        return "\n".join(lines) + "\n"
+
+    def report(self, top=15, out=sys.stdout):
+        print(f"lexer: {self.tokens} tokens em {self.lex_seconds:.4f}s", file=out)
+        for name, (hits, secs) in sorted(self.rules.items(), key=lambda kv: -kv[1][1])[:top]:
+            print(f"  {name:40} {hits:10d} {secs:10.4f}s", file=out)
+        print(f"parser: {self.shifts} shifts, {self.reduces} reduces, "
+              f"p_error {self.errors[0]}x {self.errors[1]:.4f}s", file=out)
+        for name, (hits, secs) in sorted(self.productions.items(), key=lambda kv: -kv[1][1])[:top]:
+            print(f"  {name:60} {hits:10d} {secs:10.4f}s", file=out)
+
+
+def profiled_lexer(profile):
+    """Clone do lexer com as regras-função, t_error e token() instrumentados.
+
+    Regras definidas por string não chamam função: para elas conta-se o token
+    produzido e atribui-se a ele o tempo da chamada a token().
+    """
+    lexer = get_lexer()
+    string_rules = set()
+    newtab = {}
+    for state, ritem in lexer.lexstatere.items():
+        newre = []
+        for cre, findex in ritem:
+            newfindex = []
+            for f in findex:
+                if f and f[0]:
+                    f = (profile.timed(profile.rules, f[0].__name__, f[0]), f[1])
+                elif f and f[1]:
+                    string_rules.add(f[1])
+                newfindex.append(f)
+            newre.append((cre, newfindex))
+        newtab[state] = newre
+    lexer.lexstatere = newtab
+    lexer.lexre = newtab[lexer.lexstate]
+    lexer.lexstateerrorf = {k: profile.timed(profile.rules, ef.__name__, ef) if ef else ef
+                            for k, ef in lexer.lexstateerrorf.items()}
+    lexer.lexerrorf = lexer.lexstateerrorf.get(lexer.lexstate)
+
+    token = lexer.token
+    rules = profile.rules
+
+    def profiled_token():
+        t0 = _clock()
+        tok = token()
+        elapsed = _clock() - t0
+        profile.lex_seconds += elapsed
+        if tok is not None:
+            profile.tokens += 1
+            if tok.type in string_rules:
+                entry = rules["t_" + tok.type]
+                entry[0] += 1
+                entry[1] += elapsed
+        return tok
+
+    lexer.token = profiled_token
+    return lexer
+
+
+class ProfiledParser(TontoParser):
+    """TontoParser com produções, p_error e lexer instrumentados.
+
+    Shifts são contados como tokens entregues ao parser (exato em parses sem
+    erro; tokens descartados na recuperação também entram na conta).
+    """
+
+    def __init__(self, profile=None):
+        super().__init__()
+        self.profile = profile = profile if profile is not None else Profile()
+        productions = []
+        for prod in self.lr.productions:   # lista das tabelas compartilhadas
+            prod = copy.copy(prod)
+            if prod.callable:
+                prod.callable = profile.timed(profile.productions, prod.str, prod.callable)
+            productions.append(prod)
+        self.lr.productions = productions
+        self.lr.errorfunc = profile.timed({"p_error": profile.errors}, "p_error", self.lr.errorfunc)
+
+        self.lexer = profiled_lexer(profile)
+        token = self.lexer.token
+
+        def counted_token():
+            tok = token()
+            if tok is not None:
+                profile.shifts += 1
+            return tok
+        self.lexer.token = counted_token
+
+
+def profile_text(text, profile=None, with_analyze=False):
+    """Perfila parse() (e, opcionalmente, analyze()) sobre um texto.
+
+    Com with_analyze os contadores do lexer somam as duas passadas.
+    """
+    profile = profile if profile is not None else Profile()
+    if with_analyze:
+        analyze(text, lexer=profiled_lexer(profile))
+    ProfiledParser(profile).parse(text)
+    return profile
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Perfil de regras do lexer e produções do parser Tonto")
+    ap.add_argument("files", nargs="+", help="arquivos .tonto")
+    ap.add_argument("--json", help="grava o perfil em JSON")
+    ap.add_argument("--folded", help="grava pilhas no formato folded (flamegraph)")
+    ap.add_argument("--top", type=int, default=15)
+    ap.add_argument("--analyze", action="store_true",
+                    help="perfila também analyze() (somado aos contadores do lexer)")
+    args = ap.parse_args(argv)
+
+    profile = Profile()
+    parser = ProfiledParser(profile)
+    lexer = profiled_lexer(profile)
+    for path in args.files:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        if args.analyze:
+            analyze(text, lexer=lexer)
+        parser.parse(text)
+    profile.report(args.top)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(profile.to_dict(), f, indent=2)
+    if args.folded:
+        with open(args.folded, "w") as f:
+            f.write(profile.folded())
+
+
+if __name__ == "__main__":
+    main()
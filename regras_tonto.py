@@ -0,0 +1,273 @@
+# regras_tonto.py
+# Regras de boa formação OntoUML sobre modelos já analisados. Cada regra se
+# registra (@rule) para os tipos de nó e estereótipos que lhe interessam; o
+# motor monta um índice (tipo, estereótipo) -> regras e percorre a árvore de
+# cada package uma única vez, despachando cada nó só para as regras
+# registradas para ele. Consultas que atravessam o modelo (ancestrais,
+# relações que tocam uma classe, gensets) vêm de consultas_tonto.QueryIndex,
+# montado uma vez para o projeto inteiro. Os packages são verificados em
+# paralelo e o tempo gasto por regra é contabilizado.
+#
+#   python regras_tonto.py RAIZ [-j N] [--tempos]
+import argparse
+import os
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from consultas_tonto import Declaration, Generalization, Relation, build_index
+from lexer_tonto import STEREOTYPE_CLASSES, diagnostic, format_diagnostic
+from parser_tonto import package_trees
+
+# grupos de estereótipos de classe (todos tirados de lexer_tonto)
+ULTIMATE_SORTALS = {"kind", "collective", "quantity", "quality", "mode",
+                    "intrisicMode", "extrinsicMode"} & STEREOTYPE_CLASSES
+SORTALS = ULTIMATE_SORTALS | ({"subkind", "phase", "role", "historicalRole"} & STEREOTYPE_CLASSES)
+NON_SORTALS = {"category", "mixin", "phaseMixin", "roleMixin", "historicalRoleMixin"} & STEREOTYPE_CLASSES
+ROLES = {"role", "historicalRole"} & STEREOTYPE_CLASSES
+
+RULES = []   # (nome, função, tipos de nó, estereótipos ou None)
+
+
+def rule(name, kinds, stereotypes=None):
+    """Registra `func(node, ctx)` para os tipos de nó (class, datatype, enum,
+    genset, relation, attribute) e, opcionalmente, só para esses estereótipos."""
+    def register(func):
+        RULES.append((name, func, tuple(kinds), frozenset(stereotypes) if stereotypes else None))
+        return func
+    return register
+
+
+def dispatch_table(rules=None):
+    """(tipo, estereótipo) -> [(nome, função)]; estereótipo None vale para todos."""
+    table = defaultdict(list)
+    for name, func, kinds, stereotypes in RULES if rules is None else rules:
+        for kind in kinds:
+            for stereotype in stereotypes or (None,):
+                table[kind, stereotype].append((name, func))
+    return dict(table)
+
+
+# ===============================================================
+#   Regras
+# ===============================================================
+
+@rule("sortal-ultimo", ("class",), SORTALS)
+def sortal_identity(node, ctx):
+    """Todo sortal especializa exatamente um sortal último (kind, collective...)."""
+    index = ctx.index
+    ultimate = sorted(c for c in index.ancestors(node.name) | {node.name}
+                      if index.stereotypes_of(c) & ULTIMATE_SORTALS)
+    if not ultimate:
+        ctx.report(f"{node.stereotype} '{node.name}' não especializa nenhum sortal último "
+                   f"({', '.join(sorted(ULTIMATE_SORTALS))})")
+    elif len(ultimate) > 1:
+        ctx.report(f"{node.stereotype} '{node.name}' especializa mais de um sortal último: "
+                   f"{', '.join(ultimate)}")
+
+
+@rule("role-mediation", ("class",), ROLES)
+def role_mediation(node, ctx):
+    """Um role precisa de uma relação mediation (nele ou em um ancestral)."""
+    index = ctx.index
+    for name in index.ancestors(node.name) | {node.name}:
+        if index.relations("mediation", touching=name):
+            return
+    ctx.report(f"{node.stereotype} '{node.name}' não participa de nenhuma relação mediation")
+
+
+@rule("phase-genset", ("class",), {"phase"})
+def phase_genset(node, ctx):
+    """Uma phase fica em um genset disjoint e complete."""
+    for genset in ctx.index.gensets(node.name):
+        if {"disjoint", "complete"} <= set(genset.modifiers):
+            return
+    ctx.report(f"phase '{node.name}' não está em um genset disjoint complete")
+
+
+@rule("nao-sortal", ("class",), NON_SORTALS)
+def non_sortal_over_sortal(node, ctx):
+    """Um não-sortal (category, mixin...) não especializa um sortal."""
+    index = ctx.index
+    sortals = sorted(c for c in index.ancestors(node.name) if index.stereotypes_of(c) & SORTALS)
+    if sortals:
+        ctx.report(f"{node.stereotype} '{node.name}' não pode especializar o sortal {sortals[0]}")
+
+
+@rule("genset-ciclo", ("genset",))
+def genset_cycle(node, ctx):
+    """Generalizações não formam ciclos."""
+    if node.general == node.specific or node.general in ctx.index.descendants(node.specific):
+        ctx.report(f"ciclo de generalização entre '{node.general}' e '{node.specific}'")
+
+
+# ===============================================================
+#   Motor
+# ===============================================================
+
+class Context:
+    """O que uma regra enxerga: o índice do projeto e onde relatar."""
+
+    __slots__ = ("index", "path", "line", "col", "length", "rule", "diagnostics")
+
+    def __init__(self, index, path):
+        self.index = index
+        self.path = path
+        self.line = self.col = 0
+        self.length = 1
+        self.rule = None
+        self.diagnostics = []
+
+    def report(self, message, severity="error"):
+        d = diagnostic("regras", message, self.line, self.col, self.length, severity)
+        d["rule"] = self.rule
+        self.diagnostics.append(d)
+
+
+def _nodes(package, items):
+    """Gera (tipo, estereótipo, nó para a regra, nó da árvore) em um só percurso."""
+    for item in items:
+        kind = item.kind
+        if kind == "class":
+            yield "class", item.stereotype, Declaration(package, "class", item.name, item.stereotype), item
+            for element in item.elements:
+                if element.kind == "relation_internal":
+                    relation = Relation(package, element.stereotype, None, item.name, element.target)
+                    yield "relation", element.stereotype, relation, element
+                else:
+                    yield "attribute", None, element, element
+        elif kind in ("datatype", "enum"):
+            yield kind, None, Declaration(package, kind, item.name, None), item
+        elif kind == "genset":
+            yield "genset", None, Generalization(package, item.general, item.specific, item.modifiers), item
+        elif kind == "relation_external":
+            relation = Relation(package, item.stereotype, item.name, item.source, item.target)
+            yield "relation", item.stereotype, relation, item
+
+
+def _where(lines, node):
+    """(linha, coluna, tamanho) do nó; o tamanho vai até o fim da primeira linha."""
+    if lines is None:
+        return 0, 0, 1
+    line, col = lines.position(node.start)
+    end = lines.starts[line] - 1 if line < len(lines) else lines.length
+    return line, col, max(1, min(node.end, end) - node.start)
+
+
+def check_package(index, path, package, items, lines, table=None):
+    """Percorre um package uma vez; devolve (diagnósticos, {regra: [chamadas, s]}).
+
+    `lines` é o LineIndex do arquivo (None: diagnósticos sem posição).
+    """
+    table = dispatch_table() if table is None else table
+    ctx = Context(index, path)
+    timings = defaultdict(lambda: [0, 0.0])
+    clock = time.perf_counter
+    empty = ()
+    for kind, stereotype, node, source in _nodes(package, items):
+        rules = table.get((kind, stereotype), empty)
+        generic = table.get((kind, None), empty) if stereotype is not None else empty
+        if not rules and not generic:
+            continue
+        ctx.line, ctx.col, ctx.length = _where(lines, source)
+        for name, func in (*rules, *generic):
+            ctx.rule = name
+            t0 = clock()
+            func(node, ctx)
+            spent = timings[name]
+            spent[0] += 1
+            spent[1] += clock() - t0
+    return ctx.diagnostics, dict(timings)
+
+
+_worker_index = None
+
+
+def _init_worker(index):
+    global _worker_index
+    _worker_index = index
+
+
+def _check_task(task):
+    return check_package(_worker_index, *task)
+
+
+class RuleReport:
+    """Resultado da verificação: (arquivo, diagnóstico) e tempo por regra."""
+
+    def __init__(self):
+        self.diagnostics = []
+        self.timings = defaultdict(lambda: [0, 0.0])   # regra -> [chamadas, segundos]
+        self.elapsed = 0.0
+
+    @property
+    def ok(self):
+        return not any(d["severity"] == "error" for _, d in self.diagnostics)
+
+
+def _tasks(documents):
+    for path, ontologia in documents:
+        for package in package_trees(ontologia):
+            yield path, package.name, package.items, ontologia.line_index
+
+
+def check_project(documents, workers=None, index=None):
+    """Verifica (arquivo, Ontologia) de um projeto.
+
+    Com mais de um worker, cada package vai para um processo; o índice do
+    projeto é enviado uma vez a cada processo.
+    """
+    documents = [(path, o) for path, o in documents if o.tree is not None]
+    t0 = time.perf_counter()
+    index = build_index(documents) if index is None else index
+    tasks = list(_tasks(documents))
+    workers = workers or os.cpu_count()
+    if workers == 1 or len(tasks) <= 1:
+        table = dispatch_table()
+        results = [check_package(index, *task, table=table) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(index,)) as pool:
+            results = list(pool.map(_check_task, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+    report = RuleReport()
+    for (path, *_), (diagnostics, timings) in zip(tasks, results):
+        report.diagnostics.extend((path, d) for d in diagnostics)
+        for name, (calls, spent) in timings.items():
+            total = report.timings[name]
+            total[0] += calls
+            total[1] += spent
+    report.elapsed = time.perf_counter() - t0
+    return report
+
+
+def main(argv=None):
+    from compilador_tonto import discover
+    from parser_tonto import build_parser
+    ap = argparse.ArgumentParser(description="Verifica regras de boa formação OntoUML em arquivos Tonto")
+    ap.add_argument("root", help="arquivo .tonto ou diretório do projeto")
+    ap.add_argument("-j", "--jobs", type=int, default=None, help="processos (padrão: núcleos)")
+    ap.add_argument("--tempos", action="store_true", help="mostra o tempo gasto por regra")
+    args = ap.parse_args(argv)
+
+    parser = build_parser()
+    documents = []
+    for path in discover(args.root):
+        with open(path, encoding="utf-8") as f:
+            documents.append((path, parser.parse(f.read())))
+    report = check_project(documents, args.jobs)
+    root = args.root if os.path.isdir(args.root) else os.path.dirname(args.root)
+    for path, ontologia in documents:
+        for d in ontologia.diagnostics:
+            print(format_diagnostic(d, os.path.relpath(path, root or ".")), file=sys.stderr)
+    for path, d in report.diagnostics:
+        print(f"{format_diagnostic(d, os.path.relpath(path, root or '.'))} [{d['rule']}]", file=sys.stderr)
+    print(f"{len(report.diagnostics)} violações em {report.elapsed:.3f}s")
+    if args.tempos:
+        for name, (calls, spent) in sorted(report.timings.items(), key=lambda kv: -kv[1][1]):
+            print(f"  {name:<16} {calls:>8} nós  {spent * 1000:9.2f} ms")
+    sys.exit(0 if report.ok else 1)
+
+
+if __name__ == "__main__":
+    main()
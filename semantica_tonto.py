@@ -0,0 +1,201 @@
+# semantica_tonto.py
+# Passo semântico sobre os modelos já analisados: monta tabelas de símbolos
+# indexadas por hash (uma por pacote) com as classes, enums e datatypes
+# declarados, e resolve em uma única varredura linear cada referência
+# registrada pelo parser (tipos de atributos, general/specific de gensets e
+# pontas de relações), procurando no próprio pacote e depois nos imports.
+# Relata símbolos duplicados, referências indefinidas e imports sem alvo.
+#
+#   python semantica_tonto.py ARQUIVO.tonto [ARQUIVO.tonto ...]
+import argparse
+import sys
+
+from lexer_tonto import diagnostic, format_diagnostic
+
+# seção da Ontologia -> tipo de símbolo declarado
+DECLARACOES = {"classes": "class", "enums": "enum", "datatypes": "datatype"}
+
+# tipo de referência -> tipos de símbolo aceitos
+ESPERADO = {
+    "type": {"class", "enum", "datatype"},
+    "general": {"class"},
+    "specific": {"class"},
+    "source": {"class"},
+    "target": {"class"},
+}
+
+
+class Symbol:
+    """Uma declaração: nome, tipo (class/enum/datatype) e onde foi declarada."""
+
+    __slots__ = ("name", "kind", "package", "path", "line", "col")
+
+    def __init__(self, name, kind, package, path, line, col):
+        self.name = name
+        self.kind = kind
+        self.package = package
+        self.path = path
+        self.line = line
+        self.col = col
+
+    def __repr__(self):
+        return f"Symbol({self.package}.{self.name}, {self.kind})"
+
+
+class SymbolTable:
+    """Símbolos por pacote: `packages[pacote][nome] -> Symbol`.
+
+    Um pacote pode estar espalhado por vários arquivos; todos alimentam a
+    mesma tabela.
+    """
+
+    def __init__(self):
+        self.packages = {}
+
+    def declare(self, symbol):
+        """Registra o símbolo; devolve a declaração anterior se já existia."""
+        table = self.packages.setdefault(symbol.package, {})
+        previous = table.get(symbol.name)
+        if previous is None:
+            table[symbol.name] = symbol
+        return previous
+
+    def lookup(self, package, name):
+        table = self.packages.get(package)
+        return table.get(name) if table is not None else None
+
+    def __len__(self):
+        return sum(len(t) for t in self.packages.values())
+
+
+def package_of(ontologia):
+    """Nome do pacote declarado no documento (None se não houver)."""
+    return ontologia["packages"][0] if ontologia["packages"] else None
+
+
+def _position(ontologia, secao, i):
+    if ontologia.line_index is None:
+        return 0, 0
+    return ontologia.position(secao, i)
+
+
+class Resolution:
+    """Resultado do passo semântico sobre um conjunto de documentos.
+
+    `links[path][i]` é o Symbol da i-ésima referência do documento (ou None,
+    se indefinida) e `diagnostics` a lista de (arquivo, diagnóstico).
+    """
+
+    def __init__(self):
+        self.table = SymbolTable()
+        self.links = {}
+        self.diagnostics = []
+
+    @property
+    def ok(self):
+        return not any(d["severity"] == "error" for _, d in self.diagnostics)
+
+    def report(self, path, message, line, col, length=1, severity="error"):
+        self.diagnostics.append((path, diagnostic("semantica", message, line, col, length, severity)))
+
+    def declare_all(self, documents):
+        """Declara na tabela os símbolos de cada (arquivo, Ontologia)."""
+        table = self.table
+        for path, ontologia in documents:
+            package = package_of(ontologia)
+            for secao, kind in DECLARACOES.items():
+                for i, name in enumerate(ontologia[secao]):
+                    if secao == "classes":
+                        name = name["name"]
+                    line, col = _position(ontologia, secao, i)
+                    previous = table.declare(Symbol(name, kind, package, path, line, col))
+                    if previous is not None:
+                        self.report(path, f"'{name}' já declarado em {previous.path}:"
+                                    f"{previous.line}:{previous.col}", line, col, len(name))
+
+    def _scope(self, path, ontologia):
+        """Tabelas visíveis no documento: o próprio pacote e os importados.
+
+        `import a.b` torna visível o pacote a.b inteiro; `import a.b.C`, se
+        a.b.C não for um pacote, torna visível apenas o símbolo C de a.b.
+        """
+        packages = self.table.packages
+        tables = [packages.get(package_of(ontologia), {})]
+        symbols = {}
+        for i, name in enumerate(ontologia["imports"]):
+            if name in packages:
+                tables.append(packages[name])
+                continue
+            package, _, symbol = name.rpartition(".")
+            found = packages.get(package, {}).get(symbol)
+            if found is not None:
+                symbols[symbol] = found
+            else:
+                line, col = _position(ontologia, "imports", i)
+                self.report(path, f"import '{name}' não corresponde a nenhum pacote ou símbolo",
+                            line, col, len(name), "warning")
+        if symbols:
+            tables.append(symbols)
+        return tables
+
+    def resolve_all(self, documents):
+        """Resolve as referências de cada (arquivo, Ontologia) contra a tabela."""
+        for path, ontologia in documents:
+            tables = self._scope(path, ontologia)
+            links = self.links[path] = []
+            for i, ref in enumerate(ontologia["references"]):
+                name = ref["name"]
+                for table in tables:
+                    symbol = table.get(name)
+                    if symbol is not None:
+                        break
+                links.append(symbol)
+                if symbol is None:
+                    line, col = _position(ontologia, "references", i)
+                    self.report(path, f"'{name}' não declarado", line, col, len(name))
+                elif symbol.kind not in ESPERADO[ref["kind"]]:
+                    line, col = _position(ontologia, "references", i)
+                    self.report(path, f"'{name}' é {symbol.kind}, esperado "
+                                f"{' ou '.join(sorted(ESPERADO[ref['kind']]))}", line, col, len(name))
+
+
+def resolve_project(documents):
+    """Declara e resolve os símbolos de (arquivo, Ontologia) de um projeto.
+
+    Duas passadas lineares: todas as declarações entram nas tabelas antes da
+    resolução, então a ordem dos documentos não importa.
+    """
+    documents = list(documents)
+    resolution = Resolution()
+    resolution.declare_all(documents)
+    resolution.resolve_all(documents)
+    return resolution
+
+
+def resolve(ontologia, path=None):
+    """Atalho para um único documento."""
+    return resolve_project([(path, ontologia)])
+
+
+def main(argv=None):
+    from parser_tonto import build_parser
+    ap = argparse.ArgumentParser(description="Resolve os símbolos de arquivos Tonto")
+    ap.add_argument("files", nargs="+", help="arquivos .tonto")
+    args = ap.parse_args(argv)
+
+    parser = build_parser()
+    documents = []
+    for path in args.files:
+        with open(path, encoding="utf-8") as f:
+            documents.append((path, parser.parse(f.read())))
+    resolution = resolve_project(documents)
+    for path, d in resolution.diagnostics:
+        print(format_diagnostic(d, path), file=sys.stderr)
+    resolved = sum(s is not None for links in resolution.links.values() for s in links)
+    total = sum(len(links) for links in resolution.links.values())
+    print(f"{len(resolution.table)} símbolos, {resolved}/{total} referências resolvidas")
+    sys.exit(0 if resolution.ok else 1)
+
+
+if __name__ == "__main__":
+    main()
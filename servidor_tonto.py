@@ -0,0 +1,553 @@
+# servidor_tonto.py
+# Servidor de linguagem (LSP, JSON-RPC sobre stdio) para Tonto, em asyncio.
+# O processo fica vivo enquanto o editor estiver aberto: lexer e parser são
+# construídos uma vez, os documentos abertos ficam em memória e cada edição
+# incremental é aplicada ao texto sem reanalisar o arquivo inteiro:
+#
+#   * re-léxico: tokens ficam guardados por linha e, como nenhum token
+#     atravessa uma quebra de linha, só as linhas tocadas pela edição são
+#     lexadas de novo;
+#   * re-parse: o corpo do pacote é dividido em itens de topo (classes,
+#     enums, gensets...) e cada item é analisado isoladamente; itens cujo
+#     conteúdo não mudou reaproveitam o resultado anterior.
+#
+# Serve diagnósticos (léxicos, sintáticos e semânticos), símbolos do documento
+# e ir-para-definição.
+#
+#   python servidor_tonto.py          (o editor conversa via stdin/stdout)
+import asyncio
+import json
+import sys
+import time
+
+from arvore_tonto import Package
+from lexer_tonto import LineIndex, get_lexer, line_index
+from parser_tonto import Ontologia, TontoParser, syntax_error
+from semantica_tonto import resolve_project
+
+DEBOUNCE = 0.05   # segundos sem edições antes de reanalisar e publicar
+
+# LSP: SymbolKind e DiagnosticSeverity
+_SYMBOL_KINDS = {"packages": 4, "classes": 5, "enums": 10, "datatypes": 23}
+_SEVERITY = {"error": 1, "warning": 2}
+
+_NAME_TYPES = {"IDENT", "CLASS_NAME", "RELATION_NAME"}
+
+
+def _skip_block(toks, j, hi):
+    """toks[j] é '{': devolve o índice logo após o '}' correspondente (ou hi)."""
+    depth = 0
+    while j < hi:
+        kind = toks[j][2]
+        if kind == "LBRACE":
+            depth += 1
+        elif kind == "RBRACE":
+            depth -= 1
+            if depth == 0:
+                return j + 1
+        j += 1
+    return hi
+
+
+def segment(toks, lo, hi):
+    """Divide toks[lo:hi] (o corpo do pacote) em itens de topo; gera (i, j).
+
+    Segue a forma dos itens da gramática; o que não tiver forma conhecida vira
+    um item de um token só, que o parser vai rejeitar com um diagnóstico.
+    """
+    i = lo
+    while i < hi:
+        kind = toks[i][2]
+        nxt = toks[i + 1][2] if i + 1 < hi else None
+        j = i + 1
+        if kind == "CLASS_NAME" and nxt == "COLON":
+            j = min(i + 3, hi)                      # Nome : estereótipo
+        elif kind == "CLASS_NAME" and nxt == "CLASS_NAME":
+            j = i + 2                               # General Specific
+        elif kind == "ENUM" and nxt in _NAME_TYPES:
+            j = i + 2
+        elif kind == "AT":                          # @rel nome A --<> B
+            while j < min(i + 6, hi) and toks[j][2] not in ("LBRACE", "RBRACE"):
+                j += 1
+        elif kind == "IMPORT" and nxt in _NAME_TYPES:
+            j = i + 2                               # import a.b.C
+            while j + 1 < hi and toks[j][2] == "DOT" and toks[j + 1][2] in _NAME_TYPES:
+                j += 2
+        if kind in ("CLASS_NAME", "ENUM", "NEW_DATATYPE") and j < hi and toks[j][2] == "LBRACE":
+            j = _skip_block(toks, j, hi)
+        yield i, j
+        i = j
+
+
+class _Feed:
+    """Imita o lexer do PLY entregando uma lista pronta de tokens ao parser.
+
+    `lexdata` é o documento inteiro, então posições e diagnósticos produzidos
+    pelo parser já saem nas coordenadas do documento.
+    """
+
+    def __init__(self, text, index, tokens):
+        self.lexdata = text
+        self._line_index = (text, index)
+        self.diagnostics = []
+        self.lineno = 1
+        self._tokens = iter(tokens)
+
+    def token(self):
+        return next(self._tokens, None)
+
+
+def _lex_token(type_, value, offset, line):
+    from ply.lex import LexToken
+    tok = LexToken()
+    tok.type = type_
+    tok.value = value
+    tok.lexpos = offset
+    tok.lineno = line
+    return tok
+
+
+class Fragment:
+    """Resultado do parse de um item, com posições relativas ao seu início."""
+
+    __slots__ = ("sections", "diagnostics", "items")
+
+    def __init__(self, sections, diagnostics, items):
+        self.sections = sections        # secao -> [(valor, offset relativo)]
+        self.diagnostics = diagnostics  # [(offset relativo, diagnóstico)]
+        self.items = items              # nós da árvore, com spans relativos
+
+
+class Document:
+    """Um documento aberto: texto, tokens por linha e modelo sob demanda."""
+
+    def __init__(self, uri, text, version=0, utf16=True):
+        self.uri = uri
+        self.version = version
+        self.utf16 = utf16
+        self.lexer = get_lexer()
+        self.parser = TontoParser()
+        self._fragments = {}
+        self._model = None
+        self.stats = {"relexed_lines": 0, "parsed_items": 0, "reused_items": 0}
+        self.set_text(text)
+
+    # --- texto e posições ---
+    def set_text(self, text):
+        self.text = text
+        self.index = LineIndex(text)
+        self.line_tokens, self.line_diags = self._lex_lines(0, len(self.index) - 1)
+        self._model = None
+
+    def _line_text(self, line):
+        starts = self.index.starts
+        end = starts[line + 1] - 1 if line + 1 < len(starts) else len(self.text)
+        return self.text[starts[line]:end]
+
+    def to_offset(self, pos):
+        """Position do LSP (linha/caractere a partir de 0) -> offset."""
+        line = pos["line"]
+        if line >= len(self.index):
+            return len(self.text)
+        text = self._line_text(line)
+        ch = pos["character"]
+        if self.utf16 and not text.isascii():
+            units = 0
+            for n, c in enumerate(text):
+                if units >= ch:
+                    ch = n
+                    break
+                units += 2 if ord(c) > 0xFFFF else 1
+            else:
+                ch = len(text)
+        return self.index.starts[line] + min(ch, len(text))
+
+    def to_position(self, offset):
+        line, col = self.index.position(min(offset, len(self.text)))
+        ch = col - 1
+        if self.utf16:
+            prefix = self.text[self.index.starts[line - 1]:offset]
+            if not prefix.isascii():
+                ch = len(prefix.encode("utf-16-le")) // 2
+        return {"line": line - 1, "character": ch}
+
+    def to_range(self, offset, length):
+        return {"start": self.to_position(offset), "end": self.to_position(offset + length)}
+
+    # --- léxico incremental ---
+    def _lex_lines(self, first, last):
+        """Lexa as linhas first..last (a partir de 0) do texto atual.
+
+        Devolve, por linha, os tokens (coluna, tamanho, tipo, valor) e os
+        diagnósticos léxicos (coluna, diagnóstico), com colunas a partir de 0.
+        """
+        starts = self.index.starts
+        end = starts[last + 1] if last + 1 < len(starts) else len(self.text)
+        lexer = self.lexer
+        lexer.lineno = 0
+        lexer.diagnostics = []
+        lexer.input(self.text[starts[first]:end])
+        seg = line_index(lexer).starts
+        rows = [[] for _ in range(last - first + 1)]
+        while True:
+            tok = lexer.token()
+            if not tok:
+                break
+            rows[tok.lineno].append((tok.lexpos - seg[tok.lineno], lexer.lexpos - tok.lexpos,
+                                     tok.type, tok.value))
+        diags = [[] for _ in range(last - first + 1)]
+        for d in lexer.diagnostics:
+            diags[d["line"]].append((d["col"] - 1, d))
+        self.stats["relexed_lines"] += last - first + 1
+        return rows, diags
+
+    def apply(self, change):
+        """Aplica uma contentChange do LSP (com ou sem `range`)."""
+        if "range" not in change:
+            self.set_text(change["text"])
+            return
+        a = self.to_offset(change["range"]["start"])
+        b = max(a, self.to_offset(change["range"]["end"]))
+        first = self.index.line(a) - 1
+        last_old = self.index.line(b) - 1
+        new = change["text"]
+        self.text = self.text[:a] + new + self.text[b:]
+        self.index = LineIndex(self.text)
+        rows, diags = self._lex_lines(first, first + new.count("\n"))
+        self.line_tokens[first:last_old + 1] = rows
+        self.line_diags[first:last_old + 1] = diags
+        self._model = None
+
+    # --- parse por item ---
+    def _tokens(self):
+        starts = self.index.starts
+        toks = []
+        for line, row in enumerate(self.line_tokens):
+            base = starts[line]
+            for col, length, type_, value in row:
+                toks.append((base + col, length, type_, value, line + 1))
+        return toks
+
+    def _parse_item(self, header, item):
+        """Analisa `package Nome { <item> }` e relativiza o resultado."""
+        start = item[0][0]
+        last = item[-1]
+        feed_tokens = [_lex_token(t[2], t[3], t[0], t[4]) for t in header + item]
+        feed_tokens.append(_lex_token("RBRACE", "}", last[0] + last[1], last[4]))
+        feed = _Feed(self.text, self.index, feed_tokens)
+        frag = Ontologia()
+        frag.line_index = self.index
+        lr = self.parser.lr
+        errorfunc = lr.errorfunc
+        lr.errorfunc = lambda p: syntax_error(p, feed)
+        lr.ontologia = frag
+        try:
+            tree = lr.parse(lexer=feed)
+        finally:
+            del lr.ontologia
+            lr.errorfunc = errorfunc
+        sections = {}
+        for secao, values in frag.items():
+            if secao != "packages" and values:
+                sections[secao] = [(v, off - start) for v, off in zip(values, frag.spans[secao])]
+        diagnostics = []
+        for d in feed.diagnostics:
+            try:
+                offset = self.index.offset(d["line"], d["col"])
+            except IndexError:
+                offset = last[0] + last[1]
+            diagnostics.append((offset - start, d))
+        items = [node.moved(-start) for node in tree.items] if tree else []
+        return Fragment(sections, diagnostics, items)
+
+    def model(self):
+        """Ontologia do documento (recalculada só se o texto mudou)."""
+        if self._model is None:
+            self._model = self._build_model()
+        return self._model
+
+    def _build_model(self):
+        toks = self._tokens()
+        names = ("IDENT", "CLASS_NAME", "RELATION_NAME")
+        if (len(toks) < 4 or toks[0][2] != "PACKAGE" or toks[1][2] not in names
+                or toks[2][2] != "LBRACE" or toks[-1][2] != "RBRACE"):
+            # fora da forma `package Nome { ... }`: parse completo
+            self._fragments = {}
+            return self.parser.parse(self.text)
+
+        model = Ontologia()
+        model.line_index = self.index
+        model.record("packages", toks[1][3], toks[1][0])
+        header = toks[:3]
+        model.tree = Package(toks[0][0], toks[-1][0] + 1, toks[1][3], [])
+        items = model.tree.items
+        fragments = {}
+        item_diags = []
+        for i, j in segment(toks, 3, len(toks) - 1):
+            item = toks[i:j]
+            start = item[0][0]
+            # mesmo texto => mesmos tokens nas mesmas posições relativas
+            key = self.text[start:item[-1][0] + item[-1][1]]
+            frag = fragments.get(key) or self._fragments.get(key)
+            if frag is None:
+                frag = self._parse_item(header, item)
+                self.stats["parsed_items"] += 1
+            else:
+                self.stats["reused_items"] += 1
+            fragments[key] = frag
+            for secao, rows in frag.sections.items():
+                for value, rel in rows:
+                    model.record(secao, value, start + rel)
+            for rel, d in frag.diagnostics:
+                item_diags.append((start + rel, d))
+            items.extend(node.moved(start) for node in frag.items)
+        self._fragments = fragments
+
+        starts = self.index.starts
+        diags = [(starts[line] + col, d) for line, row in enumerate(self.line_diags)
+                 for col, d in row]
+        diags.extend(item_diags)
+        diags.sort(key=lambda od: od[0])
+        position = self.index.position
+        model.diagnostics = []
+        for off, d in diags:
+            line, col = position(off)
+            model.diagnostics.append(dict(d, line=line, col=col, offset=off))
+        return model
+
+    def offset_of(self, d):
+        """Offset de um diagnóstico (ou símbolo) com linha/coluna a partir de 1."""
+        if "offset" in d:
+            return d["offset"]
+        try:
+            return self.index.offset(d["line"], d["col"])
+        except IndexError:
+            return len(self.text)
+
+
+class Server:
+    """Despacho das mensagens LSP e estado do workspace (documentos abertos)."""
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.documents = {}
+        self.utf16 = True
+        self.shutdown = False
+        self.resolution = None
+        self._published = {}
+        self._pending = None
+
+    # --- transporte ---
+    def send(self, message):
+        body = json.dumps(message, ensure_ascii=False).encode("utf-8")
+        self.writer.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+
+    def notify(self, method, params):
+        self.send({"jsonrpc": "2.0", "method": method, "params": params})
+
+    async def dispatch(self, message):
+        method = message.get("method")
+        handler = getattr(self, "on_" + (method or "").replace("/", "_").replace("$", "S"), None)
+        msg_id = message.get("id")
+        if handler is None:
+            if msg_id is not None:
+                self.send({"jsonrpc": "2.0", "id": msg_id,
+                           "error": {"code": -32601, "message": f"método desconhecido: {method}"}})
+            return
+        try:
+            result = handler(message.get("params") or {})
+        except Exception as exc:   # um pedido com defeito não derruba o servidor
+            print(f"[servidor_tonto] erro em {method}: {exc!r}", file=sys.stderr)
+            if msg_id is not None:
+                self.send({"jsonrpc": "2.0", "id": msg_id,
+                           "error": {"code": -32603, "message": str(exc)}})
+            return
+        if msg_id is not None:
+            self.send({"jsonrpc": "2.0", "id": msg_id, "result": result})
+        await self.writer.drain()
+
+    # --- ciclo de vida ---
+    def on_initialize(self, params):
+        encodings = params.get("capabilities", {}).get("general", {}).get("positionEncodings", [])
+        self.utf16 = "utf-32" not in encodings
+        return {
+            "capabilities": {
+                "positionEncoding": "utf-16" if self.utf16 else "utf-32",
+                "textDocumentSync": {"openClose": True, "change": 2},
+                "documentSymbolProvider": True,
+                "definitionProvider": True,
+            },
+            "serverInfo": {"name": "servidor_tonto"},
+        }
+
+    def on_initialized(self, params):
+        return None
+
+    def on_shutdown(self, params):
+        self.shutdown = True
+        return None
+
+    def on_exit(self, params):
+        raise SystemExit(0 if self.shutdown else 1)
+
+    # --- sincronização de documentos ---
+    def on_textDocument_didOpen(self, params):
+        td = params["textDocument"]
+        self.documents[td["uri"]] = Document(td["uri"], td["text"], td.get("version", 0), self.utf16)
+        self.analyze_now()
+
+    def on_textDocument_didChange(self, params):
+        td = params["textDocument"]
+        doc = self.documents[td["uri"]]
+        doc.version = td.get("version", doc.version)
+        for change in params["contentChanges"]:
+            doc.apply(change)
+        self.resolution = None
+        self.schedule()
+
+    def on_textDocument_didClose(self, params):
+        uri = params["textDocument"]["uri"]
+        self.documents.pop(uri, None)
+        if self._published.pop(uri, None):
+            self.notify("textDocument/publishDiagnostics", {"uri": uri, "diagnostics": []})
+        self.resolution = None
+
+    # --- análise e diagnósticos ---
+    def schedule(self):
+        """Reanalisa DEBOUNCE segundos depois da última edição."""
+        if self._pending is not None:
+            self._pending.cancel()
+        self._pending = asyncio.get_running_loop().call_later(DEBOUNCE, self.analyze_now)
+
+    def resolve(self):
+        if self.resolution is None:
+            self.resolution = resolve_project((uri, doc.model()) for uri, doc in self.documents.items())
+        return self.resolution
+
+    def analyze_now(self):
+        self._pending = None
+        self.resolution = None
+        semantic = {}
+        for uri, d in self.resolve().diagnostics:
+            semantic.setdefault(uri, []).append(d)
+        for uri, doc in self.documents.items():
+            diags = [self._lsp_diagnostic(doc, d)
+                     for d in doc.model().diagnostics + semantic.get(uri, [])]
+            if diags != self._published.get(uri):
+                self._published[uri] = diags
+                self.notify("textDocument/publishDiagnostics",
+                            {"uri": uri, "version": doc.version, "diagnostics": diags})
+
+    def _lsp_diagnostic(self, doc, d):
+        return {
+            "range": doc.to_range(doc.offset_of(d), d["length"]),
+            "severity": _SEVERITY.get(d["severity"], 1),
+            "source": "tonto/" + d["source"],
+            "message": d["message"],
+        }
+
+    # --- consultas ---
+    def on_textDocument_documentSymbol(self, params):
+        doc = self.documents[params["textDocument"]["uri"]]
+        model = doc.model()
+        children = []
+        for secao in ("classes", "enums", "datatypes"):
+            for value, offset in zip(model[secao], model.spans[secao]):
+                name = value["name"] if secao == "classes" else value
+                rng = doc.to_range(offset, len(name))
+                children.append({
+                    "name": name,
+                    "detail": value["stereotype"] if secao == "classes" else secao[:-1],
+                    "kind": _SYMBOL_KINDS[secao],
+                    "range": rng,
+                    "selectionRange": rng,
+                })
+        children.sort(key=lambda s: (s["range"]["start"]["line"], s["range"]["start"]["character"]))
+        if not model["packages"]:
+            return children
+        name = model["packages"][0]
+        rng = doc.to_range(model.spans["packages"][0], len(name))
+        return [{
+            "name": name,
+            "kind": _SYMBOL_KINDS["packages"],
+            "range": {"start": rng["start"], "end": doc.to_position(len(doc.text))},
+            "selectionRange": rng,
+            "children": children,
+        }]
+
+    def on_textDocument_definition(self, params):
+        uri = params["textDocument"]["uri"]
+        doc = self.documents[uri]
+        if self._pending is not None:   # há edição ainda não analisada
+            self._pending.cancel()
+            self.analyze_now()
+        offset = doc.to_offset(params["position"])
+        model = doc.model()
+        links = self.resolve().links.get(uri, [])
+        for i, (ref, start) in enumerate(zip(model["references"], model.spans["references"])):
+            if start <= offset <= start + len(ref["name"]) and i < len(links):
+                symbol = links[i]
+                if symbol is None:
+                    return None
+                target = self.documents.get(symbol.path)
+                if target is None:
+                    return None
+                start = target.offset_of({"line": symbol.line, "col": symbol.col})
+                return {"uri": symbol.path, "range": target.to_range(start, len(symbol.name))}
+        return None
+
+
+async def read_message(reader):
+    """Lê uma mensagem com cabeçalho Content-Length; None no fim da entrada."""
+    length = None
+    while True:
+        line = await reader.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            break
+        name, _, value = line.decode("ascii").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    if length is None:
+        return None
+    return json.loads(await reader.readexactly(length))
+
+
+async def _stdio():
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin.buffer)
+    transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin,
+                                                        sys.stdout.buffer)
+    writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+    return reader, writer
+
+
+async def serve(reader, writer):
+    server = Server(writer)
+    while True:
+        message = await read_message(reader)
+        if message is None:
+            return 0 if server.shutdown else 1
+        try:
+            await server.dispatch(message)
+        except SystemExit as exc:
+            await writer.drain()
+            return exc.code
+
+
+def main():
+    t0 = time.perf_counter()
+    TontoParser()   # aquece lexer e parser antes do primeiro pedido
+    print(f"[servidor_tonto] pronto em {time.perf_counter() - t0:.3f}s", file=sys.stderr)
+
+    async def run():
+        reader, writer = await _stdio()
+        return await serve(reader, writer)
+    sys.exit(asyncio.run(run()))
+
+
+if __name__ == "__main__":
+    main()
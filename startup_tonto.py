@@ -0,0 +1,100 @@
+# startup_tonto.py
+# Orçamento de tempo de inicialização: cada ponto de entrada roda em um
+# interpretador novo (como um editor ou hook de pre-commit faria, um processo
+# por arquivo), a partir de um diretório temporário, e a mediana de N
+# execuções é comparada com o orçamento. Sai com código 1 se algum estourar.
+#
+#   python startup_tonto.py [--runs 7] [--scale 1.0] [--json SAIDA]
+#
+# A inicialização nunca deve regerar tabelas: se lextab_tonto.py/parsetab.py
+# estiverem desatualizados o aviso em stderr também conta como falha.
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+_SAMPLE = "package Exemplo {\n    Pessoa : kind {\n        nome : string\n    }\n}\n"
+
+# nome -> (argumentos do interpretador, orçamento em segundos)
+ENTRY_POINTS = {
+    "import lexer_tonto": (
+        ["-c", "import lexer_tonto"], 0.15),
+    "analyze()": (
+        ["-c", f"from lexer_tonto import analyze; analyze({_SAMPLE!r})"], 0.20),
+    "build_parser().parse()": (
+        ["-c", f"from parser_tonto import build_parser; build_parser().parse({_SAMPLE!r})"], 0.25),
+    "compilador_tonto.py ARQUIVO": (
+        [os.path.join(HERE, "compilador_tonto.py"), "{file}", "-j", "1"], 0.35),
+}
+
+
+def _run_once(args, cwd, env):
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable] + args, cwd=cwd, env=env,
+                          capture_output=True, text=True)
+    elapsed = time.perf_counter() - t0
+    return elapsed, proc
+
+
+def measure(runs=7, scale=1.0):
+    """Mede cada ponto de entrada; devolve {nome: {median_s, budget_s, ok, ...}}."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = HERE + os.pathsep + env.get("PYTHONPATH", "")
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="tonto_startup_") as cwd:
+        sample = os.path.join(cwd, "exemplo.tonto")
+        with open(sample, "w", encoding="utf-8") as f:
+            f.write(_SAMPLE)
+        for name, (args, budget) in ENTRY_POINTS.items():
+            args = [a.replace("{file}", sample) for a in args]
+            _run_once(args, cwd, env)  # aquece o cache de disco do SO
+            times, error = [], None
+            for _ in range(runs):
+                elapsed, proc = _run_once(args, cwd, env)
+                times.append(elapsed)
+                if proc.returncode != 0 or "gerar_tabelas" in proc.stderr:
+                    error = proc.stderr.strip().splitlines()[-1:] or [f"código {proc.returncode}"]
+                    break
+            median = statistics.median(times)
+            results[name] = {
+                "median_s": median,
+                "min_s": min(times),
+                "budget_s": budget * scale,
+                "ok": error is None and median <= budget * scale,
+                "error": error[0] if error else None,
+                "regenerated_tables": os.path.exists(os.path.join(cwd, "parsetab.py")),
+            }
+            if results[name]["regenerated_tables"]:
+                results[name]["ok"] = False
+    return results
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Verifica o orçamento de inicialização do lexer/parser Tonto")
+    ap.add_argument("--runs", type=int, default=7, help="execuções por ponto de entrada (vale a mediana)")
+    ap.add_argument("--scale", type=float, default=1.0,
+                    help="multiplica os orçamentos (máquinas lentas, CI)")
+    ap.add_argument("--json", help="grava o resultado neste arquivo")
+    args = ap.parse_args(argv)
+
+    results = measure(args.runs, args.scale)
+    for name, r in results.items():
+        status = "ok" if r["ok"] else "ESTOUROU"
+        print(f"{name:30} {r['median_s'] * 1000:8.1f} ms  (orçamento {r['budget_s'] * 1000:.0f} ms)  {status}")
+        if r["error"]:
+            print(f"    {r['error']}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    sys.exit(0 if all(r["ok"] for r in results.values()) else 1)
+
+
+if __name__ == "__main__":
+    main()